@@ -0,0 +1,134 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmark comparing path cache read latency between a database hosted on
+shared storage and a private copy on the local disk, as used when the
+``path_cache_local_mirror`` pipeline configuration setting is enabled.
+
+A path cache database is populated in the shared folder given on the command
+line, typically an NFS mount, and copied to a local temporary folder. Entity
+lookups, as issued when resolving a context from a path, are then timed
+against both copies, either with a connection per lookup, as done by short
+lived processes, or with a single connection.
+"""
+
+import os
+import sys
+import time
+import random
+import shutil
+import sqlite3
+import tempfile
+import optparse
+
+SCHEMA = """
+    PRAGMA page_size=8192;
+    CREATE TABLE path_cache (entity_type text, entity_id integer, entity_name text, root text, path text, primary_entity integer);
+    CREATE INDEX path_cache_entity ON path_cache(entity_type, entity_id);
+    CREATE INDEX path_cache_path ON path_cache(root, path, primary_entity);
+    CREATE UNIQUE INDEX path_cache_all ON path_cache(entity_type, entity_id, root, path, primary_entity);
+    CREATE TABLE event_log_sync (last_id integer);
+    CREATE TABLE shotgun_status (path_cache_id integer, shotgun_id integer);
+    CREATE UNIQUE INDEX shotgun_status_id ON shotgun_status(path_cache_id);
+    CREATE INDEX shotgun_status_shotgun_id ON shotgun_status(shotgun_id);
+"""
+
+LOOKUP = ("SELECT entity_type, entity_id, entity_name FROM path_cache "
+          "WHERE path = ? AND root = ? and primary_entity = 1")
+
+
+def _populate(db_path, num_entries):
+    """
+    Creates a path cache database with shot folders and returns their paths.
+    """
+    paths = []
+    connection = sqlite3.connect(db_path)
+    try:
+        connection.executescript(SCHEMA)
+        rows = []
+        for entity_id in range(num_entries):
+            path = "/sequences/seq%03d/shot%06d" % (entity_id % 100, entity_id)
+            paths.append(path)
+            rows.append(("Shot", entity_id, "shot%06d" % entity_id, "primary", path, 1))
+        connection.executemany("INSERT INTO path_cache VALUES(?, ?, ?, ?, ?, ?)", rows)
+        connection.commit()
+    finally:
+        connection.close()
+    return paths
+
+
+def _time_lookups(db_path, paths, reconnect):
+    """
+    Looks up each path and returns the elapsed time.
+    """
+    start = time.time()
+    connection = None
+    for path in paths:
+        if connection is None or reconnect:
+            if connection is not None:
+                connection.close()
+            connection = sqlite3.connect(db_path)
+        list(connection.execute(LOOKUP, (path, "primary")))
+    connection.close()
+    return time.time() - start
+
+
+def main():
+    parser = optparse.OptionParser(
+        usage="%prog [options] [shared folder]",
+        description="Compares path cache read latency between shared storage and the "
+                    "local disk. Uses a temporary folder as the shared folder unless "
+                    "one is given."
+    )
+    parser.add_option(
+        "-e", "--entries", type="int", default=50000,
+        help="Number of entries in the path cache (default: 50000)"
+    )
+    parser.add_option(
+        "-n", "--lookups", type="int", default=2000,
+        help="Number of lookups (default: 2000)"
+    )
+    options, args = parser.parse_args()
+
+    shared_folder = tempfile.mkdtemp(dir=args[0] if args else None)
+    local_folder = tempfile.mkdtemp()
+    try:
+        shared_db = os.path.join(shared_folder, "path_cache.db")
+        local_db = os.path.join(local_folder, "path_cache.db")
+        paths = _populate(shared_db, options.entries)
+        shutil.copy(shared_db, local_db)
+
+        lookups = [random.choice(paths) for _ in range(options.lookups)]
+
+        print("Shared database: %s" % shared_db)
+        print("Local database:  %s" % local_db)
+        print("%d entries, %d lookups" % (options.entries, options.lookups))
+        print("")
+
+        for label, reconnect in [
+            ("Connection per lookup", True),
+            ("Single connection", False),
+        ]:
+            shared = _time_lookups(shared_db, lookups, reconnect)
+            local = _time_lookups(local_db, lookups, reconnect)
+            print(label)
+            print("    shared database: %8.2f us per lookup" % (shared * 1e6 / len(lookups)))
+            print("    local database:  %8.2f us per lookup (x%.1f)" % (
+                local * 1e6 / len(lookups), shared / local))
+    finally:
+        shutil.rmtree(shared_folder)
+        shutil.rmtree(local_folder)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
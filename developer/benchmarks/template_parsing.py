@@ -0,0 +1,227 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmark comparing the recursive template path parser with the
+compiled regular expression based parser.
+
+Paths are generated from every path template of a templates.yml file and
+then parsed back with both engines, first against their own template and
+then against every template, which is what a linear template lookup does.
+"""
+
+import os
+import sys
+import time
+import optparse
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "..", "python"))
+sys.path.append(python_folder)
+
+from tank_vendor import yaml
+from tank.templatekey import make_keys, StringKey, IntegerKey, SequenceKey
+from tank.template import make_template_paths
+from tank.template_path_parser import TemplatePathParser
+
+# Subset of the templates shipped with the default configuration, used
+# when no templates file is given on the command line.
+DEFAULT_TEMPLATES = """
+keys:
+    Sequence: {type: str}
+    Shot: {type: str}
+    Step: {type: str}
+    sg_asset_type: {type: str}
+    Asset: {type: str}
+    name: {type: str, filter_by: alphanumeric}
+    iteration: {type: int}
+    version: {type: int, format_spec: "03"}
+    version_four: {type: int, format_spec: "04", alias: version}
+    timestamp: {type: str}
+    width: {type: int}
+    height: {type: int}
+    segment_name: {type: str}
+    output: {type: str, filter_by: alphanumeric}
+    eye: {type: str, choices: ["left", "right", "%V"], default: "%V", abstract: true}
+    SEQ: {type: sequence, format_spec: "04"}
+    nuke.output: {alias: output, type: str, filter_by: alphanumeric}
+    maya_extension: {type: str, choices: {ma: Maya Ascii (.ma), mb: Maya Binary (.mb)}, default: ma, alias: extension}
+    houdini.node: {alias: node, type: str}
+    aov_name: {type: str}
+    img_ext: {type: str, choices: ["exr", "dpx", "jpg"], default: exr, alias: extension}
+
+paths:
+    sequence_root: sequences/{Sequence}
+    shot_root: sequences/{Sequence}/{Shot}/{Step}
+    asset_root: assets/{sg_asset_type}/{Asset}/{Step}
+    shot_publish_area_maya: sequences/{Sequence}/{Shot}/{Step}/publish/maya
+    shot_work_area_maya: sequences/{Sequence}/{Shot}/{Step}/work/maya
+    maya_shot_work: sequences/{Sequence}/{Shot}/{Step}/work/maya/{name}.v{version}.{maya_extension}
+    maya_shot_snapshot: sequences/{Sequence}/{Shot}/{Step}/work/maya/snapshots/{name}.v{version}.{timestamp}.{maya_extension}
+    maya_shot_publish: sequences/{Sequence}/{Shot}/{Step}/publish/maya/{name}.v{version}.{maya_extension}
+    maya_shot_render: sequences/{Sequence}/{Shot}/{Step}/work/images/{name}/v{version}/{width}x{height}/{Shot}_{name}_v{version}.{SEQ}.exr
+    houdini_shot_work: sequences/{Sequence}/{Shot}/{Step}/work/houdini/{name}.v{version}.hip
+    houdini_shot_render: sequences/{Sequence}/{Shot}/{Step}/work/images/{name}/{houdini.node}/v{version}/{width}x{height}/{Shot}_{name}_v{version}.{SEQ}.exr
+    nuke_shot_work: sequences/{Sequence}/{Shot}/{Step}/work/nuke/{name}.v{version}.nk
+    nuke_shot_snapshot: sequences/{Sequence}/{Shot}/{Step}/work/nuke/snapshots/{name}.v{version}.{timestamp}.nk
+    nuke_shot_publish: sequences/{Sequence}/{Shot}/{Step}/publish/nuke/{name}.v{version}.nk
+    nuke_shot_render_mono_dpx: sequences/{Sequence}/{Shot}/{Step}/work/images/{name}/v{version}/{width}x{height}/{Shot}_{name}_{nuke.output}_v{version}.{SEQ}.dpx
+    nuke_shot_render_pub_mono_dpx: sequences/{Sequence}/{Shot}/{Step}/publish/elements/{name}/v{version}/{width}x{height}/{Shot}_{name}_{nuke.output}_v{version}.{SEQ}.dpx
+    nuke_shot_render_stereo: sequences/{Sequence}/{Shot}/{Step}/work/images/{name}/v{version}/{width}x{height}/{Shot}_{name}_{nuke.output}_{eye}_v{version}.{SEQ}.exr
+    nuke_shot_render_movie: sequences/{Sequence}/{Shot}/{Step}/review/{Shot}_{name}_{nuke.output}_v{version}.mov
+    shot_alembic_cache: sequences/{Sequence}/{Shot}/{Step}/publish/caches/{name}.v{version}.abc
+    shot_version_name: sequences/{Sequence}/{Shot}/{Step}/review/{name}.v{version}.{img_ext}
+    maya_asset_work: assets/{sg_asset_type}/{Asset}/{Step}/work/maya/{name}.v{version}.{maya_extension}
+    maya_asset_snapshot: assets/{sg_asset_type}/{Asset}/{Step}/work/maya/snapshots/{name}.v{version}.{timestamp}.{maya_extension}
+    maya_asset_publish: assets/{sg_asset_type}/{Asset}/{Step}/publish/maya/{name}.v{version}.{maya_extension}
+    houdini_asset_work: assets/{sg_asset_type}/{Asset}/{Step}/work/houdini/{name}.v{version}.hip
+    houdini_asset_publish: assets/{sg_asset_type}/{Asset}/{Step}/publish/houdini/{name}.v{version}.hip
+    nuke_asset_work: assets/{sg_asset_type}/{Asset}/{Step}/work/nuke/{name}.v{version}.nk
+    nuke_asset_publish: assets/{sg_asset_type}/{Asset}/{Step}/publish/nuke/{name}.v{version}.nk
+    asset_alembic_cache: assets/{sg_asset_type}/{Asset}/{Step}/publish/caches/{name}.v{version}.abc
+    photoshop_asset_work: assets/{sg_asset_type}/{Asset}/{Step}/work/photoshop/{name}.v{version}.psd
+    photoshop_asset_publish: assets/{sg_asset_type}/{Asset}/{Step}/publish/photoshop/{name}.v{version}.psd
+    shot_flame_segment_clip: sequences/{Sequence}/{Shot}/finishing/clip/sources/{segment_name}.clip
+    shot_flame_render_exr: sequences/{Sequence}/{Shot}/finishing/renders/{segment_name}_v{version}/{Shot}_{segment_name}_v{version}.{SEQ}.exr
+    editorial_aov: sequences/{Sequence}/{Shot}/{Step}/work/images/{name}/v{version_four}/{aov_name}/{Shot}_{name}_v{version_four}.{SEQ}.exr
+"""
+
+
+def _sample_value(key):
+    """
+    Returns a value which is valid for the given key.
+    """
+    if key.default is not None and not isinstance(key, SequenceKey):
+        return key.default
+    if key.choices:
+        return key.choices[0]
+    if isinstance(key, SequenceKey):
+        return 1001
+    if isinstance(key, IntegerKey):
+        return 12
+    if isinstance(key, StringKey) and key.filter_by not in (None, "alpha", "alphanumeric"):
+        return None
+    return "abc"
+
+
+def _recursive_get_fields(template, path):
+    """
+    Extracts fields the way Template.get_fields used to, building a
+    recursive parser for each definition variation.
+    """
+    for ordered_keys, static_tokens in zip(template._ordered_keys, template._static_tokens):
+        fields = TemplatePathParser(ordered_keys, static_tokens).parse_path(path, None)
+        if fields is not None:
+            return fields
+    return None
+
+
+def _compiled_get_fields(template, path):
+    """
+    Extracts fields with the compiled parsers of the template.
+    """
+    for parser in template._get_path_parsers():
+        fields, _ = parser.parse_path(path, None)
+        if fields is not None:
+            return fields
+    return None
+
+
+def _time(func, templates, paths, iterations):
+    """
+    Calls func for each template and path pair and returns the elapsed time.
+    """
+    start = time.time()
+    for _ in range(iterations):
+        for template, path in zip(templates, paths):
+            func(template, path)
+    return time.time() - start
+
+
+def main():
+    parser = optparse.OptionParser(
+        usage="%prog [options] [templates.yml]",
+        description="Compares template path parsing engines. Uses a subset of the default "
+                    "configuration templates unless a templates.yml file is given."
+    )
+    parser.add_option(
+        "-n", "--iterations", type="int", default=200,
+        help="Number of times each path is parsed (default: 200)"
+    )
+    options, args = parser.parse_args()
+    if args:
+        templates_file = args[0]
+        with open(templates_file) as fh:
+            data = yaml.load(fh)
+    else:
+        templates_file = "<default configuration subset>"
+        data = yaml.load(DEFAULT_TEMPLATES)
+
+    keys = make_keys(data.get("keys") or {})
+    roots = {}
+    for template_data in (data.get("paths") or {}).values():
+        root_name = template_data.get("root_name") if isinstance(template_data, dict) else None
+        roots[root_name or "primary"] = {sys.platform: "/mnt/projects/big_buck_bunny"}
+    templates = make_template_paths(data.get("paths") or {}, keys, roots, default_root="primary").values()
+
+    matched_templates = []
+    paths = []
+    for template in templates:
+        fields = dict((name, _sample_value(key)) for name, key in template.keys.items())
+        try:
+            paths.append(template.apply_fields(fields))
+        except Exception:
+            continue
+        matched_templates.append(template)
+
+    # compile outside of the timed section, this happens only once per template.
+    start = time.time()
+    for template in templates:
+        template._get_path_parsers()
+    compile_time = time.time() - start
+
+    num_parsers = sum(len(t._get_path_parsers()) for t in templates)
+    num_compiled = sum(1 for t in templates for p in t._get_path_parsers() if p._regex is not None)
+
+    print("Templates file: %s" % templates_file)
+    print("%d templates, %d definition variations, %d compiled to a regular expression" % (
+        len(templates), num_parsers, num_compiled))
+    print("Compiling all parsers: %.2f ms" % (compile_time * 1000))
+    print("")
+
+    def is_compiled(template):
+        return all(p._regex is not None for p in template._get_path_parsers())
+
+    compiled_pairs = [(t, p) for t, p in zip(matched_templates, paths) if is_compiled(t)]
+    fallback_pairs = [(t, p) for t, p in zip(matched_templates, paths) if not is_compiled(t)]
+    all_pairs = [(t, p) for p in paths for t in templates]
+
+    for label, pairs in [
+        ("Paths against their own template, regular expression layouts", compiled_pairs),
+        ("Paths against their own template, ambiguous layouts", fallback_pairs),
+        ("Paths against all templates", all_pairs),
+    ]:
+        if not pairs:
+            continue
+        pair_templates, pair_paths = zip(*pairs)
+        count = len(pairs) * options.iterations
+        recursive = _time(_recursive_get_fields, pair_templates, pair_paths, options.iterations)
+        compiled = _time(_compiled_get_fields, pair_templates, pair_paths, options.iterations)
+        print(label)
+        print("    recursive parser: %8.2f us per parse" % (recursive * 1e6 / count))
+        print("    compiled parser:  %8.2f us per parse (x%.1f)" % (
+            compiled * 1e6 / count, recursive / compiled))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
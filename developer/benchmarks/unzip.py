@@ -0,0 +1,122 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmark comparing the extraction of a bundle-like zip file on a single
+thread with its extraction on several threads.
+
+A zip file holding thousands of small python files and a few larger binary
+files, like an app or a configuration downloaded from the app store, is
+generated in a temporary folder. The time it takes unzip_file to extract it
+with each thread count is measured.
+"""
+
+import os
+import sys
+import time
+import shutil
+import zipfile
+import tempfile
+import optparse
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "..", "python"))
+sys.path.append(python_folder)
+
+from tank.util.zip import unzip_file
+
+
+def _generate_zip(zip_path, num_files, file_size, num_large_files, large_file_size):
+    """
+    Writes a zip file with small text files spread over folders and a few
+    large binary files.
+    """
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        content = ("# python module\nimport os\n" * (file_size // 26 + 1))[:file_size]
+        for file_index in range(num_files):
+            zip_file.writestr(
+                "python/package%02d/module%05d.py" % (file_index % 50, file_index),
+                content
+            )
+        for file_index in range(num_large_files):
+            zip_file.writestr("resources/data%02d.bin" % file_index, os.urandom(large_file_size))
+
+
+def _time_unzip(zip_path, folder, thread_count):
+    """
+    Extracts the zip file in a new folder and returns the elapsed time.
+    """
+    target_folder = tempfile.mkdtemp(dir=folder)
+    try:
+        start = time.time()
+        unzip_file(zip_path, target_folder, thread_count=thread_count)
+        return time.time() - start
+    finally:
+        shutil.rmtree(target_folder)
+
+
+def main():
+    parser = optparse.OptionParser(
+        usage="%prog [options]",
+        description="Compares the extraction of a zip file on one thread and on several threads."
+    )
+    parser.add_option(
+        "-f", "--files", type="int", default=5000,
+        help="Number of small files in the zip file (default: 5000)"
+    )
+    parser.add_option(
+        "-s", "--size", type="int", default=4096,
+        help="Size of the small files in bytes (default: 4096)"
+    )
+    parser.add_option(
+        "-l", "--large-files", type="int", default=4,
+        help="Number of large files in the zip file (default: 4)"
+    )
+    parser.add_option(
+        "-m", "--large-size", type="int", default=16,
+        help="Size of the large files in megabytes (default: 16)"
+    )
+    parser.add_option(
+        "-t", "--threads", type="int", default=4,
+        help="Number of threads to compare with a single thread (default: 4)"
+    )
+    parser.add_option(
+        "-r", "--repeat", type="int", default=3,
+        help="Number of times each measurement is repeated (default: 3)"
+    )
+    options, args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    try:
+        zip_path = os.path.join(folder, "bundle.zip")
+        _generate_zip(
+            zip_path, options.files, options.size, options.large_files, options.large_size * 1024 * 1024
+        )
+
+        print("%d files of %d bytes and %d files of %d MB" % (
+            options.files, options.size, options.large_files, options.large_size))
+        print("bundle.zip: %d bytes" % os.path.getsize(zip_path))
+        print("")
+
+        timings = []
+        for thread_count in [1, options.threads]:
+            timings.append(min(_time_unzip(zip_path, folder, thread_count) for _ in range(options.repeat)))
+
+        print("1 thread:   %8.2f ms" % (timings[0] * 1000))
+        print("%d threads: %8.2f ms (x%.1f)" % (options.threads, timings[1] * 1000, timings[0] / timings[1]))
+    finally:
+        shutil.rmtree(folder)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Benchmark comparing the startup cost of the legacy pickled yaml cache
+(yaml_cache.pickle) with the indexed yaml cache file (yaml_cache.bin).
+
+A configuration made of environment-like yaml files is generated in a temporary
+folder and cached in both formats. The time it takes to populate an empty yaml
+cache from each format and to then get a subset of the files, as done when an
+Sgtk instance is created and a few environments are loaded, is measured.
+"""
+
+import os
+import sys
+import time
+import shutil
+import random
+import cPickle
+import tempfile
+import optparse
+
+# add sgtk API
+this_folder = os.path.abspath(os.path.dirname(__file__))
+python_folder = os.path.abspath(os.path.join(this_folder, "..", "..", "python"))
+sys.path.append(python_folder)
+
+from tank_vendor import yaml
+from tank.util.yaml_cache import YamlCache, YamlCacheFile, CacheItem
+
+
+def _generate_config(folder, num_files, num_apps):
+    """
+    Writes environment-like yaml files and returns their paths.
+    """
+    paths = []
+    for file_index in range(num_files):
+        apps = {}
+        for app_index in range(num_apps):
+            apps["tk-multi-app%03d" % app_index] = {
+                "location": {"type": "app_store", "name": "tk-multi-app%03d" % app_index, "version": "v1.2.3"},
+                "hook_scan_scene": "{self}/scan_scene_tk-maya.py",
+                "template_work": "maya_shot_work",
+                "items": [{"name": "item%d" % i, "enabled": bool(i % 2)} for i in range(5)],
+            }
+        data = {
+            "description": "Environment %d" % file_index,
+            "engines": {"tk-maya": {"location": "@engines.tk-maya.location", "apps": apps}},
+        }
+        path = os.path.join(folder, "env%03d.yml" % file_index)
+        with open(path, "w") as fh:
+            yaml.safe_dump(data, fh)
+        paths.append(path)
+    return paths
+
+
+def _time_pickle(pickle_path, paths):
+    """
+    Populates a yaml cache from the pickled cache and returns the elapsed time.
+    """
+    start = time.time()
+    yaml_cache = YamlCache()
+    with open(pickle_path, "rb") as fh:
+        yaml_cache.merge_cache_items(cPickle.load(fh))
+    for path in paths:
+        yaml_cache.get(path, deepcopy_data=False)
+    return time.time() - start
+
+
+def _time_cache_file(cache_path, paths):
+    """
+    Populates a yaml cache from the cache file and returns the elapsed time.
+    """
+    start = time.time()
+    yaml_cache = YamlCache()
+    yaml_cache.add_cache_file(YamlCacheFile(cache_path))
+    for path in paths:
+        yaml_cache.get(path, deepcopy_data=False)
+    return time.time() - start
+
+
+def main():
+    parser = optparse.OptionParser(
+        usage="%prog [options]",
+        description="Compares the startup cost of the pickled yaml cache with the "
+                    "indexed yaml cache file."
+    )
+    parser.add_option(
+        "-f", "--files", type="int", default=200,
+        help="Number of yaml files in the configuration (default: 200)"
+    )
+    parser.add_option(
+        "-a", "--apps", type="int", default=30,
+        help="Number of apps per environment file (default: 30)"
+    )
+    parser.add_option(
+        "-n", "--needed", type="int", default=5,
+        help="Number of files needed at startup (default: 5)"
+    )
+    parser.add_option(
+        "-r", "--repeat", type="int", default=10,
+        help="Number of times each measurement is repeated (default: 10)"
+    )
+    options, args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    try:
+        config_folder = os.path.join(folder, "config")
+        os.makedirs(config_folder)
+        paths = _generate_config(config_folder, options.files, options.apps)
+
+        pickle_path = os.path.join(folder, "yaml_cache.pickle")
+        with open(pickle_path, "wb") as fh:
+            yaml_cache = YamlCache()
+            for path in paths:
+                yaml_cache.get(path, deepcopy_data=False)
+            cPickle.dump(yaml_cache.get_cached_items(), fh)
+
+        cache_path = os.path.join(folder, YamlCacheFile.FILE_NAME)
+        YamlCacheFile.write(cache_path, [CacheItem(path, yaml_cache.get(path)) for path in paths])
+
+        print("%d yaml files of %d apps" % (options.files, options.apps))
+        print("yaml_cache.pickle: %8d bytes" % os.path.getsize(pickle_path))
+        print("%s:    %8d bytes" % (YamlCacheFile.FILE_NAME, os.path.getsize(cache_path)))
+        print("")
+
+        for label, needed in [
+            ("%d files needed" % options.needed, options.needed),
+            ("All files needed", options.files),
+        ]:
+            needed_paths = random.sample(paths, min(needed, len(paths)))
+            pickle_time = min(_time_pickle(pickle_path, needed_paths) for _ in range(options.repeat))
+            cache_file_time = min(_time_cache_file(cache_path, needed_paths) for _ in range(options.repeat))
+            print(label)
+            print("    yaml_cache.pickle: %8.2f ms" % (pickle_time * 1000))
+            print("    %s:    %8.2f ms (x%.1f)" % (
+                YamlCacheFile.FILE_NAME, cache_file_time * 1000, pickle_time / cache_file_time))
+    finally:
+        shutil.rmtree(folder)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
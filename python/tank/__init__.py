@@ -53,6 +53,7 @@ if "TANK_CURRENT_PC" not in os.environ:
 
 # first import the log manager since a lot of modules require this.
 from .log import LogManager
+from .profiling import Profiler
 
 # make sure that all sub-modules are imported at the same as the main module
 from . import authentication
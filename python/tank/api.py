@@ -21,7 +21,9 @@ from .util import shotgun, yaml_cache
 from .errors import TankError, TankMultipleMatchingTemplatesError
 from .path_cache import PathCache
 from .template import read_templates
+from .template_index import TemplateIndex, TemplatesDict
 from . import constants
+from . import templatekey
 from . import pipelineconfig
 from . import pipelineconfig_utils
 from . import pipelineconfig_factory
@@ -157,6 +159,21 @@ class Sgtk(object):
     ################################################################################################
     # properties
 
+    @property
+    def templates(self):
+        """
+        Dictionary of :class:`TemplatePath` and :class:`TemplateString` objects,
+        keyed by template name.
+        """
+        return self.__templates
+
+    @templates.setter
+    def templates(self, templates):
+        # the index used to speed up template lookups from paths is built on
+        # demand the next time a lookup happens.
+        self.__templates = TemplatesDict(templates)
+        self.__template_index = None
+
     @property
     def configuration_descriptor(self):
         """
@@ -302,9 +319,23 @@ class Sgtk(object):
         :raises: :class:`TankError`
         """
         try:
-            self.templates = read_templates(self.__pipeline_config)
+            templates = read_templates(self.__pipeline_config)
         except TankError as e:
             raise TankError("Templates could not be reloaded: %s" % e)
+        self.templates = templates
+
+    def __get_template_index(self):
+        """
+        Returns the index used to find templates matching a path.
+
+        The index is rebuilt if the templates were reloaded or modified
+        since it was last built.
+
+        :returns: :class:`TemplateIndex` instance.
+        """
+        if self.__template_index is None or not self.__template_index.is_current(self.__templates):
+            self.__template_index = TemplateIndex(self.__templates)
+        return self.__template_index
 
     def list_commands(self):
         """
@@ -359,11 +390,28 @@ class Sgtk(object):
         :param path: Path to match against a template
         :returns: list of :class:`TemplatePath` or [] if no match could be found.
         """
-        matched_templates = []
-        for key, template in self.templates.items():
-            if template.validate(path):
-                matched_templates.append(template)
-        return matched_templates
+        return self.__get_template_index().templates_from_path(path)
+
+    def templates_from_paths(self, paths):
+        """
+        Finds the templates matching each of the given paths::
+
+            >>> import sgtk
+            >>> tk = sgtk.sgtk_from_path("/studio/project_root")
+            >>> paths = glob.glob("/studio/my_proj/sequences/AAA/001/comp/work/images/*.exr")
+            >>> for path, templates in tk.templates_from_paths(paths):
+            ...     print path, templates
+
+        This is equivalent to calling :meth:`templates_from_path` for each path, but
+        work is shared between consecutive paths from the same directory, and results
+        are generated as the paths are consumed, which makes it well suited to
+        scanning folders holding many files, e.g. image sequences.
+
+        :param paths: Iterable of paths to match against the templates
+        :returns: Generator of (path, list of :class:`TemplatePath`) tuples, with an
+                  empty list for paths no template matches.
+        """
+        return self.__get_template_index().templates_from_paths(paths)
             
     def template_from_path(self, path):
         """
@@ -446,6 +494,27 @@ class Sgtk(object):
         :returns: Matching file paths
         :rtype: List of strings.
         """
+        return [
+            path for path, _ in
+            self.__search_template(template, fields, skip_keys, skip_missing_optional_keys)
+        ]
+
+    def __search_template(self, template, fields, skip_keys, skip_missing_optional_keys):
+        """
+        Finds paths that match a template using field values passed and extracts
+        the fields of each path. See :meth:`paths_from_template` for details.
+
+        Files are listed one directory at a time by the glob and the fields of all
+        the files of a directory are extracted in one pass, so the directory part
+        of the template is only matched once per directory rather than once per file.
+
+        :param template: Template against whom to match.
+        :param fields: Fields and values to use.
+        :param skip_keys: Keys whose values should be ignored from the fields parameter.
+        :param skip_missing_optional_keys: Specify if optional keys should be skipped if they
+                                        aren't found in the fields collection
+        :returns: Generator of (path, fields) tuples, each path being generated once.
+        """
         skip_keys = skip_keys or []
         if isinstance(skip_keys, basestring):
             skip_keys = [skip_keys]
@@ -495,9 +564,10 @@ class Sgtk(object):
             globs_searched.add(glob_str)
             
             # Find all files which are valid for this key set
-            found_files.update([found_file for found_file in glob.iglob(glob_str) if template.validate(found_file)])
-                    
-        return list(found_files) 
+            for found_file, found_fields in template.get_fields_many(glob.iglob(glob_str)):
+                if found_fields is not None and found_file not in found_files:
+                    found_files.add(found_file)
+                    yield found_file, found_fields
 
 
     def abstract_paths_from_template(self, template, fields):
@@ -584,17 +654,14 @@ class Sgtk(object):
         if skip_leaf_level:
             search_template = template.parent
 
-        # now carry out a regular search based on the template
-        found_files = self.paths_from_template(search_template, fields)
-
         st_abstract_key_names = [k.name for k in search_template.keys.values() if k.is_abstract]
 
-        # now collapse down the search matches for any abstract fields,
+        # now carry out a regular search based on the template, and
+        # collapse down the search matches for any abstract fields,
         # and add the leaf level if necessary
         abstract_paths = set()
-        for found_file in found_files:
-
-            cur_fields = search_template.get_fields(found_file)
+        collapsed_fields = set()
+        for _, cur_fields in self.__search_template(search_template, fields, None, False):
 
             # pass 1 - go through the fields for this file and
             # zero out the abstract fields - this way, apply
@@ -616,12 +683,79 @@ class Sgtk(object):
                 if f not in cur_fields:
                     cur_fields[f] = fields[f]
 
+            # all the frames of a sequence collapse down to the same
+            # fields, only compose the path once for them.
+            frozen_fields = frozenset(cur_fields.iteritems())
+            if frozen_fields in collapsed_fields:
+                continue
+            collapsed_fields.add(frozen_fields)
+
             # now we have all the fields we need to compose the full template
             abstract_path = template.apply_fields(cur_fields)
             abstract_paths.add(abstract_path)
 
         return list(abstract_paths)
 
+    def sequences_from_template(self, template, fields, skip_keys=None, skip_missing_optional_keys=False):
+        """
+        Finds image sequences that match a template using field values passed.
+
+        Works like :meth:`paths_from_template` but rather than returning a path for
+        each frame, the frames of each sequence found are collapsed into a single
+        abstract path and a list of frame ranges.
+
+        Imagine you have a template ``render: sequences/{Sequence}/{Shot}/images/{name}.{SEQ}.exr``::
+
+            >>> import sgtk
+            >>> tk = sgtk.sgtk_from_path("/studio/my_proj")
+            >>> render = tk.templates["render"]
+            >>> tk.sequences_from_template(render, {"Sequence": "AAA", "Shot": "001"})
+            [('/studio/my_proj/sequences/AAA/001/images/render_1.%04d.exr', [(1001, 1050), (1052, 1100)]),
+             ('/studio/my_proj/sequences/AAA/001/images/render_2.%04d.exr', [(1001, 1100)])]
+
+        Each directory holding frames is only listed once, and the directory part of the
+        template is only matched once for all the frames it contains.
+
+        .. note:: The result is not ordered in any particular way.
+
+        :param template: Template against whom to match. It must contain exactly one
+                         :class:`SequenceKey`.
+        :type  template: :class:`TemplatePath`
+        :param fields: Fields and values to use.
+        :type  fields: Dictionary
+        :param skip_keys: Keys whose values should be ignored from the fields parameter.
+        :type  skip_keys: List of key names
+        :param skip_missing_optional_keys: Specify if optional keys should be skipped if they
+                                        aren't found in the fields collection
+        :returns: List of (abstract path, frame ranges) tuples, where frame ranges is a sorted
+                  list of (first frame, last frame) tuples, inclusive.
+        :raises: :class:`TankError` if the template doesn't contain exactly one sequence key.
+        """
+        sequence_key_names = [
+            k.name for k in template.keys.values() if isinstance(k, templatekey.SequenceKey)
+        ]
+        if len(sequence_key_names) != 1:
+            raise TankError(
+                "Template %s must contain exactly one sequence key to find sequences." % template
+            )
+        sequence_key_name = sequence_key_names[0]
+
+        # {frozen fields without the frame: set of frames}
+        sequences = {}
+        for _, cur_fields in self.__search_template(template, fields, skip_keys, skip_missing_optional_keys):
+            frame = cur_fields.pop(sequence_key_name, None)
+            if not isinstance(frame, (int, long)):
+                # not a frame, e.g. a file literally named after the %04d pattern.
+                continue
+            sequences.setdefault(frozenset(cur_fields.iteritems()), set()).add(frame)
+
+        results = []
+        for frozen_fields, frames in sequences.iteritems():
+            # without a frame, the sequence key will use its abstract default value
+            abstract_path = template.apply_fields(dict(frozen_fields))
+            results.append((abstract_path, _collapse_frame_ranges(frames)))
+        return results
+
 
     def paths_from_entity(self, entity_type, entity_id):
         """
@@ -949,6 +1083,23 @@ def get_authenticated_user():
     global _authenticated_user
     return _authenticated_user
 
+
+def _collapse_frame_ranges(frames):
+    """
+    Collapses frame numbers into ranges of consecutive frames.
+
+    :param frames: Iterable of frame numbers.
+    :returns: Sorted list of (first frame, last frame) tuples, inclusive.
+    """
+    ranges = []
+    for frame in sorted(frames):
+        if ranges and ranges[-1][1] == frame - 1:
+            ranges[-1][1] = frame
+        else:
+            ranges.append([frame, frame])
+    return [tuple(frame_range) for frame_range in ranges]
+
+
 ##########################################################################################
 # Legacy handling
 
@@ -379,7 +379,14 @@ class CachedConfiguration(Configuration):
                                          core_backup_path)
             log.debug("Latest backup cleanup complete.")
 
-        # @todo - prime caches (yaml, path cache)
+        # prime the yaml cache so that the environments can be loaded without parsing
+        # their yaml files. This is only an optimization, don't fail if it can't be done.
+        try:
+            self._config_writer.write_yaml_cache_file(self._descriptor)
+        except Exception as e:
+            log.warning("Could not write the yaml cache of the configuration: %s" % e)
+
+        # @todo - prime caches (path cache)
 
         # make sure tank command and interpreter files are up to date
         self._config_writer.create_tank_command()
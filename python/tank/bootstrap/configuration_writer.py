@@ -23,6 +23,7 @@ from ..util import StorageRoots
 from ..util import ShotgunPath
 from ..util.shotgun import connection
 from ..util.move_guard import MoveGuard
+from ..util.yaml_cache import YamlCacheFile
 
 from tank_vendor import yaml
 
@@ -541,6 +542,26 @@ class ConfigurationWriter(object):
             config_descriptor.storage_roots
         )
 
+    def write_yaml_cache_file(self, config_descriptor):
+        """
+        Writes the yaml cache file of the configuration, holding the data of
+        all the yaml files of the configuration.
+
+        :param config_descriptor: Config descriptor object
+        """
+        config_folder = os.path.join(self._path.current_os, "config")
+        folders = [config_folder]
+
+        # configurations running from the bundle cache have their
+        # files outside of the configuration folder.
+        descriptor_config_folder = config_descriptor.get_config_folder()
+        if os.path.normpath(descriptor_config_folder) != os.path.normpath(config_folder):
+            folders.append(descriptor_config_folder)
+
+        cache_path = os.path.join(self._path.current_os, YamlCacheFile.FILE_NAME)
+        num_items = YamlCacheFile.build(cache_path, folders)
+        log.debug("Cached %d yaml files in %s" % (num_items, cache_path))
+
     def is_transaction_pending(self):
         """
         Checks if the configuration was previously in the process of being updated but then stopped.
@@ -76,5 +76,8 @@ BUNDLE_CACHE_FALLBACK_PATHS_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_FALLBACK_PATHS"
 # the name of the folder within the config where bundles are cached.
 BUNDLE_CACHE_FOLDER_NAME = "bundle_cache"
 
+# number of bundles downloaded at the same time when caching a configuration.
+DEFAULT_BUNDLE_DOWNLOAD_THREAD_COUNT = 4
+
 # the shotgun engine always has this name
 SHOTGUN_ENGINE_NAME = "tk-shotgun"
@@ -20,6 +20,8 @@ from ..pipelineconfig import PipelineConfiguration
 from .. import LogManager
 from ..errors import TankError
 from ..util import ShotgunPath
+from ..util.concurrency import parallel_iter
+from ..descriptor.io_descriptor import BundleCacheIndex
 
 log = LogManager.get_logger(__name__)
 
@@ -78,6 +80,7 @@ class ToolkitManager(object):
         # These are serializable parameters from the class.
         self._user_bundle_cache_fallback_paths = []
         self._caching_policy = self.CACHE_SPARSE
+        self._bundle_download_thread_count = constants.DEFAULT_BUNDLE_DOWNLOAD_THREAD_COUNT
         self._pipeline_configuration_identifier = None # name or id
         self._base_config_descriptor = None
         self._do_shotgun_config_lookup = True
@@ -123,6 +126,7 @@ class ToolkitManager(object):
         repr += " User %s\n" % self._sg_user
         repr += " Bundle cache fallback paths %s\n" % self._get_bundle_cache_fallback_paths()
         repr += " Caching policy %s\n" % self._caching_policy
+        repr += " Bundle download threads %s\n" % self._bundle_download_thread_count
         repr += " Plugin id %s\n" % self._plugin_id
         repr += " Config %s %s\n" % (identifier_type, self._pipeline_configuration_identifier)
         repr += " Base %s >" % self._base_config_descriptor
@@ -150,6 +154,7 @@ class ToolkitManager(object):
         return {
             "bundle_cache_fallback_paths": self.bundle_cache_fallback_paths,
             "caching_policy": self.caching_policy,
+            "bundle_download_thread_count": self.bundle_download_thread_count,
             "pipeline_configuration": self.pipeline_configuration,
             "base_configuration": self.base_configuration,
             "do_shotgun_config_lookup": self.do_shotgun_config_lookup,
@@ -171,6 +176,9 @@ class ToolkitManager(object):
         """
         self.bundle_cache_fallback_paths = data["bundle_cache_fallback_paths"]
         self.caching_policy = data["caching_policy"]
+        self.bundle_download_thread_count = data.get(
+            "bundle_download_thread_count", constants.DEFAULT_BUNDLE_DOWNLOAD_THREAD_COUNT
+        )
         self.pipeline_configuration = data["pipeline_configuration"]
         self.base_configuration = data["base_configuration"]
         self.do_shotgun_config_lookup = data["do_shotgun_config_lookup"]
@@ -410,6 +418,24 @@ class ToolkitManager(object):
 
     caching_policy = property(_get_caching_policy, _set_caching_policy)
 
+    def _get_bundle_download_thread_count(self):
+        """
+        The maximum number of bundles downloaded at the same time when the
+        configuration is cached. Set it to 1 to download bundles one at a time.
+        Defaults to 4.
+        """
+        return self._bundle_download_thread_count
+
+    def _set_bundle_download_thread_count(self, thread_count):
+        # Setter for property 'bundle_download_thread_count'.
+        if not isinstance(thread_count, int) or thread_count < 1:
+            raise TankBootstrapError(
+                "Invalid bundle download thread count %s. Set to a number greater than 0." % thread_count
+            )
+        self._bundle_download_thread_count = thread_count
+
+    bundle_download_thread_count = property(_get_bundle_download_thread_count, _set_bundle_download_thread_count)
+
     def _get_progress_callback(self):
         """
         Callback that gets called whenever progress should be reported.
@@ -1218,27 +1244,54 @@ class ToolkitManager(object):
                 descriptor = env_obj.get_framework_descriptor(framework)
                 descriptors[descriptor.get_uri()] = descriptor
 
-        # pass 2 - download all apps
-        for idx, descriptor in enumerate(descriptors.values()):
-
-            # Scale the progress step 0.8 between this value 0.15 and the next one 0.95
-            # to compute a value progressing while looping over the indexes.
-            step_size = (self._END_DOWNLOADING_APPS_RATE - self._START_DOWNLOADING_APPS_RATE) / len(descriptors)
-            progress_value = self._START_DOWNLOADING_APPS_RATE + idx * step_size
-
-            if not descriptor.exists_local():
-                message = "Downloading %s (%s of %s)..." % (descriptor, idx + 1, len(descriptors))
-                self._report_progress(progress_callback, progress_value, message)
-
-                try:
-                    descriptor.download_local()
-                except Exception as e:
-                    log.error("Downloading %r failed to complete successfully. This bundle will be skipped.", e)
-                    log.exception(e)
+        # pass 2 - check which bundles need to be downloaded
+        # Scale the progress step 0.8 between this value 0.15 and the next one 0.95
+        # to compute a value progressing while bundles are checked or downloaded.
+        step_size = (self._END_DOWNLOADING_APPS_RATE - self._START_DOWNLOADING_APPS_RATE) / max(len(descriptors), 1)
+        # The bundle cache folders are listed once rather than checking each
+        # bundle in each of the bundle caches.
+        idx = 0
+        descriptors_to_download = []
+        with BundleCacheIndex.snapshot():
+            for descriptor in descriptors.values():
+                if descriptor.exists_local():
+                    message = "Checking %s (%s of %s)." % (descriptor, idx + 1, len(descriptors))
+                    log.debug("%s exists locally at '%s'.", descriptor, descriptor.get_path())
+                    self._report_progress(
+                        progress_callback, self._START_DOWNLOADING_APPS_RATE + idx * step_size, message
+                    )
+                    idx += 1
+                else:
+                    descriptors_to_download.append(descriptor)
+
+        if not descriptors_to_download:
+            return
+
+        # pass 3 - download the missing bundles on a pool of threads. Each
+        # download still goes through a temporary folder which is then renamed,
+        # so concurrent processes stay safe. Progress is reported from the
+        # current thread as the downloads complete.
+        message = "Downloading %s bundles..." % len(descriptors_to_download)
+        self._report_progress(progress_callback, self._START_DOWNLOADING_APPS_RATE + idx * step_size, message)
+
+        downloads = parallel_iter(
+            lambda descriptor: descriptor.download_local(),
+            descriptors_to_download,
+            self._bundle_download_thread_count
+        )
+        for download_idx, _, exc_info in downloads:
+            descriptor = descriptors_to_download[download_idx]
+            idx += 1
+            if exc_info:
+                log.error(
+                    "Downloading %r failed to complete successfully. This bundle will be skipped.",
+                    descriptor,
+                    exc_info=exc_info
+                )
+                message = "Failed to download %s (%s of %s)." % (descriptor, idx, len(descriptors))
             else:
-                message = "Checking %s (%s of %s)." % (descriptor, idx + 1, len(descriptors))
-                log.debug("%s exists locally at '%s'.", descriptor, descriptor.get_path())
-                self._report_progress(progress_callback, progress_value, message)
+                message = "Downloaded %s (%s of %s)." % (descriptor, idx, len(descriptors))
+            self._report_progress(progress_callback, self._START_DOWNLOADING_APPS_RATE + idx * step_size, message)
 
     def _default_progress_callback(self, progress_value, message):
         """
@@ -310,6 +310,17 @@ class ConfigurationResolver(object):
             "The following pipeline configurations were found: %s" % pprint.pformat(pipeline_configs)
         )
 
+        # the configurations tracking the latest version of their descriptor
+        # are resolved at once rather than one by one.
+        latest_config_descriptors = self._find_latest_config_descriptors(
+            sg_connection,
+            [
+                pipeline_config for pipeline_config in pipeline_configs
+                if self._matches_current_plugin_id(pipeline_config) or
+                self._is_classic_pc_for_current_project(pipeline_config)
+            ]
+        )
+
         # loop over all pipeline configs
         for pipeline_config in pipeline_configs:
 
@@ -325,7 +336,7 @@ class ConfigurationResolver(object):
                 # is defined for another operating system.
                 try:
                     pipeline_config["config_descriptor"] = self._create_config_descriptor(
-                        sg_connection, pipeline_config
+                        sg_connection, pipeline_config, latest_config_descriptors
                     )
                     yield pipeline_config
 
@@ -335,13 +346,67 @@ class ConfigurationResolver(object):
                         "access location. Details: %s" % (pipeline_config, e)
                     )
 
-    def _create_config_descriptor(self, sg_connection, shotgun_pc_data):
+    def _find_latest_config_descriptors(self, sg_connection, pipeline_configs):
+        """
+        Resolves the latest versions of the descriptors without a version token
+        of several pipeline configurations at once.
+
+        :param sg_connection: Connection to Shotgun.
+        :param list pipeline_configs: Pipeline configuration dictionaries, see
+            :meth:`_create_config_descriptor`.
+
+        :returns: Dictionary of latest :class:`sgtk.descriptor.ConfigDescriptorBase`
+            instances keyed by descriptor uri. The descriptors missing from it are
+            resolved when their configuration descriptor is created.
+        """
+        descriptor_uris = set()
+        for pipeline_config in pipeline_configs:
+            sg_descriptor_uri = pipeline_config.get("descriptor") or pipeline_config.get("sg_descriptor")
+            plugin_ids = pipeline_config.get("plugin_ids") or pipeline_config.get("sg_plugin_ids")
+            # same precedence as in _create_config_descriptor: path fields win
+            # and classic configs only support the path fields.
+            if sg_descriptor_uri and plugin_ids is not None and \
+                    not ShotgunPath.from_shotgun_dict(pipeline_config) and \
+                    is_descriptor_version_missing(sg_descriptor_uri):
+                descriptor_uris.add(sg_descriptor_uri)
+
+        if len(descriptor_uris) < 2:
+            # nothing to gain
+            return {}
+
+        descriptor_uris = sorted(descriptor_uris)
+        try:
+            descriptors = []
+            for descriptor_uri in descriptor_uris:
+                descriptor_dict = descriptor_uri_to_dict(descriptor_uri)
+                descriptor_dict["version"] = "latest"
+                descriptor = create_descriptor(
+                    sg_connection,
+                    Descriptor.CONFIG,
+                    descriptor_dict,
+                    fallback_roots=self._bundle_cache_fallback_paths
+                )
+                if not descriptor.has_remote_access():
+                    # let the descriptor factory fall back on the locally cached versions.
+                    return {}
+                descriptors.append(descriptor)
+
+            latest_descriptors = Descriptor.find_latest_versions(descriptors)
+        except Exception as e:
+            log.debug("Could not resolve the latest config descriptors at once: %s" % e)
+            return {}
+
+        return dict(zip(descriptor_uris, latest_descriptors))
+
+    def _create_config_descriptor(self, sg_connection, shotgun_pc_data, latest_config_descriptors=None):
         """
         Creates a configuration descriptor for a given pipeline configuration entry.
 
         :param sg_connection: Connection to Shotgun.
         :param dict shotgun_pc_data: Pipeline configuration dictionary with keys ``descriptor``,
             ``sg_descriptor`` and ``*_path`.
+        :param dict latest_config_descriptors: Optional dictionary of descriptors already
+            resolved to their latest version, keyed by descriptor uri.
 
         :returns: A :class:`sgtk.descriptor.ConfigDescriptorBase` instance or ``None`` if the
             pipeline configuration is valid but defines a configuration which cannot be
@@ -409,13 +474,16 @@ class ConfigurationResolver(object):
                     "%s. Using descriptor field.", shotgun_pc_data["id"]
                 )
 
-            cfg_descriptor = create_descriptor(
-                sg_connection,
-                Descriptor.CONFIG,
-                sg_descriptor_uri,
-                fallback_roots=self._bundle_cache_fallback_paths,
-                resolve_latest=is_descriptor_version_missing(sg_descriptor_uri)
-            )
+            if latest_config_descriptors and sg_descriptor_uri in latest_config_descriptors:
+                cfg_descriptor = latest_config_descriptors[sg_descriptor_uri]
+            else:
+                cfg_descriptor = create_descriptor(
+                    sg_connection,
+                    Descriptor.CONFIG,
+                    sg_descriptor_uri,
+                    fallback_roots=self._bundle_cache_fallback_paths,
+                    resolve_latest=is_descriptor_version_missing(sg_descriptor_uri)
+                )
 
         elif sg_uploaded_config and not is_classic_config:
 
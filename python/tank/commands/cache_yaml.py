@@ -9,8 +9,6 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
-import fnmatch
-import cPickle
 
 from .action_base import Action
 from ..errors import TankError
@@ -19,7 +17,7 @@ from ..util import yaml_cache
 class CacheYamlAction(Action):
     """
     Action that ensures that crawls a config, caching all YAML data found
-    to disk as pickled data.
+    to disk in an indexed cache file.
     """
     def __init__(self):
         Action.__init__(
@@ -66,29 +64,26 @@ class CacheYamlAction(Action):
         log.info("This command will traverse the entire configuration and build a "
                  "cache of all YAML data found.")
 
-        root_dir = self.tk.pipeline_configuration.get_path()
+        pipeline_configuration = self.tk.pipeline_configuration
+        root_dir = pipeline_configuration.get_path()
 
-        matches = []
-        for root, dir_names, file_names in os.walk(root_dir):
-            for file_name in fnmatch.filter(file_names, "*.yml"):
-                matches.append(os.path.join(root, file_name))
-        for path in matches:
-            log.debug("Caching %s..." % path)
-            yaml_cache.g_yaml_cache.get(path)
+        # the config folder of configurations running from the bundle
+        # cache is not part of the pipeline configuration folder.
+        folders = [root_dir]
+        config_dir = pipeline_configuration.get_config_location()
+        if not os.path.normpath(config_dir).startswith(os.path.join(os.path.normpath(root_dir), "")):
+            folders.append(config_dir)
 
-        items = yaml_cache.g_yaml_cache.get_cached_items()
-        pickle_path = os.path.join(root_dir, "yaml_cache.pickle")
-        log.debug("Writing cache to %s" % pickle_path)
+        cache_path = pipeline_configuration._get_yaml_cache_file_location()
+        log.debug("Writing cache to %s" % cache_path)
 
         try:
-            fh = open(pickle_path, "wb")
+            num_items = yaml_cache.YamlCacheFile.build(cache_path, folders)
+        except TankError:
+            raise
         except Exception as e:
-            raise TankError("Unable to open '%s' for writing: %s" % (pickle_path, e))
-
-        try:
-            cPickle.dump(items, fh)
-        except Exception as e:
-            raise TankError("Unable to dump pickled cache data: %s" % e)
+            raise TankError("Unable to write yaml cache '%s': %s" % (cache_path, e))
 
         log.info("")
+        log.info("Cached %d YAML files." % num_items)
         log.info("Cache yaml completed!")
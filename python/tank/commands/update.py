@@ -14,7 +14,7 @@ from .action_base import Action
 from . import console_utils
 from . import util
 from ..platform.environment import WritableEnvironment
-from ..descriptor import CheckVersionConstraintsError
+from ..descriptor import CheckVersionConstraintsError, Descriptor
 from . import constants
 from ..util.version import is_version_number, is_version_newer
 from ..util import shotgun
@@ -391,25 +391,47 @@ def _process_environment(tk,
             # the item we are filtering on does not exist in this env
             engines_to_process = []
     
+    # gather the apps to process up front, so that the latest versions
+    # of all the items can be resolved at once.
+    apps_to_process = {}
     for engine in engines_to_process:
-        items.extend(_process_item(log, suppress_prompts, tk, environment_obj, engine))
-        log.info("")
-        
         if app_instance_name is None:
             # no filter - process all apps
-            apps_to_process = environment_obj.get_apps(engine)
+            apps_to_process[engine] = environment_obj.get_apps(engine)
         else:
             # there is a filter! Ensure the filter matches
             # something in the current engine apps listing
             if app_instance_name in environment_obj.get_apps(engine):
                 # the filter matches something!
-                apps_to_process = [app_instance_name]
+                apps_to_process[engine] = [app_instance_name]
             else:
                 # the app filter does not match anything in this engine
-                apps_to_process = []
-        
-        for app in apps_to_process:
-            items.extend(_process_item(log, suppress_prompts, tk, environment_obj, engine, app))
+                apps_to_process[engine] = []
+
+    latest_descriptors = _find_latest_versions(
+        log,
+        environment_obj,
+        engines_to_process,
+        apps_to_process,
+        environment_obj.get_frameworks()
+    )
+
+    for engine in engines_to_process:
+        items.extend(
+            _process_item(
+                log, suppress_prompts, tk, environment_obj, engine,
+                latest_descriptor=latest_descriptors.get((engine, None, None))
+            )
+        )
+        log.info("")
+
+        for app in apps_to_process[engine]:
+            items.extend(
+                _process_item(
+                    log, suppress_prompts, tk, environment_obj, engine, app,
+                    latest_descriptor=latest_descriptors.get((engine, app, None))
+                )
+            )
             log.info("")
     
     if len(environment_obj.get_frameworks()) > 0:
@@ -417,10 +439,63 @@ def _process_environment(tk,
         log.info("Frameworks:")
         log.info("-" * 70)
 
+        # frameworks installed by the updates above were not resolved
+        # up front and look up their latest version on their own.
         for framework in environment_obj.get_frameworks():
-            items.extend(_process_item(log, suppress_prompts, tk, environment_obj, framework_name=framework))
+            items.extend(
+                _process_item(
+                    log, suppress_prompts, tk, environment_obj, framework_name=framework,
+                    latest_descriptor=latest_descriptors.get((None, None, framework))
+                )
+            )
         
     return items
+
+
+def _find_latest_versions(log, environment_obj, engines, apps, frameworks):
+    """
+    Resolves the latest versions of the given engines, apps and frameworks
+    of an environment at once rather than one by one, which saves remote
+    queries for items coming from the app store.
+
+    :param log: Python logger
+    :param environment_obj: Environment object the items belong to
+    :param engines: List of engine instance names
+    :param apps: Dictionary of lists of app instance names, keyed by engine instance name
+    :param frameworks: List of framework instance names
+
+    :returns: Dictionary of latest descriptors keyed by (engine name, app name,
+              framework name) tuples, where names that don't apply are None.
+              If the versions cannot be resolved at once, the dictionary is
+              empty and each item resolves its latest version on its own.
+    """
+    keys = []
+    descriptors = []
+    constraint_patterns = []
+    for engine in engines:
+        keys.append((engine, None, None))
+        descriptors.append(environment_obj.get_engine_descriptor(engine))
+        constraint_patterns.append(None)
+        for app in apps[engine]:
+            keys.append((engine, app, None))
+            descriptors.append(environment_obj.get_app_descriptor(engine, app))
+            constraint_patterns.append(None)
+
+    for framework in frameworks:
+        keys.append((None, None, framework))
+        descriptors.append(environment_obj.get_framework_descriptor(framework))
+        # framework_name follows a convention and is on the form 'frameworkname_version',
+        # see _check_item_update_status.
+        constraint_patterns.append(framework.split("_")[-1])
+
+    try:
+        latest_descriptors = Descriptor.find_latest_versions(descriptors, constraint_patterns)
+    except Exception as e:
+        # each item will report the problem when it is processed.
+        log.debug("Could not resolve the latest versions at once: %s" % e)
+        return {}
+
+    return dict(zip(keys, latest_descriptors))
         
     
 def _update_item(log, suppress_prompts, tk, env, old_descriptor, new_descriptor, engine_name=None, app_name=None, framework_name=None):
@@ -478,10 +553,14 @@ def _update_item(log, suppress_prompts, tk, env, old_descriptor, new_descriptor,
         env.update_engine_settings(engine_name, params, new_descriptor.get_dict())
 
 
-def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=None, framework_name=None):
+def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=None, framework_name=None,
+                  latest_descriptor=None):
     """
     Checks if an app/engine/framework is up to date and potentially upgrades it.
 
+    The latest version of the item can be passed in with latest_descriptor
+    if it is already known, otherwise it is resolved.
+
     Returns a dictionary with keys:
     - was_updated (bool)
     - old_descriptor
@@ -503,7 +582,7 @@ def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=Non
         log.info("Engine %s (Environment %s)" % (engine_name, env.name))
 
 
-    status = _check_item_update_status(env, engine_name, app_name, framework_name)
+    status = _check_item_update_status(env, engine_name, app_name, framework_name, latest_descriptor)
     item_was_updated = False
     updated_items = []
 
@@ -575,7 +654,8 @@ def _process_item(log, suppress_prompts, tk, env, engine_name=None, app_name=Non
     return updated_items
 
 
-def _check_item_update_status(environment_obj, engine_name=None, app_name=None, framework_name=None):
+def _check_item_update_status(environment_obj, engine_name=None, app_name=None, framework_name=None,
+                              latest_desc=None):
     """
     Checks if an engine or app or framework is up to date.
     Will locate the latest version of the item and run a comparison.
@@ -599,19 +679,22 @@ def _check_item_update_status(environment_obj, engine_name=None, app_name=None,
         # where version is on the form v1.2.3, v1.2.x, v1.x.x
         version_pattern = framework_name.split("_")[-1]
         # use this pattern as a constraint as we check for updates
-        latest_desc = curr_desc.find_latest_version(version_pattern)
+        if latest_desc is None:
+            latest_desc = curr_desc.find_latest_version(version_pattern)
 
     elif app_name:
         curr_desc = environment_obj.get_app_descriptor(engine_name, app_name)
         # for apps, also get the descriptor for their parent engine
         parent_engine_desc = environment_obj.get_engine_descriptor(engine_name)
         # and get potential upgrades
-        latest_desc = curr_desc.find_latest_version()
+        if latest_desc is None:
+            latest_desc = curr_desc.find_latest_version()
 
     else:
         curr_desc = environment_obj.get_engine_descriptor(engine_name)
         # and get potential upgrades
-        latest_desc = curr_desc.find_latest_version()
+        if latest_desc is None:
+            latest_desc = curr_desc.find_latest_version()
 
 
     # out of date check
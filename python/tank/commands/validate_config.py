@@ -14,6 +14,7 @@ import os
 from .action_base import Action
 from ..errors import TankError
 from ..platform import validation, bundle
+from ..descriptor import Descriptor
 
 
 class ValidateConfigAction(Action):
@@ -184,7 +185,7 @@ g_templates = set()
 g_hooks = set()
 
 
-def _validate_bundle(log, tk, name, settings, descriptor, engine_name=None):
+def _validate_bundle(log, tk, name, settings, descriptor, engine_name=None, latest_descriptor=None):
     """Validate the supplied bundle including the descriptor and all settings.
     :param log: A logger instance for logging validation output.
     :param tk: A toolkit api instance.
@@ -194,6 +195,8 @@ def _validate_bundle(log, tk, name, settings, descriptor, engine_name=None):
     :param engine_name: The name of the containing engine or None.
         This is used when the bundle is an app and needs to validate engine-
         specific settings.
+    :param latest_descriptor: A descriptor object for the latest version of
+        the bundle, or None to look it up.
     """
 
     log.info("")
@@ -204,7 +207,7 @@ def _validate_bundle(log, tk, name, settings, descriptor, engine_name=None):
         descriptor.download_local()
 
     # out of date check
-    latest_desc = descriptor.find_latest_version()
+    latest_desc = latest_descriptor or descriptor.find_latest_version()
     if descriptor.version != latest_desc.version:
         log.info(
             "WARNING: Latest version is %s. You are running %s." % (latest_desc.version, descriptor.version)
@@ -263,13 +266,31 @@ def _process_environment(log, tk, env):
     :param env: An environment instance.
     """
 
+    # resolve the latest versions of all the bundles at once
+    descriptors = []
+    for e in env.get_engines():
+        descriptors.append(env.get_engine_descriptor(e))
+        for a in env.get_apps(e):
+            descriptors.append(env.get_app_descriptor(e, a))
+    try:
+        latest_descriptors = Descriptor.find_latest_versions(descriptors)
+    except Exception as error:
+        # each bundle will look up its latest version on its own.
+        log.debug("Could not resolve the latest versions at once: %s" % error)
+        latest_descriptors = [None] * len(descriptors)
+    latest_descriptors = iter(latest_descriptors)
+
     for e in env.get_engines():
         s = env.get_engine_settings(e)
         descriptor = env.get_engine_descriptor(e)
         name = "Engine %s / %s" % (env.name, e)
-        _validate_bundle(log, tk, name, s, descriptor, engine_name=e)
+        _validate_bundle(
+            log, tk, name, s, descriptor, engine_name=e, latest_descriptor=next(latest_descriptors)
+        )
         for a in env.get_apps(e):
             s = env.get_app_settings(e, a)
             descriptor = env.get_app_descriptor(e, a)
             name = "%s / %s / %s" % (env.name, e, a)
-            _validate_bundle(log, tk, name, s, descriptor, engine_name=e)
+            _validate_bundle(
+                log, tk, name, s, descriptor, engine_name=e, latest_descriptor=next(latest_descriptors)
+            )
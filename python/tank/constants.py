@@ -79,6 +79,9 @@ PROFILING_LOG_CHANNEL = "sgtk.stopwatch"
 # environment variable that if set, enables debug logging in the engine
 DEBUG_LOGGING_ENV_VAR = "TK_DEBUG"
 
+# environment variable that if set, enables the built-in profiling
+PROFILING_ENV_VAR = "TK_PROFILING"
+
 # cache data for toolkit init
 TOOLKIT_INIT_CACHE_FILE = "toolkit_init.cache"
 
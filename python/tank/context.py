@@ -1360,36 +1360,17 @@ def from_path(tk, path, previous_context=None):
     # get a cache handle
     path_cache = PathCache(tk)
 
-    # gather all roots as lower case
-    project_roots = [x.lower() for x in tk.pipeline_configuration.get_data_roots().values()]
-
-    # first gather entities
+    # first gather entities for the path and all its parents, up to the project root
     entities = []
     secondary_entities = []
-    curr_path = path
-    while True:
-        curr_entity = path_cache.get_entity(curr_path)
+    for _, curr_entity, curr_secondary_entities in path_cache.get_entities_for_ancestors(path):
         if curr_entity:
             # Don't worry about entity types we've already got in the context. In the future
             # we should look for entity ids that conflict in order to flag a degenerate schema.
             entities.append(curr_entity)
-        
-        # add secondary entities
-        secondary_entities.extend( path_cache.get_secondary_entities(curr_path) )
 
-        if curr_path.lower() in project_roots:
-            #TODO this could fail with windows path variations
-            # we have reached a root!
-            break
-
-        # and continue with parent path
-        parent_path = os.path.abspath(os.path.join(curr_path, ".."))
-
-        if curr_path == parent_path:
-            # We're at the disk root, probably a degenerate path
-            break
-        else:
-            curr_path = parent_path
+        # add secondary entities
+        secondary_entities.extend(curr_secondary_entities)
 
     path_cache.close()
 
@@ -84,3 +84,10 @@ BUNDLE_CACHE_PATH_ENV_VAR = "SHOTGUN_BUNDLE_CACHE_PATH"
 
 # environment variable used to disable connection to the app store
 DISABLE_APPSTORE_ACCESS_ENV_VAR = "SHOTGUN_DISABLE_APPSTORE_ACCESS"
+
+# environment variable used to set the number of seconds app store
+# version records are cached for. 0 disables the cache.
+APP_STORE_METADATA_CACHE_TTL_ENV_VAR = "SHOTGUN_APPSTORE_METADATA_TTL"
+
+# site cache file holding the app store version records
+APP_STORE_METADATA_CACHE_FILE = "app_store_metadata.pickle"
@@ -447,6 +447,44 @@ class Descriptor(object):
         latest._io_descriptor = self._io_descriptor.get_latest_version(constraint_pattern)
         return latest
 
+    @staticmethod
+    def find_latest_versions(descriptors, constraint_patterns=None):
+        """
+        Returns descriptor objects that represent the latest versions of
+        several descriptors.
+
+        This is equivalent to calling :meth:`find_latest_version` on each
+        descriptor, but descriptors which can be resolved together, like
+        app store descriptors, are resolved with fewer remote queries.
+
+        :param descriptors: List of instances derived from :class:`Descriptor`.
+        :param constraint_patterns: Optional list with a constraint pattern, or
+            None, for each descriptor. See :meth:`find_latest_version`.
+        :returns: List of instances derived from :class:`Descriptor`, in the
+            order of the input descriptors.
+        """
+        if constraint_patterns is None:
+            constraint_patterns = [None] * len(descriptors)
+
+        # resolve the descriptors with the same type of I/O descriptor together
+        indices_by_io_class = {}
+        for (index, descriptor) in enumerate(descriptors):
+            indices_by_io_class.setdefault(descriptor._io_descriptor.__class__, []).append(index)
+
+        latest_descriptors = [None] * len(descriptors)
+        for (io_class, indices) in indices_by_io_class.iteritems():
+            latest_io_descriptors = io_class.get_latest_versions(
+                [descriptors[index]._io_descriptor for index in indices],
+                [constraint_patterns[index] for index in indices]
+            )
+            for (index, latest_io_descriptor) in zip(indices, latest_io_descriptors):
+                # make a copy of the descriptor
+                latest = copy.copy(descriptors[index])
+                latest._io_descriptor = latest_io_descriptor
+                latest_descriptors[index] = latest
+
+        return latest_descriptors
+
     def find_latest_cached_version(self, constraint_pattern=None):
         """
         Returns a descriptor object that represents the latest version
@@ -247,6 +247,25 @@ class BundleDescriptor(Descriptor):
             frameworks = []
         return frameworks
 
+    @property
+    def declared_commands(self):
+        """
+        The commands this bundle declares it registers when it is initialized,
+        as defined in the ``commands`` section of its manifest. Engines running
+        in lazy mode use these to defer the initialization of apps until one
+        of their commands is run. For example::
+
+            [{"name": "File Open...", "properties": {"short_name": "file_open"}}]
+
+        Each item contains a name and an optional properties dictionary, which
+        is passed to :meth:`~sgtk.platform.Engine.register_command`.
+
+        :returns: list of dictionaries, or None if the bundle doesn't declare
+                  its commands.
+        """
+        manifest = self._get_manifest()
+        return manifest.get("commands")
+
     ###############################################################################################
     # compatibility accessors to ensure that all systems
     # calling this (previously internal!) parts of toolkit
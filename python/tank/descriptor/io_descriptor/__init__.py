@@ -14,3 +14,6 @@ from .factory import (
     descriptor_dict_to_uri,
     is_descriptor_version_missing
 )
+
+from .bundle_cache_index import BundleCacheIndex
+from .appstore_metadata_cache import AppStoreMetadataCache
@@ -13,8 +13,10 @@ Toolkit App Store Descriptor.
 """
 
 import os
+import time
 import urllib
 import fnmatch
+import threading
 import urllib2
 import httplib
 from tank_vendor.shotgun_api3.lib import httplib2
@@ -33,6 +35,7 @@ from ..errors import InvalidAppStoreCredentialsError
 from ... import LogManager
 from .. import constants
 from .downloadable import IODescriptorDownloadable
+from .appstore_metadata_cache import AppStoreMetadataCache
 
 from ...constants import SUPPORT_EMAIL
 
@@ -57,6 +60,9 @@ class IODescriptorAppStore(IODescriptorDownloadable):
     """
     # cache app store connections for performance
     _app_store_connections = {}
+    _app_store_connections_lock = threading.Lock()
+    # per thread copies of the cached connections, see __create_sg_app_store_connection
+    _thread_app_store_connections = threading.local()
 
     # internal app store mappings
     (APP, FRAMEWORK, ENGINE, CONFIG, CORE) = range(5)
@@ -540,7 +546,9 @@ class IODescriptorAppStore(IODescriptorDownloadable):
         Returns a descriptor object that represents the latest version.
 
         This method will connect to the toolkit app store and download
-        metadata to determine the latest version.
+        metadata to determine the latest version. If the app store metadata
+        cache is enabled, see :meth:`get_latest_versions`, cached metadata
+        is used instead when it is recent enough.
 
         :param constraint_pattern: If this is specified, the query will be constrained
                by the given pattern. Version patterns are on the following forms:
@@ -555,17 +563,14 @@ class IODescriptorAppStore(IODescriptorDownloadable):
             "Determining latest version for %r given constraint pattern %s" % (self, constraint_pattern)
         )
 
+        if self.__get_metadata_cache_ttl():
+            return self.get_latest_versions([self], [constraint_pattern])[0]
+
         # connect to the app store
         (sg, _) = self.__create_sg_app_store_connection()
 
         # get latest get the filter logic for what to exclude
-        if constants.APP_STORE_QA_MODE_ENV_VAR in os.environ:
-            sg_filter = [["sg_status_list", "is_not", "bad"]]
-        else:
-            sg_filter = [
-                ["sg_status_list", "is_not", "rev"],
-                ["sg_status_list", "is_not", "bad"]
-            ]
+        sg_filter = self.__get_version_status_filter()
 
         if self._type != self.CORE:
             # find the main entry
@@ -607,6 +612,347 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         log.debug("Downloaded data for %d versions from Shotgun." % len(sg_versions))
 
+        return self.__resolve_latest_version(sg_bundle_data, sg_versions, constraint_pattern)
+
+    @classmethod
+    @LogManager.log_timing
+    def get_latest_versions(cls, io_descriptors, constraint_patterns=None):
+        """
+        Returns descriptor objects that represent the latest versions of
+        several app store descriptors.
+
+        The app store is queried once for the bundles and once for the
+        versions of each bundle type, rather than twice for each descriptor.
+
+        The version records are cached for the number of seconds set with the
+        ``SHOTGUN_APPSTORE_METADATA_TTL`` environment variable, in the
+        cache folder of the Shotgun site. When cached records expire, the app
+        store is asked whether they have been updated, or whether versions
+        have been added or removed, since they were fetched and they are only
+        fetched again if they have.
+
+        :param io_descriptors: List of IODescriptorAppStore objects.
+        :param constraint_patterns: Optional list with a constraint pattern,
+            or None, for each descriptor. See :meth:`get_latest_version`.
+        :returns: List of IODescriptorAppStore objects, in the order of
+            the input descriptors.
+        :raises: TankDescriptorError if the app store doesn't have a matching
+            version of one of the bundles.
+        """
+        if constraint_patterns is None:
+            constraint_patterns = [None] * len(io_descriptors)
+
+        # descriptors may come from different sites, which have their own
+        # app store connections and caches.
+        descriptors_by_site = {}
+        for io_descriptor in io_descriptors:
+            descriptors_by_site.setdefault(io_descriptor.__get_site_url(), []).append(io_descriptor)
+
+        metadata = {}
+        for (site_url, site_descriptors) in descriptors_by_site.iteritems():
+            metadata[site_url] = cls.__get_versions_metadata(site_url, site_descriptors)
+
+        latest_descriptors = []
+        for (io_descriptor, constraint_pattern) in zip(io_descriptors, constraint_patterns):
+            entry = metadata[io_descriptor.__get_site_url()][io_descriptor.__get_metadata_cache_key()]
+            latest_descriptors.append(
+                io_descriptor.__resolve_latest_version(
+                    entry["sg_bundle_data"], entry["sg_versions"], constraint_pattern
+                )
+            )
+        return latest_descriptors
+
+    @classmethod
+    def __get_versions_metadata(cls, site_url, io_descriptors):
+        """
+        Returns the app store records needed to resolve the latest versions
+        of descriptors of a site, from the cache or the app store.
+
+        :param str site_url: Url of the site of the descriptors, None if not known.
+        :param io_descriptors: List of IODescriptorAppStore objects.
+        :returns: Dictionary of entries by cache key, see :class:`AppStoreMetadataCache`.
+        """
+        ttl = cls.__get_metadata_cache_ttl()
+        cache = AppStoreMetadataCache(site_url) if ttl and site_url else None
+        now = time.time()
+
+        entries = {}
+        stale_entries = {}
+        missing_descriptors = {}
+        for io_descriptor in io_descriptors:
+            key = io_descriptor.__get_metadata_cache_key()
+            entry = cache.get(key) if cache else None
+            if entry is None:
+                missing_descriptors[key] = io_descriptor
+            elif now - entry["fetched_at"] < ttl:
+                entries[key] = entry
+            else:
+                stale_entries[key] = (io_descriptor, entry)
+
+        if stale_entries or missing_descriptors:
+            # connect to the app store
+            (sg, _) = io_descriptors[0].__create_sg_app_store_connection()
+
+            # records which haven't been updated in the app store since they were
+            # fetched are kept, the others are fetched again.
+            updated_entries = {}
+            updated_keys = cls.__find_updated_entries(sg, stale_entries)
+            for (key, (io_descriptor, entry)) in stale_entries.iteritems():
+                if key in updated_keys:
+                    missing_descriptors[key] = io_descriptor
+                else:
+                    entry = dict(entry, fetched_at=now)
+                    entries[key] = updated_entries[key] = entry
+
+            fetched_entries = cls.__fetch_entries(sg, missing_descriptors, now)
+            entries.update(fetched_entries)
+            updated_entries.update(fetched_entries)
+            if cache:
+                cache.update(updated_entries)
+
+        return entries
+
+    @classmethod
+    def __find_updated_entries(cls, sg, stale_entries):
+        """
+        Finds out which cached records have changed in the app store since
+        they were fetched, with one query for the bundles and one for the
+        versions of each bundle type.
+
+        Records have changed if they have been updated, or if versions have
+        been added, deleted or retired, which is detected by comparing the
+        ids of the versions with the cached ones.
+
+        :param sg: App store connection.
+        :param dict stale_entries: Dictionary of (IODescriptorAppStore, entry)
+            tuples by cache key.
+        :returns: Set of the keys of the entries to fetch again.
+        """
+        updated_keys = set()
+        entries_by_type = {}
+        for (key, (io_descriptor, entry)) in stale_entries.iteritems():
+            if entry["updated_at"] is None:
+                # nothing to compare with.
+                updated_keys.add(key)
+            else:
+                entries_by_type.setdefault(io_descriptor._type, {})[key] = (io_descriptor, entry)
+
+        for (bundle_type, type_entries) in entries_by_type.iteritems():
+            updated_since = min(entry["updated_at"] for (_, entry) in type_entries.itervalues())
+            # only the ids and modification dates of the versions are
+            # retrieved, which is much cheaper than fetching them again.
+            sg_filter = cls.__get_version_status_filter()
+
+            if bundle_type == cls.CORE:
+                # core doesn't have a parent entity for its versions
+                sg_versions = sg.find(
+                    constants.TANK_CORE_VERSION_ENTITY_TYPE,
+                    sg_filter,
+                    ["updated_at"]
+                )
+                version_ids = set(x["id"] for x in sg_versions)
+                updated_at = max([x["updated_at"] for x in sg_versions if x.get("updated_at")] or [None])
+                for (key, (_, entry)) in type_entries.iteritems():
+                    if (
+                        version_ids != set(x["id"] for x in entry["sg_versions"]) or
+                        (updated_at and updated_at > entry["updated_at"])
+                    ):
+                        updated_keys.add(key)
+                continue
+
+            bundles = [entry["sg_bundle_data"] for (_, entry) in type_entries.itervalues()]
+            link_field = cls._APP_STORE_LINK[bundle_type]
+            updated_at_by_bundle_id = {}
+            version_ids_by_bundle_id = {}
+            sg_bundles = sg.find(
+                cls._APP_STORE_OBJECT[bundle_type],
+                [["id", "in", [bundle["id"] for bundle in bundles]], ["updated_at", "greater_than", updated_since]],
+                ["updated_at"]
+            )
+            sg_versions = sg.find(
+                cls._APP_STORE_VERSION[bundle_type],
+                sg_filter + [[link_field, "in", bundles]],
+                [link_field, "updated_at"]
+            )
+            for sg_version in sg_versions:
+                if sg_version[link_field]:
+                    version_ids_by_bundle_id.setdefault(sg_version[link_field]["id"], set()).add(sg_version["id"])
+            for (bundle_id, updated_at) in (
+                [(x["id"], x["updated_at"]) for x in sg_bundles] +
+                [(x[link_field]["id"], x["updated_at"]) for x in sg_versions if x[link_field]]
+            ):
+                if updated_at:
+                    updated_at_by_bundle_id[bundle_id] = max(
+                        updated_at, updated_at_by_bundle_id.get(bundle_id, updated_at)
+                    )
+
+            for (key, (_, entry)) in type_entries.iteritems():
+                bundle_id = entry["sg_bundle_data"]["id"]
+                updated_at = updated_at_by_bundle_id.get(bundle_id)
+                version_ids = version_ids_by_bundle_id.get(bundle_id, set())
+                if (
+                    version_ids != set(x["id"] for x in entry["sg_versions"]) or
+                    (updated_at and updated_at > entry["updated_at"])
+                ):
+                    updated_keys.add(key)
+
+        return updated_keys
+
+    @classmethod
+    def __fetch_entries(cls, sg, io_descriptors, fetched_at):
+        """
+        Fetches the records needed to resolve the latest versions of
+        descriptors, with one query for the bundles and one for the versions
+        of each bundle type.
+
+        :param sg: App store connection.
+        :param dict io_descriptors: Dictionary of IODescriptorAppStore objects
+            by cache key.
+        :param float fetched_at: Time at which the records are fetched.
+        :returns: Dictionary of entries by cache key, see :class:`AppStoreMetadataCache`.
+        :raises: TankDescriptorError if the app store doesn't have one of the bundles.
+        """
+        entries = {}
+        descriptors_by_type = {}
+        for (key, io_descriptor) in io_descriptors.iteritems():
+            descriptors_by_type.setdefault(io_descriptor._type, {})[key] = io_descriptor
+
+        for (bundle_type, type_descriptors) in descriptors_by_type.iteritems():
+            sg_filter = cls.__get_version_status_filter()
+
+            if bundle_type == cls.CORE:
+                # core doesn't have a parent entity for its versions
+                sg_versions = sg.find(
+                    constants.TANK_CORE_VERSION_ENTITY_TYPE,
+                    filters=sg_filter,
+                    fields=cls._VERSION_FIELDS_TO_CACHE + ["updated_at"],
+                    order=[{"field_name": "created_at", "direction": "desc"}]
+                )
+                for key in type_descriptors:
+                    entries[key] = cls.__make_metadata_cache_entry(None, sg_versions, fetched_at)
+                continue
+
+            names = sorted(set(x._name for x in type_descriptors.itervalues()))
+            sg_bundles = sg.find(
+                cls._APP_STORE_OBJECT[bundle_type],
+                [["sg_system_name", "in", names]],
+                cls._BUNDLE_FIELDS_TO_CACHE + ["updated_at"]
+            )
+            sg_bundles_by_name = dict((x["sg_system_name"], x) for x in sg_bundles)
+            for name in names:
+                if name not in sg_bundles_by_name:
+                    raise TankDescriptorError("App store does not contain an item named '%s'!" % name)
+
+            link_field = cls._APP_STORE_LINK[bundle_type]
+            sg_versions = sg.find(
+                cls._APP_STORE_VERSION[bundle_type],
+                filters=sg_filter + [[link_field, "in", sg_bundles]],
+                fields=cls._VERSION_FIELDS_TO_CACHE + [link_field, "updated_at"],
+                order=[{"field_name": "created_at", "direction": "desc"}]
+            )
+            log.debug(
+                "Downloaded data for %d versions of %d bundles from Shotgun." % (len(sg_versions), len(names))
+            )
+
+            for (key, io_descriptor) in type_descriptors.iteritems():
+                sg_bundle_data = sg_bundles_by_name[io_descriptor._name]
+                bundle_versions = [
+                    x for x in sg_versions
+                    if x[link_field] and x[link_field]["id"] == sg_bundle_data["id"]
+                ]
+                entries[key] = cls.__make_metadata_cache_entry(sg_bundle_data, bundle_versions, fetched_at)
+
+        return entries
+
+    @staticmethod
+    def __make_metadata_cache_entry(sg_bundle_data, sg_versions, fetched_at):
+        """
+        Creates an app store metadata cache entry, see :class:`AppStoreMetadataCache`.
+
+        :param dict sg_bundle_data: Bundle record, None for core.
+        :param list sg_versions: Version records, latest first.
+        :param float fetched_at: Time at which the records were fetched.
+        :returns: Entry dictionary.
+        """
+        updated_at = [x["updated_at"] for x in sg_versions if x.get("updated_at")]
+        if sg_bundle_data and sg_bundle_data.get("updated_at"):
+            updated_at.append(sg_bundle_data["updated_at"])
+        return {
+            "fetched_at": fetched_at,
+            "updated_at": max(updated_at) if updated_at else None,
+            "sg_bundle_data": sg_bundle_data,
+            "sg_versions": sg_versions,
+        }
+
+    def __get_site_url(self):
+        """
+        Returns the url of the Shotgun site of this descriptor.
+
+        :returns: Url or None if the descriptor has no Shotgun connection.
+        """
+        return self._sg_connection.base_url if self._sg_connection else None
+
+    def __get_metadata_cache_key(self):
+        """
+        Returns the key of the app store metadata cache entry holding the
+        records of this descriptor.
+
+        :returns: Tuple with the version entity type, the name of the bundle,
+            None for core, and whether the app store QA mode is enabled.
+        """
+        return (
+            self._APP_STORE_VERSION[self._type],
+            None if self._type == self.CORE else self._name,
+            constants.APP_STORE_QA_MODE_ENV_VAR in os.environ
+        )
+
+    @staticmethod
+    def __get_metadata_cache_ttl():
+        """
+        Returns the number of seconds the app store version records are cached for.
+
+        :returns: Number of seconds, 0 if the cache is disabled.
+        """
+        value = os.environ.get(constants.APP_STORE_METADATA_CACHE_TTL_ENV_VAR)
+        if not value:
+            return 0
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            log.warning(
+                "Invalid value '%s' for %s, app store metadata won't be cached." % (
+                    value, constants.APP_STORE_METADATA_CACHE_TTL_ENV_VAR
+                )
+            )
+            return 0
+
+    @staticmethod
+    def __get_version_status_filter():
+        """
+        Returns the filters excluding the versions which shouldn't be used
+        from app store queries.
+
+        :returns: List of Shotgun filters.
+        """
+        # get latest get the filter logic for what to exclude
+        if constants.APP_STORE_QA_MODE_ENV_VAR in os.environ:
+            return [["sg_status_list", "is_not", "bad"]]
+        else:
+            return [
+                ["sg_status_list", "is_not", "rev"],
+                ["sg_status_list", "is_not", "bad"]
+            ]
+
+    def __resolve_latest_version(self, sg_bundle_data, sg_versions, constraint_pattern):
+        """
+        Picks the latest version matching the label and constraint
+        pattern amongst app store version records.
+
+        :param dict sg_bundle_data: Bundle record, None for core.
+        :param list sg_versions: Version records, latest first.
+        :param constraint_pattern: Optional constraint pattern, see :meth:`get_latest_version`.
+        :returns: IODescriptorAppStore object
+        """
         # now filter out all labels that aren't matching
         matching_records = []
         for sg_version_entry in sg_versions:
@@ -710,83 +1056,114 @@ class IODescriptorAppStore(IODescriptorDownloadable):
 
         sg_url = self._sg_connection.base_url
 
-        if sg_url not in self._app_store_connections:
-
-            # Connect to associated Shotgun site and retrieve the credentials to use to
-            # connect to the app store site
-            try:
-                (script_name, script_key) = self.__get_app_store_key_from_shotgun()
-            except urllib2.HTTPError as e:
-                if e.code == 403:
-                    # edge case alert!
-                    # this is likely because our session token in shotgun has expired.
-                    # The authentication system is based around wrapping the shotgun API,
-                    # and requesting authentication if needed. Because the app store
-                    # credentials is a separate endpoint and doesn't go via the shotgun
-                    # API, we have to explicitly check.
-                    #
-                    # trigger a refresh of our session token by issuing a shotgun API call
-                    self._sg_connection.find_one("HumanUser", [])
-                    # and retry
-                    (script_name, script_key) = self.__get_app_store_key_from_shotgun()
-                else:
-                    raise
-
-            log.debug("Connecting to %s..." % constants.SGTK_APP_STORE)
-            # Connect to the app store and resolve the script user id we are connecting with.
-            # Set the timeout explicitly so we ensure the connection won't hang in cases where
-            # a response is not returned in a reasonable amount of time.
-            app_store_sg = shotgun_api3.Shotgun(
+        with self._app_store_connections_lock:
+            if sg_url not in self._app_store_connections:
+                self._app_store_connections[sg_url] = self.__connect_to_app_store()
+            (app_store_sg, script_user) = self._app_store_connections[sg_url]
+
+        # Shotgun API instances can't be used by several threads at the same
+        # time, e.g. when bundles are downloaded in parallel. Each thread uses
+        # its own copy of the connection to the app store.
+        thread_connections = getattr(self._thread_app_store_connections, "connections", None)
+        if thread_connections is None:
+            thread_connections = {}
+            self._thread_app_store_connections.connections = thread_connections
+
+        if sg_url not in thread_connections:
+            thread_sg = shotgun_api3.Shotgun(
                 constants.SGTK_APP_STORE,
-                script_name=script_name,
-                api_key=script_key,
+                script_name=app_store_sg.config.script_name,
+                api_key=app_store_sg.config.api_key,
                 http_proxy=self.__get_app_store_proxy_setting(),
                 connect=False
             )
-            # set the default timeout for app store connections
-            app_store_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+            thread_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+            thread_connections[sg_url] = (thread_sg, script_user)
 
-            # determine the script user running currently
-            # get the API script user ID from shotgun
-            try:
-                script_user = app_store_sg.find_one(
-                    "ApiUser",
-                    filters=[["firstname", "is", script_name]],
-                    fields=["type", "id"]
-                )
-            except shotgun_api3.AuthenticationFault:
-                raise InvalidAppStoreCredentialsError(
-                    "The Toolkit App Store credentials found in Shotgun are invalid.\n"
-                    "Please contact %s to resolve this issue." % SUPPORT_EMAIL
-                )
-            # Connection errors can occur for a variety of reasons. For example, there is no
-            # internet access or there is a proxy server blocking access to the Toolkit app store.
-            except (httplib2.HttpLib2Error, httplib2.socks.HTTPError, httplib.HTTPException) as e:
-                raise TankAppStoreConnectionError(e)
-            # In cases where there is a firewall/proxy blocking access to the app store, sometimes
-            # the firewall will drop the connection instead of rejecting it. The API request will
-            # timeout which unfortunately results in a generic SSLError with only the message text
-            # to give us a clue why the request failed.
-            # The exception raised in this case is "ssl.SSLError: The read operation timed out"
-            except httplib2.ssl.SSLError as e:
-                if "timed" in e.message:
-                    raise TankAppStoreConnectionError(
-                        "Connection to %s timed out: %s" % (app_store_sg.config.server, e)
-                    )
-                else:
-                    # other type of ssl error
-                    raise TankAppStoreError(e)
-            except Exception as e:
-                raise TankAppStoreError(e)
+        return thread_connections[sg_url]
 
-            if script_user is None:
-                raise TankAppStoreError(
-                    "Could not evaluate the current App Store User! Please contact support."
+    def __connect_to_app_store(self):
+        """
+        Connects to the Toolkit app store with the credentials of the client
+        Shotgun site.
+
+        :returns: (sg, dict) where the first item is the shotgun api instance and the second
+                  is an sg entity dictionary (keys type/id) corresponding to to the user used
+                  to connect to the app store.
+        """
+        # Connect to associated Shotgun site and retrieve the credentials to use to
+        # connect to the app store site
+        try:
+            (script_name, script_key) = self.__get_app_store_key_from_shotgun()
+        except urllib2.HTTPError as e:
+            if e.code == 403:
+                # edge case alert!
+                # this is likely because our session token in shotgun has expired.
+                # The authentication system is based around wrapping the shotgun API,
+                # and requesting authentication if needed. Because the app store
+                # credentials is a separate endpoint and doesn't go via the shotgun
+                # API, we have to explicitly check.
+                #
+                # trigger a refresh of our session token by issuing a shotgun API call
+                self._sg_connection.find_one("HumanUser", [])
+                # and retry
+                (script_name, script_key) = self.__get_app_store_key_from_shotgun()
+            else:
+                raise
+
+        log.debug("Connecting to %s..." % constants.SGTK_APP_STORE)
+        # Connect to the app store and resolve the script user id we are connecting with.
+        # Set the timeout explicitly so we ensure the connection won't hang in cases where
+        # a response is not returned in a reasonable amount of time.
+        app_store_sg = shotgun_api3.Shotgun(
+            constants.SGTK_APP_STORE,
+            script_name=script_name,
+            api_key=script_key,
+            http_proxy=self.__get_app_store_proxy_setting(),
+            connect=False
+        )
+        # set the default timeout for app store connections
+        app_store_sg.config.timeout_secs = constants.SGTK_APP_STORE_CONN_TIMEOUT
+
+        # determine the script user running currently
+        # get the API script user ID from shotgun
+        try:
+            script_user = app_store_sg.find_one(
+                "ApiUser",
+                filters=[["firstname", "is", script_name]],
+                fields=["type", "id"]
+            )
+        except shotgun_api3.AuthenticationFault:
+            raise InvalidAppStoreCredentialsError(
+                "The Toolkit App Store credentials found in Shotgun are invalid.\n"
+                "Please contact %s to resolve this issue." % SUPPORT_EMAIL
+            )
+        # Connection errors can occur for a variety of reasons. For example, there is no
+        # internet access or there is a proxy server blocking access to the Toolkit app store.
+        except (httplib2.HttpLib2Error, httplib2.socks.HTTPError, httplib.HTTPException) as e:
+            raise TankAppStoreConnectionError(e)
+        # In cases where there is a firewall/proxy blocking access to the app store, sometimes
+        # the firewall will drop the connection instead of rejecting it. The API request will
+        # timeout which unfortunately results in a generic SSLError with only the message text
+        # to give us a clue why the request failed.
+        # The exception raised in this case is "ssl.SSLError: The read operation timed out"
+        except httplib2.ssl.SSLError as e:
+            if "timed" in e.message:
+                raise TankAppStoreConnectionError(
+                    "Connection to %s timed out: %s" % (app_store_sg.config.server, e)
                 )
+            else:
+                # other type of ssl error
+                raise TankAppStoreError(e)
+        except Exception as e:
+            raise TankAppStoreError(e)
 
-            self._app_store_connections[sg_url] = (app_store_sg, script_user)
+        if script_user is None:
+            raise TankAppStoreError(
+                "Could not evaluate the current App Store User! Please contact support."
+            )
 
-        return self._app_store_connections[sg_url]
+        return (app_store_sg, script_user)
 
     def __get_app_store_proxy_setting(self):
         """
@@ -0,0 +1,133 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Site scoped cache of the version records of app store bundles.
+"""
+
+import os
+import threading
+import cPickle as pickle
+
+from ...util import filesystem
+from ...util import LocalFileStorageManager
+from ... import LogManager
+from .. import constants
+
+log = LogManager.get_logger(__name__)
+
+
+class AppStoreMetadataCache(object):
+    """
+    Cache of the app store records needed to resolve the latest versions of
+    bundles, shared by the processes running for a given Shotgun site.
+
+    Entries are keyed by a tuple identifying the records, e.g. the version
+    entity type and the name of the bundle, and are dictionaries with the
+    following keys:
+
+    - ``fetched_at``: Time, as returned by :func:`time.time`, at which the
+      records were fetched or last found to be up to date.
+    - ``updated_at``: Most recent update time of the records, as reported by
+      the app store, used to find out whether they have changed since.
+    - ``sg_bundle_data``: Record of the bundle, None for core.
+    - ``sg_versions``: Records of the versions of the bundle, latest first.
+
+    The cache is stored in the site cache folder and is loaded once per
+    process. Failing to read or write it is logged and otherwise ignored.
+    """
+
+    _lock = threading.Lock()
+    # {site url: {key: entry}}
+    _site_entries = {}
+
+    def __init__(self, site_url):
+        """
+        :param str site_url: Url of the Shotgun site the cache is for.
+        """
+        self._site_url = site_url
+        self._path = os.path.join(
+            LocalFileStorageManager.get_site_root(site_url, LocalFileStorageManager.CACHE),
+            constants.APP_STORE_METADATA_CACHE_FILE
+        )
+
+    def get(self, key):
+        """
+        Returns a cached entry.
+
+        :param tuple key: Key of the entry.
+        :returns: The entry dictionary or None if there is no such entry.
+        """
+        with self._lock:
+            entries = self._site_entries.get(self._site_url)
+            if entries is None:
+                entries = self._load()
+                self._site_entries[self._site_url] = entries
+            return entries.get(key)
+
+    @filesystem.with_cleared_umask
+    def update(self, entries):
+        """
+        Adds or replaces entries and writes the cache to disk.
+
+        Entries written by other processes since the cache was loaded are
+        kept, unless they are older than the ones of this process.
+
+        :param dict entries: Dictionary of entries by key.
+        """
+        with self._lock:
+            cache_data = dict(self._site_entries.get(self._site_url) or {})
+            for (key, entry) in self._load().iteritems():
+                if key not in cache_data or entry["fetched_at"] > cache_data[key]["fetched_at"]:
+                    cache_data[key] = entry
+            cache_data.update(entries)
+            self._site_entries[self._site_url] = cache_data
+
+            try:
+                filesystem.ensure_folder_exists(os.path.dirname(self._path))
+                fh = open(self._path, "wb")
+                try:
+                    pickle.dump(cache_data, fh, pickle.HIGHEST_PROTOCOL)
+                finally:
+                    fh.close()
+                # and ensure the cache file has got open permissions
+                os.chmod(self._path, 0o666)
+            except Exception as e:
+                log.debug("Failed to write app store metadata cache %s. Error: %s" % (self._path, e))
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards the entries loaded by this process, so that the cache
+        is loaded from disk again.
+        """
+        with cls._lock:
+            cls._site_entries = {}
+
+    def _load(self):
+        """
+        Loads the cache from disk.
+
+        :returns: Dictionary of entries by key, empty if the cache couldn't be loaded.
+        """
+        if not os.path.exists(self._path):
+            return {}
+        try:
+            fh = open(self._path, "rb")
+            try:
+                return pickle.load(fh)
+            finally:
+                fh.close()
+        except Exception as e:
+            log.debug(
+                "Failed to load app store metadata cache %s. Proceeding without cache. "
+                "Error: %s" % (self._path, e)
+            )
+            return {}
@@ -19,6 +19,7 @@ from ... import LogManager
 from ...util import filesystem
 from ...util.version import is_version_newer
 from ..errors import TankDescriptorError, TankMissingManifestError
+from .bundle_cache_index import BundleCacheIndex
 
 from tank_vendor import yaml
 
@@ -607,7 +608,7 @@ class IODescriptorBase(object):
             return False
 
         # check that the main path exists locally and is a folder
-        if not os.path.isdir(path):
+        if not BundleCacheIndex.folder_exists(path):
             return False
 
         return True
@@ -647,7 +648,7 @@ class IODescriptorBase(object):
         for path in self._get_cache_paths():
             # we determine local existence based on the existence of the
             # bundle's directory on disk.
-            if self._exists_local(path):
+            if BundleCacheIndex.exists_local(path, self._exists_local):
                 return path
 
         return None
@@ -703,6 +704,7 @@ class IODescriptorBase(object):
         # pass an empty skip list to ensure we copy things like the .git folder
         filesystem.ensure_folder_exists(new_cache_path, permissions=0o777)
         filesystem.copy_folder(source_cache_path, new_cache_path, skip_list=[])
+        BundleCacheIndex.discard(new_cache_path)
         return True
 
     ###############################################################################################
@@ -752,6 +754,29 @@ class IODescriptorBase(object):
         """
         raise NotImplementedError
 
+    @classmethod
+    def get_latest_versions(cls, io_descriptors, constraint_patterns=None):
+        """
+        Returns descriptor objects that represent the latest versions of
+        several descriptors of this class.
+
+        Derived classes which can find the latest versions of several
+        descriptors at once more efficiently than one by one override this
+        method.
+
+        :param io_descriptors: List of descriptors of this class.
+        :param constraint_patterns: Optional list with a constraint pattern,
+            or None, for each descriptor. See :meth:`get_latest_version`.
+        :returns: List of instances deriving from IODescriptorBase, in the
+            order of the input descriptors.
+        """
+        if constraint_patterns is None:
+            constraint_patterns = [None] * len(io_descriptors)
+        return [
+            io_descriptor.get_latest_version(constraint_pattern)
+            for (io_descriptor, constraint_pattern) in zip(io_descriptors, constraint_patterns)
+        ]
+
     def get_latest_cached_version(self, constraint_pattern=None):
         """
         Returns a descriptor object that represents the latest version
@@ -0,0 +1,183 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+In-memory index of the bundle cache, used to batch the checks made to find
+out whether bundles exist locally.
+"""
+
+import os
+import errno
+import threading
+import contextlib
+
+from ... import LogManager
+
+log = LogManager.get_logger(__name__)
+
+
+class BundleCacheIndex(object):
+    """
+    Index of the content of the bundle cache folders, built from a single
+    listing of each folder holding the versions of a bundle, e.g.
+    ``app_store/tk-multi-publish2``.
+
+    Checking whether a bundle exists locally probes every fallback root and
+    the primary bundle cache, and then the files marking the bundle as
+    completely downloaded. When many bundles are checked in a row, for example
+    when a configuration is cached or an engine loads its apps, these checks
+    can be batched with :meth:`snapshot`::
+
+        with BundleCacheIndex.snapshot():
+            for descriptor in descriptors:
+                descriptor.exists_local()
+
+    While a snapshot is active, the versions missing from a folder listing are
+    reported missing without being checked, the versions found in a listing
+    don't need their folder to be checked, and the result of the check made
+    for each bundle path is reused. Downloads update the index, so it stays
+    accurate for bundles downloaded by the current process. Outside of
+    snapshots, bundles are always checked on disk.
+
+    Snapshots are scoped to the thread which opened them, other threads keep
+    checking bundles on disk.
+    """
+
+    class _SnapshotState(threading.local):
+        """
+        Snapshot state of a thread.
+        """
+        def __init__(self):
+            # number of snapshots currently active.
+            self.count = 0
+            # {folder path: set of the names of the items in the folder}
+            self.listings = {}
+            # {bundle path: whether the bundle exists locally}
+            self.results = {}
+
+    _state = _SnapshotState()
+
+    @classmethod
+    @contextlib.contextmanager
+    def snapshot(cls):
+        """
+        Context manager within which the checks made by the current thread to
+        find out whether bundles exist locally use the index. Snapshots can be
+        nested, the index is discarded when the outermost snapshot exits.
+        """
+        state = cls._state
+        state.count += 1
+        try:
+            yield
+        finally:
+            state.count -= 1
+            if state.count == 0:
+                state.listings = {}
+                state.results = {}
+
+    @classmethod
+    def exists_local(cls, path, check_func):
+        """
+        Returns whether a bundle exists locally at a given path.
+
+        :param str path: Path to the bundle in a bundle cache.
+        :param check_func: Callable taking the path as its only argument and
+            checking on disk whether the bundle exists locally, used when the
+            index can't tell.
+        :returns: True if the bundle exists locally, False otherwise.
+        """
+        state = cls._state
+        if not state.count or path is None:
+            return check_func(path)
+
+        result = state.results.get(path)
+        if result is not None:
+            return result
+
+        (folder, name) = os.path.split(path)
+        listing = cls._get_listing(folder)
+        if listing is None or name in listing:
+            result = check_func(path)
+        else:
+            result = False
+
+        state.results[path] = result
+        return result
+
+    @classmethod
+    def folder_exists(cls, path):
+        """
+        Returns whether the folder of a bundle exists. While a snapshot is
+        active, this is answered by the listing of its parent folder.
+
+        :param str path: Path to the bundle in a bundle cache.
+        :returns: True if the folder exists, False otherwise.
+        """
+        if cls._state.count:
+            listing = cls._get_listing(os.path.dirname(path))
+            if listing is not None:
+                return os.path.basename(path) in listing
+        return os.path.isdir(path)
+
+    @classmethod
+    def add(cls, path):
+        """
+        Records that a bundle was just downloaded at the given path.
+
+        :param str path: Path to the bundle in a bundle cache.
+        """
+        state = cls._state
+        if not state.count:
+            return
+        (folder, name) = os.path.split(path)
+        state.results[path] = True
+        listing = state.listings.get(folder)
+        if listing is not None:
+            state.listings[folder] = listing | frozenset([name])
+
+    @classmethod
+    def discard(cls, path):
+        """
+        Discards what the index knows about a bundle, so that it is checked on
+        disk the next time, e.g. because another process may have downloaded it.
+
+        :param str path: Path to the bundle in a bundle cache.
+        """
+        state = cls._state
+        state.results.pop(path, None)
+        state.listings.pop(os.path.dirname(path), None)
+
+    @classmethod
+    def _get_listing(cls, folder):
+        """
+        Returns the names of the items in a folder, listing it if it hasn't
+        been listed yet during the current snapshot.
+
+        :param str folder: Path to the folder.
+        :returns: A frozenset of names, empty if the folder doesn't exist, or
+            None if the folder couldn't be listed.
+        """
+        state = cls._state
+        listing = state.listings.get(folder)
+        if listing is not None:
+            return listing
+
+        try:
+            listing = frozenset(os.listdir(folder))
+        except OSError as e:
+            if e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                # let the bundles be checked one by one.
+                return None
+            listing = frozenset()
+        log.debug("Indexed %d items of bundle cache folder %s", len(listing), folder)
+
+        if state.count:
+            state.listings[folder] = listing
+        return listing
@@ -12,6 +12,7 @@ import os
 import uuid
 
 from .base import IODescriptorBase
+from .bundle_cache_index import BundleCacheIndex
 from ..errors import TankDescriptorIOError
 from ...util import filesystem
 
@@ -56,16 +57,18 @@ class IODescriptorDownloadable(IODescriptorBase):
         processes attempting to download the same descriptor simultaneously.
         """
 
-        # Return if the descriptor exists locally.
+        # compute the location where we eventually want to move into
+        target = self._get_primary_cache_path()
+
+        # Return if the descriptor exists locally. Another process may have
+        # downloaded it since the bundle cache was indexed, so check on disk.
+        BundleCacheIndex.discard(target)
         if self.exists_local():
             return
 
         # download it into a unique temporary location
         temporary_path = self._get_temporary_cache_path()
 
-        # compute the location where we eventually want to move into
-        target = self._get_primary_cache_path()
-
         # ensure that the parent directory of the target is present.
         # make sure we guard against multiple processes attempting to create it simultaneously.
         target_parent = os.path.dirname(target)
@@ -118,6 +121,8 @@ class IODescriptorDownloadable(IODescriptorBase):
 
             # if the target path already exists, this means someone else is either
             # moving things right now or have moved it already, so we are ok.
+            # make sure the bundle cache index doesn't answer from a stale listing.
+            BundleCacheIndex.discard(target)
             if not self._exists_local(target):
                 # the target path does not exist. so the rename failed for other reasons.
 
@@ -169,6 +174,7 @@ class IODescriptorDownloadable(IODescriptorBase):
                     if os.path.exists(target):
                         log.debug("Move failed. Attempting to clear out target path '%s'" % target)
                         filesystem.safe_delete_folder(target)
+                    BundleCacheIndex.discard(target)
 
                     # ...and raise an error. Include callstack so we get full visibility here.
                     log.exception(
@@ -184,8 +190,11 @@ class IODescriptorDownloadable(IODescriptorBase):
                 log.debug("Target location %s already exists." % target)
                 log.debug("Removing temporary download %s" % temporary_path)
                 filesystem.safe_delete_folder(temporary_path)
+                BundleCacheIndex.add(target)
 
         if move_succeeded:
+            BundleCacheIndex.add(target)
+
             # download completed ok! Run post processing
             self._post_download(target)
 
@@ -19,6 +19,7 @@ import inspect
 import threading
 from .util.loader import load_plugin
 from . import LogManager
+from .profiling import Profiler
 from .errors import (
     TankError,
     TankFileDoesNotExistError,
@@ -462,12 +463,18 @@ class _HooksCache(object):
     A thread-safe cache of loaded hooks.  This uses the hook file path
     and base class as the key to cache all hooks loaded by Toolkit in
     the current session.
+
+    The final classes of fully loaded inheritance chains of hooks are
+    cached as well, keyed by the list of hook paths and the base class,
+    so that hooks which are executed repeatedly can be dispatched without
+    walking through their chain again.
     """
     def __init__(self):
         """
         Construction
         """
         self._cache = {}
+        self._chains = {}
         self._cache_lock = threading.Lock()
 
     def thread_exclusive(func):
@@ -497,6 +504,7 @@ class _HooksCache(object):
         Clear the hook cache
         """
         self._cache = {}
+        self._chains = {}
 
     @thread_exclusive
     def find(self, hook_path, hook_base_class):
@@ -527,6 +535,32 @@ class _HooksCache(object):
         if key not in self._cache:
             self._cache[key] = hook_class
 
+    def find_chain(self, hook_paths, hook_base_class):
+        """
+        Find the final class of a chain of hooks in the cache.
+
+        This is not thread exclusive: chains are only ever added to the
+        cache or discarded with the whole cache, so a lookup can't see a
+        partially updated state and doesn't need to wait for the lock.
+
+        :param hook_paths:      Tuple of paths to hooks, in inheritance order.
+        :param hook_base_class: The base class of the chain.
+        :returns:               The Hook class if found, None if not
+        """
+        return self._chains.get((hook_paths, hook_base_class), None)
+
+    @thread_exclusive
+    def add_chain(self, hook_paths, hook_base_class, hook_class):
+        """
+        Add the final class of a chain of hooks to the cache if it isn't already present
+
+        :param hook_paths:      Tuple of paths to hooks, in inheritance order.
+        :param hook_base_class: The base class of the chain.
+        :param hook_class:      The Hook class to add
+        :returns:               The Hook class cached for the chain.
+        """
+        return self._chains.setdefault((hook_paths, hook_base_class), hook_class)
+
     @thread_exclusive
     def __len__(self):
         """
@@ -603,7 +637,17 @@ def execute_hook_method(hook_paths, parent, method_name, base_class=None, **kwar
     :returns: Whatever the hook returns.
     """
     hook = create_hook_instance(hook_paths, parent, base_class=base_class)
+    return execute_hook_instance_method(hook, method_name, **kwargs)
+
+
+def execute_hook_instance_method(hook, method_name, **kwargs):
+    """
+    Executes a method of a hook instance.
 
+    :param hook: :class:`Hook` instance.
+    :param method_name: method to execute. If None, the default method will be executed.
+    :returns: Whatever the hook returns.
+    """
     # get the method
     method_name = method_name or Hook.DEFAULT_HOOK_METHOD
     try:
@@ -615,7 +659,12 @@ def execute_hook_method(hook_paths, parent, method_name, base_class=None, **kwar
         )
 
     # execute the method
-    ret_val = hook_method(**kwargs)
+    profiler = Profiler()
+    if profiler.enabled:
+        with profiler.timer("hook.execute", "%s.%s" % (hook.__class__.__name__, method_name)):
+            ret_val = hook_method(**kwargs)
+    else:
+        ret_val = hook_method(**kwargs)
 
     return ret_val
 
@@ -653,7 +702,24 @@ def create_hook_instance(hook_paths, parent, base_class=None):
         hook. This will override the default hook base class, ``Hook``.
     :returns: Instance of the hook.
     """
+    return get_hook_class(hook_paths, base_class)(parent)
+
 
+def get_hook_class(hook_paths, base_class=None):
+    """
+    Returns the class of the last hook of a chain of hooks, loading the
+    hooks of the chain as described in :meth:`create_hook_instance` the
+    first time the chain is requested.
+
+    Once a chain has been loaded, its final class is retrieved from the
+    hooks cache without checking the hook files again until the cache is
+    cleared with :meth:`clear_hooks_cache`.
+
+    :param hook_paths: List of full paths to hooks, in inheritance order.
+    :param base_class: A python class to use as the base class for the
+        hooks. Defaults to ``Hook``.
+    :returns: The class of the last hook in the list.
+    """
     if base_class:
         # ensure the supplied base class is a subclass of Hook
         if not issubclass(base_class, Hook):
@@ -664,6 +730,45 @@ def create_hook_instance(hook_paths, parent, base_class=None):
     else:
         base_class = Hook
 
+    hook_paths = tuple(hook_paths)
+    hook_class = _hooks_cache.find_chain(hook_paths, base_class)
+    if hook_class is None:
+        hook_class = _hooks_cache.add_chain(
+            hook_paths,
+            base_class,
+            _load_hook_chain(hook_paths, base_class)
+        )
+    return hook_class
+
+
+def is_stateless_hook(hook_instance):
+    """
+    Checks if a hook instance holds no state of its own, in which case it can
+    be reused to execute several hook methods.
+
+    A hook is considered stateless if its class doesn't customize its
+    construction and if no attributes were set on the instance besides its
+    parent.
+
+    :param hook_instance: :class:`Hook` instance to check.
+    :returns: True if the hook instance is stateless, False otherwise.
+    """
+    for cls in type(hook_instance).__mro__:
+        if cls is Hook:
+            break
+        if "__init__" in vars(cls):
+            return False
+    return vars(hook_instance).keys() == ["_Hook__parent"]
+
+
+def _load_hook_chain(hook_paths, base_class):
+    """
+    Loads each hook of a chain of hooks, in inheritance order.
+
+    :param hook_paths: List of full paths to hooks, in inheritance order.
+    :param base_class: A python class to use as the base class of the first hook.
+    :returns: The class of the last hook in the list.
+    """
     # keep track of the current base class - this is used when loading hooks to dynamically
     # inherit from the correct base.
     _current_hook_baseclass.value = base_class
@@ -690,11 +795,12 @@ def create_hook_instance(hook_paths, parent, base_class=None):
                 alternate_base_classes.append(Hook)
 
             # try to load the hook class:
-            loaded_hook_class = load_plugin(
-                hook_path,
-                valid_base_class=_current_hook_baseclass.value,
-                alternate_base_classes=alternate_base_classes
-            )
+            with Profiler().timer("hook.load", hook_path):
+                loaded_hook_class = load_plugin(
+                    hook_path,
+                    valid_base_class=_current_hook_baseclass.value,
+                    alternate_base_classes=alternate_base_classes
+                )
 
             # add it to the cache...
             _hooks_cache.add(hook_path, _current_hook_baseclass.value, loaded_hook_class)
@@ -707,8 +813,8 @@ def create_hook_instance(hook_paths, parent, base_class=None):
         _current_hook_baseclass.value = found_hook_class
 
     # all class construction done. _current_hook_baseclass contains the last
-    # class we iterated over. An instance of this is what we want to return
-    return _current_hook_baseclass.value(parent)
+    # class we iterated over.
+    return _current_hook_baseclass.value
 
 
 def get_hook_baseclass():
@@ -230,6 +230,7 @@ import weakref
 import uuid
 from functools import wraps
 from . import constants
+from .profiling import Profiler
 
 
 class LogManager(object):
@@ -495,7 +496,11 @@ class LogManager(object):
 
             [DEBUG sgtk.stopwatch.module] my_shotgun_publish_method: 0.633s
 
+        When profiling is enabled, timings are also recorded by the
+        :class:`~sgtk.Profiler` in the ``stopwatch`` category.
         """
+        profiled_name = "%s.%s" % (func.__module__, func.__name__)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             time_before = time.time()
@@ -503,6 +508,9 @@ class LogManager(object):
                 response = func(*args, **kwargs)
             finally:
                 time_spent = time.time() - time_before
+                profiler = Profiler()
+                if profiler.enabled:
+                    profiler.record("stopwatch", profiled_name, time_before, time_spent)
                 # log to special timing logger
                 timing_logger = logging.getLogger(
                     "%s.%s" % (constants.PROFILING_LOG_CHANNEL, func.__module__)
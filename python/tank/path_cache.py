@@ -16,9 +16,12 @@ all Tank items in the file system are kept.
 
 import collections
 import sqlite3
+import stat
 import sys
 import os
 import itertools
+import threading
+import time
 
 # use api json to cover py 2.5
 # todo - replace with proper external library  
@@ -30,6 +33,8 @@ from . import constants
 from .errors import TankError
 from . import LogManager
 from .util.login import get_current_user
+from .util import filesystem
+from .util.local_file_storage import LocalFileStorageManager
 
 # Shotgun field definitions to store the path cache data
 SHOTGUN_ENTITY = "FilesystemLocation"
@@ -44,6 +49,335 @@ SG_PIPELINE_CONFIG_FIELD = "pipeline_configuration"
 
 log = LogManager.get_logger(__name__)
 
+
+class _LookupCache(object):
+    """
+    A thread-safe, process wide cache of path cache database lookups.
+
+    Entries are shared by all the :class:`PathCache` instances of the process and
+    are keyed by database file, so that repeated lookups, for example when
+    resolving contexts from paths, don't need to query the database, which is
+    typically hosted on NFS storage.
+
+    The cache holds at most :attr:`MAX_ENTRIES` entries, least recently used
+    entries being discarded first. Entries for a database are invalidated
+    whenever this process commits to it, or when a lookup detects that the
+    database was modified by another connection, see
+    :meth:`_ConnectionPool.is_modified`.
+    """
+
+    # maximum number of lookups held by the cache
+    MAX_ENTRIES = 10000
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        # {(database path, generation, lookup key): value}, most recently used last
+        self._entries = collections.OrderedDict()
+        # {database path: generation}, bumped every time the database changes so
+        # that outdated entries are never returned and eventually get discarded.
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, db_path):
+        """
+        Invalidates all the entries of a database. This is called right after
+        the database was modified.
+
+        :param db_path: Path to the database file.
+        """
+        with self._lock:
+            self._generations[db_path] = self._generations.get(db_path, 0) + 1
+
+    def get(self, db_path, key):
+        """
+        Retrieves a cached lookup.
+
+        :param db_path: Path to the database file.
+        :param key: Tuple identifying the lookup.
+        :returns: Tuple of a boolean indicating if the lookup was found and its value.
+        """
+        with self._lock:
+            cache_key = (db_path, self._generations.get(db_path, 0), key)
+            value = self._entries.pop(cache_key, self)
+            if value is self:
+                return False, None
+            # re-insert to flag the entry as the most recently used one.
+            self._entries[cache_key] = value
+            return True, value
+
+    def set(self, db_path, key, value):
+        """
+        Caches a lookup.
+
+        :param db_path: Path to the database file.
+        :param key: Tuple identifying the lookup.
+        :param value: Value to cache.
+        """
+        with self._lock:
+            cache_key = (db_path, self._generations.get(db_path, 0), key)
+            self._entries.pop(cache_key, None)
+            self._entries[cache_key] = value
+            while len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Clears all the cached lookups.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+# process wide cache of path cache lookups
+_lookup_cache = _LookupCache()
+
+
+class _ConnectionPool(object):
+    """
+    A pool of sqlite connections to path cache databases.
+
+    sqlite connections can't be shared between threads, so each thread holds
+    its own connection to each database. Connections are kept open and reused
+    by all the :class:`PathCache` instances created in the thread, which
+    avoids reconnecting to the database, typically hosted on NFS storage, and
+    checking its schema every time a path cache is used.
+
+    The schema of a database is only verified the first time it is connected
+    to by the process. If the database file is deleted or replaced, a new
+    connection is made and the schema verified again.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """
+        Forgets all the connections of the pool, without closing them.
+        """
+        self._pid = os.getpid()
+        # {database path: (connection, file identity, generation)} and
+        # {database path: data version last seen by the connection} for each thread
+        self._local = threading.local()
+        # (database path, file identity) of the databases whose schema was verified
+        self._verified_databases = set()
+        # bumped every time the pool is closed, so that connections
+        # held by other threads are not reused.
+        self._generation = 0
+
+    def acquire(self, db_path, init_connection):
+        """
+        Returns a connection to a database for the current thread.
+
+        :param db_path: Path to the database file.
+        :param init_connection: Function called with a new connection and a boolean
+                                indicating if the schema of the database must be
+                                verified, i.e. the first time the process connects
+                                to the database.
+        :returns: :class:`sqlite3.Connection`
+        """
+        with self._lock:
+            if os.getpid() != self._pid:
+                # we've been forked, connections inherited from the parent
+                # process must not be used.
+                self._reset()
+            generation = self._generation
+
+        connections = self._local.__dict__.setdefault("connections", {})
+        identity = self._get_identity(db_path)
+
+        if db_path in connections:
+            connection, connection_identity, connection_generation = connections.pop(db_path)
+            if identity is not None and identity == connection_identity and generation == connection_generation:
+                connections[db_path] = (connection, connection_identity, connection_generation)
+                return connection
+            # the database file was removed or replaced. The connection is left
+            # to be closed once path caches using it are done with it.
+
+        connection = sqlite3.connect(db_path)
+        with self._lock:
+            verify_schema = (db_path, identity) not in self._verified_databases
+        init_connection(connection, verify_schema)
+
+        # the database file may have only been created by the schema creation.
+        identity = self._get_identity(db_path)
+        with self._lock:
+            self._verified_databases.add((db_path, identity))
+        connections[db_path] = (connection, identity, generation)
+        self._local.__dict__.setdefault("data_versions", {}).pop(db_path, None)
+        return connection
+
+    def is_modified(self, db_path):
+        """
+        Tells if a database was modified by another connection, including
+        connections of other threads and processes, since the last time this
+        was checked by the current thread.
+
+        This relies on ``PRAGMA data_version``, which only needs to read the
+        header of the database. Modifications made with the connection of the
+        current thread are not reported.
+
+        :param db_path: Path to the database file.
+        :returns: True if the database was modified, or if this is the first
+                  time the connection of the current thread is checked.
+        """
+        connections = self._local.__dict__.setdefault("connections", {})
+        data_versions = self._local.__dict__.setdefault("data_versions", {})
+        if db_path not in connections:
+            return True
+
+        connection = connections[db_path][0]
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+        modified = data_versions.get(db_path) != data_version
+        data_versions[db_path] = data_version
+        return modified
+
+    def close(self):
+        """
+        Closes the connections of the current thread, and makes sure connections
+        held by other threads are not reused. The schema of databases will be
+        verified again the next time they are connected to.
+        """
+        with self._lock:
+            self._generation += 1
+            self._verified_databases.clear()
+
+        self.release()
+
+    def release(self):
+        """
+        Closes the connections of the current thread. This should be called
+        by threads connecting to databases before they exit.
+        """
+        connections = self._local.__dict__.setdefault("connections", {})
+        for connection, _, _ in connections.values():
+            connection.close()
+        connections.clear()
+        self._local.__dict__.setdefault("data_versions", {}).clear()
+
+    @staticmethod
+    def _get_identity(db_path):
+        """
+        Returns an identifier for a database file. A file replacing a database
+        which is still opened by a connection will have a different identifier.
+
+        :param db_path: Path to the database file.
+        :returns: Tuple or None if the file doesn't exist.
+        """
+        try:
+            stat = os.stat(db_path)
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+
+# per thread pool of path cache database connections
+_connection_pool = _ConnectionPool()
+
+
+class _BackgroundSynchronizer(object):
+    """
+    Runs incremental synchronizations of path caches in background threads.
+
+    This is used by path caches kept on the local disk of each machine (see
+    :meth:`PipelineConfiguration.get_path_cache_local_mirror_enabled`) to pick up
+    the folders created with Shotgun without blocking the process. At most one
+    synchronization runs at a time for a database. Synchronizations requested
+    while one is running cause it to run again once done, so that the latest
+    events are always replayed.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self._lock = threading.Lock()
+        # {database path: thread synchronizing it}
+        self._threads = {}
+        # databases which need to be synchronized again
+        self._pending = set()
+
+    def request(self, db_path, tk):
+        """
+        Requests a database to be synchronized in the background.
+
+        :param db_path: Path to the database file.
+        :param tk: Toolkit API instance the database belongs to.
+        """
+        with self._lock:
+            if db_path in self._threads:
+                self._pending.add(db_path)
+                return
+            thread = threading.Thread(
+                target=self._run,
+                args=(db_path, tk),
+                name="PathCacheSynchronizer"
+            )
+            thread.daemon = True
+            self._threads[db_path] = thread
+        thread.start()
+
+    def wait(self, timeout=None):
+        """
+        Waits for the running synchronizations to complete.
+
+        :param timeout: Maximum number of seconds to wait for each synchronization.
+                        None waits until they are complete.
+        """
+        with self._lock:
+            threads = list(self._threads.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _run(self, db_path, tk):
+        """
+        Synchronizes a database until no more synchronizations are requested.
+
+        :param db_path: Path to the database file.
+        :param tk: Toolkit API instance the database belongs to.
+        """
+        try:
+            while True:
+                with self._lock:
+                    self._pending.discard(db_path)
+                try:
+                    path_cache = PathCache(tk)
+                    try:
+                        path_cache._synchronize(full_sync=False, allow_full_sync=False)
+                    finally:
+                        path_cache.close()
+                except Exception as e:
+                    log.warning("Could not synchronize the path cache in the background: %s" % e)
+                    log.exception("Background path cache synchronization failed")
+                with self._lock:
+                    if db_path not in self._pending:
+                        del self._threads[db_path]
+                        return
+        finally:
+            _connection_pool.release()
+
+
+# synchronizes local path cache mirrors in the background
+_background_synchronizer = _BackgroundSynchronizer()
+
+
+def close_pooled_connections():
+    """
+    Closes the path cache database connections kept open by the current thread.
+
+    Connections are pooled and reused by all the :class:`PathCache` instances. This
+    can be called when Toolkit is torn down, e.g. when an engine is destroyed, to
+    release the database files.
+    """
+    _connection_pool.close()
+
+
 class PathCache(object):
     """
     A global cache which holds the mapping between a shotgun entity and a location on disk.
@@ -65,6 +399,42 @@ class PathCache(object):
     # to do so.
     SHOTGUN_ENTITY_QUERY_BATCH_SIZE = 500
 
+    # Fields retrieved for FilesystemLocation entities.
+    FILESYSTEM_LOCATION_FIELDS = [
+        "id",
+        SG_METADATA_FIELD,
+        SG_IS_PRIMARY_FIELD,
+        SG_ENTITY_ID_FIELD,
+        SG_PATH_FIELD,
+        SG_ENTITY_TYPE_FIELD,
+        SG_ENTITY_NAME_FIELD
+    ]
+
+    # Indices dropped while a full sync imports FilesystemLocation entities
+    # and rebuilt once all the entries have been inserted.
+    BULK_IMPORT_INDICES = [
+        ("path_cache_entity", "CREATE INDEX path_cache_entity ON path_cache(entity_type, entity_id)"),
+        ("path_cache_path", "CREATE INDEX path_cache_path ON path_cache(root, path, primary_entity)"),
+        ("path_cache_all", "CREATE UNIQUE INDEX path_cache_all "
+                           "ON path_cache(entity_type, entity_id, root, path, primary_entity)"),
+        ("shotgun_status_id", "CREATE UNIQUE INDEX shotgun_status_id ON shotgun_status(path_cache_id)"),
+        ("shotgun_status_shotgun_id", "CREATE INDEX shotgun_status_shotgun_id ON shotgun_status(shotgun_id)"),
+    ]
+
+    # Number of FilesystemLocation entities imported between progress reports
+    # during a full sync.
+    BULK_IMPORT_PROGRESS_INTERVAL = 10000
+
+    # Number of FilesystemLocation entities retrieved from Shotgun per page during a
+    # full sync. Each page is written to the path cache before the next one is requested.
+    FULL_SYNC_PAGE_SIZE = 5000
+
+    # If True, a full sync builds a new database next to the path cache file and
+    # then atomically replaces the file with it, so that other processes can keep
+    # reading the previous database while it is being rebuilt. Replacing an opened
+    # file isn't possible on Windows, where the database is always rebuilt in place.
+    FULL_SYNC_SWAP_DATABASE = False
+
     def __init__(self, tk):
         """
         Constructor.
@@ -74,6 +444,7 @@ class PathCache(object):
         self._connection = None
         self._tk = tk
         self._sync_with_sg = tk.pipeline_configuration.get_shotgun_path_cache_enabled()
+        self._local_mirror = tk.pipeline_configuration.get_path_cache_local_mirror_enabled()
 
         if tk.pipeline_configuration.has_associated_data_roots():
             self._path_cache_disabled = False
@@ -92,9 +463,20 @@ class PathCache(object):
         # will ensure that there is a valid folder and file on
         # disk, created with all the right permissions etc.
         path_cache_file = self._get_path_cache_location()
-        
-        self._connection = sqlite3.connect(path_cache_file)
-        
+        self._path_cache_file = path_cache_file
+
+        # connections are pooled and reused by all path cache instances
+        # of the current thread.
+        self._connection = _connection_pool.acquire(path_cache_file, self._init_connection)
+
+    def _init_connection(self, connection, verify_schema):
+        """
+        Sets up a new connection to the database.
+
+        :param connection: :class:`sqlite3.Connection` to set up.
+        :param verify_schema: If True, the tables and indices of the database are
+                              created or upgraded if needed.
+        """
         # this is to handle unicode properly - make sure that sqlite returns 
         # str objects for TEXT fields rather than unicode. Note that any unicode
         # objects that are passed into the database will be automatically
@@ -102,8 +484,12 @@ class PathCache(object):
         # representation will work for any language, as long as data is either input
         # as UTF-8 (byte string) or unicode. And in the latter case, the returned data
         # will always be unicode.
-        self._connection.text_factory = str
-        
+        connection.text_factory = str
+
+        if not verify_schema:
+            return
+
+        self._connection = connection
         c = self._connection.cursor()
         try:
         
@@ -137,7 +523,7 @@ class PathCache(object):
 
                     CREATE INDEX shotgun_status_shotgun_id ON shotgun_status(shotgun_id);
                     """)
-                self._connection.commit()
+                self._commit()
                 
             else:
                 
@@ -145,13 +531,13 @@ class PathCache(object):
                 if "event_log_sync" not in table_names:
                     # this is a pre-0.15 setup where the path cache does not have event log sync
                     c.executescript("CREATE TABLE event_log_sync (last_id integer);")
-                    self._connection.commit()
+                    self._commit()
                 
                 if "shotgun_status" not in table_names:
                     # this is a pre-0.15 setup where the path cache does not have the shotgun_status table
                     c.executescript("""CREATE TABLE shotgun_status (path_cache_id integer, shotgun_id integer);
                                        CREATE UNIQUE INDEX shotgun_status_id ON shotgun_status(path_cache_id);""")
-                    self._connection.commit()
+                    self._commit()
 
                 
                 # now ensure that some key fields that have been added during the dev cycle are there
@@ -171,7 +557,7 @@ class PathCache(object):
                         CREATE UNIQUE INDEX IF NOT EXISTS path_cache_all ON path_cache(entity_type, entity_id, root, path, primary_entity);
                         """)
         
-                    self._connection.commit()
+                    self._commit()
         
         finally:
             c.close()
@@ -182,7 +568,24 @@ class PathCache(object):
 
         :returns: The path to the path cache file
         """
-        if self._tk.pipeline_configuration.get_shotgun_path_cache_enabled():
+        if self._local_mirror:
+
+            # private copy of the path cache on the local disk of this machine,
+            # ignoring the cache hook which may point at shared storage.
+            cache_root = LocalFileStorageManager.get_configuration_root(
+                self._tk.shotgun_url,
+                self._tk.pipeline_configuration.get_project_id(),
+                self._tk.pipeline_configuration.get_plugin_id(),
+                self._tk.pipeline_configuration.get_shotgun_id(),
+                LocalFileStorageManager.CACHE
+            )
+            path = os.path.join(cache_root, "path_cache.db")
+
+            if not os.path.exists(path):
+                filesystem.ensure_folder_exists(cache_root)
+                filesystem.touch_file(path)
+
+        elif self._tk.pipeline_configuration.get_shotgun_path_cache_enabled():
 
             # 0.15+ path cache setup - call out to a core hook to determine
             # where the path cache should be located.
@@ -268,6 +671,23 @@ class PathCache(object):
 
         return root_name, relative_path
 
+    def _get_db_key(self, path):
+        """
+        Determines the root name and db path a path is stored under in the
+        database. Lookups of paths are keyed by these, both in the database and
+        in the cache of lookups.
+
+        :param path: a path on disk
+        :returns: root_name, db_path where db_path is a utf-8 encoded str, the way
+                  the connection returns paths.
+        :raises: TankError if the path doesn't belong to any of the storages.
+        """
+        root_name, relative_path = self._separate_root(path)
+        db_path = self._path_to_dbpath(relative_path)
+        if isinstance(db_path, unicode):
+            db_path = db_path.encode("utf-8")
+        return root_name, db_path
+
 
     def _dbpath_to_path(self, root_path, dbpath):
         """
@@ -288,13 +708,33 @@ class PathCache(object):
         full_path = os.path.join(root_path, path_sep)
         return os.path.normpath(full_path)
 
+    def _validate_lookup_cache(self):
+        """
+        Invalidates the lookups cached for the database if it was modified
+        by another connection, e.g. by another process, since this thread
+        last looked up data from it.
+        """
+        if _connection_pool.is_modified(self._path_cache_file):
+            _lookup_cache.invalidate(self._path_cache_file)
+
+    def _commit(self):
+        """
+        Commits the current transaction and invalidates the
+        lookups cached for the database.
+        """
+        self._connection.commit()
+        _lookup_cache.invalidate(self._path_cache_file)
+
     def close(self):
         """
-        Close the database connection.
+        Releases the database connection.
+
+        The connection is returned to the pool of connections of the current
+        thread. It is shared with the other path caches of the thread, so any
+        transaction is left to the path cache which started it to commit or
+        roll back.
         """
-        if self._connection is not None:
-            self._connection.close()
-            self._connection = None
+        self._connection = None
                 
     ############################################################################################
     # shotgun synchronization (SG data pushed into path cache database)
@@ -315,6 +755,19 @@ class PathCache(object):
                     - metadata 
                     - path
         """
+        return self._synchronize(full_sync, allow_full_sync=True)
+
+    def _synchronize(self, full_sync, allow_full_sync):
+        """
+        Ensure the local path cache is in sync with Shotgun.
+
+        :param full_sync: Boolean to indicate that a full sync should be carried out.
+        :param allow_full_sync: If False, the path cache is only synchronized if this
+                                can be done incrementally. This is the case when
+                                synchronizing in the background, where the busy
+                                overlay window of a full sync can't be shown.
+        :returns: See :meth:`synchronize`.
+        """
 
         if self._path_cache_disabled:
             log.debug("This project does not have any associated folders.")
@@ -330,7 +783,7 @@ class PathCache(object):
 
             # check if we should do a full sync
             if full_sync:
-                return self._do_full_sync(c)
+                return self._fall_back_on_full_sync(c, allow_full_sync)
             
             # first get the last synchronized event log event.        
             res = c.execute("SELECT max(last_id) FROM event_log_sync")
@@ -342,7 +795,7 @@ class PathCache(object):
             # expect back something like [(249660,)] for a running cache and [(None,)] for a clear
             if len(data) != 1 or data[0] is None:
                 # we should do a full sync
-                return self._do_full_sync(c)
+                return self._fall_back_on_full_sync(c, allow_full_sync)
     
             # we have an event log id - so check if there are any more recent events
             event_log_id = data[0]
@@ -390,7 +843,7 @@ class PathCache(object):
             if len(response) == 0:
                 # nothing in event log. Probably a truncated setup.
                 log.debug("No sync information in the event log. Falling back on a full sync.")
-                return self._do_full_sync(c)
+                return self._fall_back_on_full_sync(c, allow_full_sync)
                 
             elif response[0]["id"] != event_log_id:
                 # there is either no event log data at all or a gap
@@ -402,7 +855,7 @@ class PathCache(object):
                     "like the event log has been truncated, so falling back "
                     "on a full sync." % (event_log_id, response[0]["id"])
                 )
-                return self._do_full_sync(c)
+                return self._fall_back_on_full_sync(c, allow_full_sync)
             
             elif len(response) == 1 and response[0]["id"] == event_log_id:
                 # nothing has changed since the last sync
@@ -418,6 +871,12 @@ class PathCache(object):
                 # should never be here
                 raise Exception("Unknown error - please contact support.")
 
+        except:
+            # make sure we roll back any sqlite path cache transaction we
+            # started, since the connection is shared with other path caches.
+            self._connection.rollback()
+            raise
+
         finally:       
             c.close()
 
@@ -544,6 +1003,20 @@ class PathCache(object):
                 "id": self._tk.pipeline_configuration.get_project_id()
             }
 
+    def _fall_back_on_full_sync(self, cursor, allow_full_sync):
+        """
+        Does a full sync if allowed, otherwise leaves it to the next
+        synchronization.
+
+        :param cursor: Sqlite database cursor
+        :param allow_full_sync: Boolean to indicate if a full sync can be carried out.
+        :returns: See :meth:`_do_full_sync`.
+        """
+        if not allow_full_sync:
+            log.debug("A full sync is required. Deferring it to the next synchronization.")
+            return []
+        return self._do_full_sync(cursor)
+
     def _do_full_sync(self, cursor):
         """
         Ensure the local path cache is in sync with Shotgun.
@@ -724,7 +1197,7 @@ class PathCache(object):
 
         self._update_last_event_log_synced(cursor, max_event_log_id)
 
-        self._connection.commit()
+        self._commit()
 
         # run the actual sync - and at the end, inser the event_log_sync data marker
         # into the database to show where to start syncing from next time.
@@ -794,15 +1267,7 @@ class PathCache(object):
                 self._tk.shotgun.find(
                     SHOTGUN_ENTITY,
                     batched_filter,
-                    [
-                        "id",
-                        SG_METADATA_FIELD,
-                        SG_IS_PRIMARY_FIELD,
-                        SG_ENTITY_ID_FIELD,
-                        SG_PATH_FIELD,
-                        SG_ENTITY_TYPE_FIELD,
-                        SG_ENTITY_NAME_FIELD
-                    ],
+                    self.FILESYSTEM_LOCATION_FIELDS,
                     [{"field_name": "id", "direction": "asc"}]
                 )
             )
@@ -811,6 +1276,45 @@ class PathCache(object):
 
         return sg_data
 
+    def _iter_filesystem_location_pages(self):
+        """
+        Retrieves all the filesystem location entities of the project from Shotgun,
+        one page at a time.
+
+        Pages are requested lazily, as the generator is consumed, so that only one page
+        needs to be held in memory at any given time. Entities are paged by id rather than
+        by page number so that entities created while the pages are being retrieved can't
+        shift the following pages.
+
+        :returns: Generator of lists of FilesystemLocation entity dictionaries, see
+                  :meth:`_get_filesystem_location_entities`.
+        """
+        project_entity = self._get_project_link()
+        log.debug("Paging through the project's FilesystemLocation entries. "
+                  "Project id: %s" % project_entity["id"])
+
+        last_id = 0
+        num_records = 0
+        while True:
+            page = self._tk.shotgun.find(
+                SHOTGUN_ENTITY,
+                [["project", "is", project_entity], ["id", "greater_than", last_id]],
+                self.FILESYSTEM_LOCATION_FIELDS,
+                [{"field_name": "id", "direction": "asc"}],
+                limit=self.FULL_SYNC_PAGE_SIZE
+            )
+            if not page:
+                break
+
+            num_records += len(page)
+            last_id = page[-1]["id"]
+            yield page
+
+            if len(page) < self.FULL_SYNC_PAGE_SIZE:
+                break
+
+        log.debug("...Retrieved %s records.", num_records)
+
     def _replay_folder_entities(self, cursor, max_event_log_id):
         """
         Downloads all the filesystem location entities from Shotgun and repopulates the
@@ -832,28 +1336,206 @@ class PathCache(object):
         """
         log.debug("Fetching already registered folders from Shotgun...")
 
-        sg_data = self._get_filesystem_location_entities(folder_ids=None)
+        sg_pages = self._iter_filesystem_location_pages()
 
-        # complete sync - clear our tables first
-        log.debug("Full sync - clearing local sqlite path cache tables...")
-        cursor.execute("DELETE FROM event_log_sync")
-        cursor.execute("DELETE FROM shotgun_status")
-        cursor.execute("DELETE FROM path_cache")
+        if self.FULL_SYNC_SWAP_DATABASE and sys.platform != "win32":
+            return self._replay_into_new_database(sg_pages, max_event_log_id)
 
-        return_data = []
+        return_data = self._bulk_import_filesystem_location_entries(
+            cursor.connection, sg_pages, max_event_log_id
+        )
+        _lookup_cache.invalidate(self._path_cache_file)
+        return return_data
 
-        for x in sg_data:
-            imported_data = self._import_filesystem_location_entry(cursor, x)
-            if imported_data:
-                return_data.append(imported_data)
+    def _replay_into_new_database(self, sg_pages, max_event_log_id):
+        """
+        Imports filesystem location entities into a new database and
+        replaces the path cache file with it.
 
-        # lastly, save the id of this event log entry for purpose of future syncing
-        # note - we don't maintain a list of event log entries but just a single
-        # value in the db, so start by clearing the table.
+        :param sg_pages: Iterable of lists of FilesystemLocation entity dictionaries,
+                         see :meth:`_iter_filesystem_location_pages`.
+        :param max_event_log_id: max event log marker to write to the database.
+        :returns: See :meth:`_replay_folder_entities`.
+        """
+        new_path = "%s.%d.tmp" % (self._path_cache_file, os.getpid())
+        if os.path.exists(new_path):
+            os.remove(new_path)
 
-        self._update_last_event_log_synced(cursor, max_event_log_id)
+        log.debug("Full sync - building a new path cache in '%s'..." % new_path)
+        connection = sqlite3.connect(new_path)
+        try:
+            # _init_connection uses the connection of the path cache to create tables.
+            current_connection = self._connection
+            try:
+                self._init_connection(connection, verify_schema=True)
+            finally:
+                self._connection = current_connection
+
+            return_data = self._bulk_import_filesystem_location_entries(
+                connection, sg_pages, max_event_log_id
+            )
+        except:
+            connection.close()
+            os.remove(new_path)
+            raise
+        connection.close()
 
-        self._connection.commit()
+        # the new database should be accessible the same way the previous one was.
+        os.chmod(new_path, stat.S_IMODE(os.stat(self._path_cache_file).st_mode))
+        os.rename(new_path, self._path_cache_file)
+        log.debug("Replaced '%s' with the new path cache." % self._path_cache_file)
+
+        # the pool detects the file was replaced and connects to the new one.
+        self._connection = _connection_pool.acquire(self._path_cache_file, self._init_connection)
+        _lookup_cache.invalidate(self._path_cache_file)
+
+        return return_data
+
+    def _bulk_import_filesystem_location_entries(self, connection, sg_pages, max_event_log_id):
+        """
+        Replaces the content of a path cache database with filesystem location entities.
+
+        Entities are validated and deduplicated in memory the same way
+        :meth:`_import_filesystem_location_entry` does against the database. Each
+        page of entities is inserted as soon as it is retrieved, so that only a single
+        page of entities is held in memory. All the pages are inserted in a single
+        transaction, with the indices of the tables dropped during the insertion and
+        rebuilt afterwards.
+
+        :param connection: :class:`sqlite3.Connection` to the database.
+        :param sg_pages: Iterable of lists of FilesystemLocation entity dictionaries,
+                         see :meth:`_iter_filesystem_location_pages`.
+        :param max_event_log_id: max event log marker to write to the database.
+        :returns: See :meth:`_replay_folder_entities`.
+        :raises TankError: If a path is associated with more than one primary entity.
+        """
+        return_data = []
+
+        # {(root name, db path): entity dict} for primary entries
+        primary_entities = {}
+        # (entity type, entity id, root name, db path) of all the entries
+        imported_entries = set()
+
+        num_processed = 0
+        # time spent waiting on Shotgun for pages and time spent importing them.
+        fetch_time = 0.0
+        import_time = 0.0
+        start_time = time.time()
+
+        # the transaction is managed explicitly, since the sqlite module would
+        # otherwise commit before dropping and creating indices.
+        isolation_level = connection.isolation_level
+        connection.isolation_level = None
+        cursor = connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # complete sync - clear our tables first
+                cursor.execute("DELETE FROM event_log_sync")
+                cursor.execute("DELETE FROM shotgun_status")
+                cursor.execute("DELETE FROM path_cache")
+
+                for index_name, _ in self.BULK_IMPORT_INDICES:
+                    cursor.execute("DROP INDEX IF EXISTS %s" % index_name)
+
+                sg_pages = iter(sg_pages)
+                while True:
+                    page_start_time = time.time()
+                    sg_data = next(sg_pages, None)
+                    fetch_time += time.time() - page_start_time
+                    if sg_data is None:
+                        break
+
+                    page_start_time = time.time()
+                    path_cache_rows = []
+                    shotgun_status_rows = []
+
+                    for fsl_entity in sg_data:
+
+                        num_processed += 1
+                        if num_processed % self.BULK_IMPORT_PROGRESS_INTERVAL == 0:
+                            log.debug("Processed %d folders..." % num_processed)
+                            show_global_busy(
+                                "Hang on, Toolkit is preparing folders...",
+                                "Processed %d folders from Shotgun..." % num_processed
+                            )
+
+                        mapping = self._get_filesystem_location_mapping(fsl_entity)
+                        if mapping is None:
+                            continue
+                        (entity, is_primary, local_os_path, root_name, relative_path) = mapping
+                        db_path = self._path_to_dbpath(relative_path)
+
+                        entry = (entity["type"], entity["id"], root_name, db_path)
+
+                        if is_primary:
+                            # the primary entity must be unique for a path, see _add_db_mapping
+                            curr_entity = primary_entities.get((root_name, db_path))
+                            if curr_entity is not None:
+                                if curr_entity["type"] != entity["type"] or curr_entity["id"] != entity["id"]:
+                                    raise TankError(
+                                        "Database concurrency problems: The path '%s' is "
+                                        "already associated with Shotgun entity %s. Please re-run "
+                                        "folder creation to try again." % (local_os_path, str(curr_entity))
+                                    )
+                                log.debug("Found existing record for '%s', %s. Skipping." % (local_os_path, entity))
+                                continue
+                            primary_entities[(root_name, db_path)] = entity
+
+                        elif entry in imported_entries:
+                            log.debug("Found existing record for '%s', %s. Skipping." % (local_os_path, entity))
+                            continue
+
+                        imported_entries.add(entry)
+
+                        # rows ids are allocated here so that the shotgun status
+                        # rows can be inserted alongside the path cache rows.
+                        row_id = len(return_data) + 1
+                        path_cache_rows.append(
+                            (row_id, entity["type"], entity["id"], entity["name"], root_name, db_path, is_primary)
+                        )
+                        shotgun_status_rows.append((row_id, fsl_entity["id"]))
+                        return_data.append({
+                            "entity": entity,
+                            "path": local_os_path,
+                            "metadata": SG_METADATA_FIELD
+                        })
+
+                    cursor.executemany(
+                        "INSERT INTO path_cache(rowid, entity_type, entity_id, entity_name, "
+                        "root, path, primary_entity) VALUES(?, ?, ?, ?, ?, ?, ?)",
+                        path_cache_rows
+                    )
+                    cursor.executemany(
+                        "INSERT INTO shotgun_status(path_cache_id, shotgun_id) VALUES(?, ?)",
+                        shotgun_status_rows
+                    )
+                    import_time += time.time() - page_start_time
+
+                log.debug("Full sync - inserted %d entries in the path cache, rebuilding indices..." % len(return_data))
+
+                for _, index_statement in self.BULK_IMPORT_INDICES:
+                    cursor.execute(index_statement)
+
+                # lastly, save the id of this event log entry for purpose of future syncing
+                self._update_last_event_log_synced(cursor, max_event_log_id)
+
+            except:
+                cursor.execute("ROLLBACK")
+                raise
+
+            cursor.execute("COMMIT")
+
+        finally:
+            cursor.close()
+            connection.isolation_level = isolation_level
+
+        log.debug(
+            "Full sync - imported %d folders in %.2fs: %.2fs fetching pages from Shotgun, "
+            "%.2fs inserting them in the path cache." % (
+                num_processed, time.time() - start_time, fetch_time, import_time
+            )
+        )
 
         return return_data
 
@@ -885,6 +1567,45 @@ class PathCache(object):
             - linked_entity_type
             - code
         """
+        mapping = self._get_filesystem_location_mapping(fsl_entity)
+        if mapping is None:
+            return None
+        (entity, is_primary, local_os_path, _, _) = mapping
+
+        # all validation checks seem ok - go ahead and make the changes.
+        new_rowid = self._add_db_mapping(cursor, local_os_path, entity, is_primary)
+        if new_rowid:
+            # something was inserted into the db!
+            # because this record came from shotgun, insert a record in the
+            # shotgun_status table to indicate that this record exists in sg
+            cursor.execute("INSERT INTO shotgun_status(path_cache_id, shotgun_id) "
+                           "VALUES(?, ?)", (new_rowid, fsl_entity["id"]))
+
+            # and add this entry to our list of new things that we will return later on.
+            return {
+                "entity": entity,
+                "path": local_os_path,
+                "metadata": SG_METADATA_FIELD
+            }
+
+        else:
+            # Note: edge case - for some reason there was already an entry in the path cache
+            # representing this. This could be because of duplicate entries and is
+            # not necessarily an anomaly. It could also happen because a previos sync failed
+            # at some point half way through.
+            log.debug("Found existing record for '%s', %s. Skipping." % (local_os_path, entity))
+            return None
+
+    def _get_filesystem_location_mapping(self, fsl_entity):
+        """
+        Validates a filesystem location and extracts the path cache entry it represents.
+
+        :param dict fsl_entity: Filesystem location entity dictionary, see
+                                :meth:`_import_filesystem_location_entry`.
+        :returns: Tuple with the entity dictionary, the primary flag, the local path,
+                  the root name and the path relative to the root, or None if the
+                  entry can't be imported.
+        """
         # get entity data from our entry
         entity = {"id": fsl_entity[SG_ENTITY_ID_FIELD],
                   "name": fsl_entity[SG_ENTITY_NAME_FIELD],
@@ -957,29 +1678,8 @@ class PathCache(object):
             log.debug("Could not resolve storages - skipping: %s" % e)
             return None
 
-        # all validation checks seem ok - go ahead and make the changes.
-        new_rowid = self._add_db_mapping(cursor, local_os_path, entity, is_primary)
-        if new_rowid:
-            # something was inserted into the db!
-            # because this record came from shotgun, insert a record in the
-            # shotgun_status table to indicate that this record exists in sg
-            cursor.execute("INSERT INTO shotgun_status(path_cache_id, shotgun_id) "
-                           "VALUES(?, ?)", (new_rowid, fsl_entity["id"]))
+        return (entity, is_primary, local_os_path, root_name, relative_path)
 
-            # and add this entry to our list of new things that we will return later on.
-            return {
-                "entity": entity,
-                "path": local_os_path,
-                "metadata": SG_METADATA_FIELD
-            }
-
-        else:
-            # Note: edge case - for some reason there was already an entry in the path cache
-            # representing this. This could be because of duplicate entries and is
-            # not necessarily an anomaly. It could also happen because a previos sync failed
-            # at some point half way through.
-            log.debug("Found existing record for '%s', %s. Skipping." % (local_os_path, entity))
-            return None
 
     def _gen_param_string(self, items):
         """
@@ -1211,7 +1911,11 @@ class PathCache(object):
 
                 # now push to shotgun
                 (event_log_id, sg_id_lookup) = self._upload_cache_data_to_shotgun(data_for_sg, desc)
-                self._update_last_event_log_synced(c, event_log_id)
+                # a local mirror keeps its marker so that the background sync
+                # replays the events created by other machines since the last
+                # sync, up to and including this one.
+                if not self._local_mirror:
+                    self._update_last_event_log_synced(c, event_log_id)
                 # and indicate in the path cache that all these records have been pushed
                 for (pc_row_id, sg_id) in sg_id_lookup.items():
                     c.execute("INSERT INTO shotgun_status(path_cache_id, shotgun_id) "
@@ -1226,7 +1930,10 @@ class PathCache(object):
         
         else:
             # Shotgun insert complete! Now we can commit path cache transaction
-            self._connection.commit()
+            self._commit()
+
+            if self._local_mirror and self._sync_with_sg and len(data_for_sg) > 0:
+                _background_synchronizer.request(self._path_cache_file, self._tk)
         
         finally:
             c.close()
@@ -1467,33 +2174,42 @@ class PathCache(object):
             return []
         
         paths = []
-        
-        # use built in cursor unless specifically provided - means this
-        # is part of a larger transaction
-        c = cursor or self._connection.cursor()
-        
-        try:
-            if primary_only:
-                res = c.execute("SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ? and primary_entity = 1", (entity_type, entity_id))
-            else:
-                res = c.execute("SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ?", (entity_type, entity_id))
-    
-            for row in res:
-                root_name = row[0]
-                relative_path = row[1]
-                
-                root_path = self._roots.get(root_name)
-                if not root_path:
-                    # The root name doesn't match a recognized name, so skip this entry
-                    continue
-                
-                # assemble path
-                path_str = self._dbpath_to_path(root_path, relative_path)
-                paths.append(path_str)
-        finally:        
+
+        # lookups which are part of a larger transaction are never cached
+        cache_key = ("paths", entity_type, entity_id, bool(primary_only))
+        found, rows = False, None
+        if cursor is None:
+            self._validate_lookup_cache()
+            found, rows = _lookup_cache.get(self._path_cache_file, cache_key)
+
+        if not found:
+            # use built in cursor unless specifically provided - means this
+            # is part of a larger transaction
+            c = cursor or self._connection.cursor()
+
+            try:
+                if primary_only:
+                    res = c.execute("SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ? and primary_entity = 1", (entity_type, entity_id))
+                else:
+                    res = c.execute("SELECT root, path FROM path_cache WHERE entity_type = ? AND entity_id = ?", (entity_type, entity_id))
+                rows = [(row[0], row[1]) for row in res]
+            finally:
+                if cursor is None:
+                    c.close()
+
             if cursor is None:
-                c.close()
-        
+                _lookup_cache.set(self._path_cache_file, cache_key, rows)
+
+        for root_name, relative_path in rows:
+            root_path = self._roots.get(root_name)
+            if not root_path:
+                # The root name doesn't match a recognized name, so skip this entry
+                continue
+
+            # assemble path
+            path_str = self._dbpath_to_path(root_path, relative_path)
+            paths.append(path_str)
+
         return paths
 
     def get_entity(self, path, cursor=None):
@@ -1520,24 +2236,34 @@ class PathCache(object):
             return None
         
         try:
-            root_path, relative_path = self._separate_root(path)
+            root_path, db_path = self._get_db_key(path)
         except TankError:
             # fail gracefully if path is not a valid path
             # eg. doesn't belong to the project
             return None
 
-        # use built in cursor unless specifically provided - means this
-        # is part of a larger transaction
-        c = cursor or self._connection.cursor()        
+        # lookups which are part of a larger transaction are never cached
+        cache_key = ("entity", root_path, db_path)
+        found, data = False, None
+        if cursor is None:
+            self._validate_lookup_cache()
+            found, data = _lookup_cache.get(self._path_cache_file, cache_key)
+
+        if not found:
+            # use built in cursor unless specifically provided - means this
+            # is part of a larger transaction
+            c = cursor or self._connection.cursor()
+
+            try:
+                res = c.execute("SELECT entity_type, entity_id, entity_name FROM path_cache WHERE path = ? AND root = ? and primary_entity = 1", (db_path, root_path))
+                data = list(res)
+            finally:
+                if cursor is None:
+                    c.close()
 
-        try:
-            db_path = self._path_to_dbpath(relative_path)
-            res = c.execute("SELECT entity_type, entity_id, entity_name FROM path_cache WHERE path = ? AND root = ? and primary_entity = 1", (db_path, root_path))
-            data = list(res)
-        finally:
             if cursor is None:
-                c.close()
-        
+                _lookup_cache.set(self._path_cache_file, cache_key, data)
+
         if len(data) > 1:
             # never supposed to happen!
             raise TankError("More than one entry in path database for %s!" % path)
@@ -1563,19 +2289,24 @@ class PathCache(object):
             return []
         
         try:
-            root_path, relative_path = self._separate_root(path)
+            root_path, db_path = self._get_db_key(path)
         except TankError:
             # fail gracefully if path is not a valid path
             # eg. doesn't belong to the project
             return []
 
-        c = self._connection.cursor()
-        try:
-            db_path = self._path_to_dbpath(relative_path)
-            res = c.execute("SELECT entity_type, entity_id, entity_name FROM path_cache WHERE path = ? AND root = ? and primary_entity = 0", (db_path, root_path))
-            data = list(res)
-        finally:
-            c.close()
+        cache_key = ("secondary_entities", root_path, db_path)
+        self._validate_lookup_cache()
+        found, data = _lookup_cache.get(self._path_cache_file, cache_key)
+
+        if not found:
+            c = self._connection.cursor()
+            try:
+                res = c.execute("SELECT entity_type, entity_id, entity_name FROM path_cache WHERE path = ? AND root = ? and primary_entity = 0", (db_path, root_path))
+                data = list(res)
+            finally:
+                c.close()
+            _lookup_cache.set(self._path_cache_file, cache_key, data)
 
         matches = []
         for d in data:        
@@ -1587,6 +2318,123 @@ class PathCache(object):
         return matches
     
 
+    def get_entities_for_ancestors(self, path):
+        """
+        Returns the primary and secondary entities for a path and all its parent
+        paths, up to and including the storage root the path belongs to.
+
+        This is equivalent to calling :meth:`get_entity` and :meth:`get_secondary_entities`
+        for the path and each of its parents, but all the lookups are carried out at once,
+        which means a deep path only costs a single database query.
+
+        :param path: a path on disk
+        :returns: list of (path, entity, secondary entities) tuples, starting with the
+                  given path and walking up the hierarchy. entity is a Shotgun entity dict,
+                  e.g. {"type": "Shot", "name": "xxx", "id": 123} or None if not found, and
+                  secondary entities is a list of such dicts.
+        """
+        # gather all roots as lower case
+        root_paths = [x.lower() for x in self._roots.values()] if not self._path_cache_disabled else []
+
+        # first compute all the paths we need to look up
+        ancestors = []
+        curr_path = path
+        while True:
+            ancestors.append(curr_path)
+
+            if curr_path.lower() in root_paths:
+                # we have reached a root!
+                break
+
+            # and continue with parent path
+            parent_path = os.path.abspath(os.path.join(curr_path, ".."))
+            if curr_path == parent_path:
+                # We're at the disk root, probably a degenerate path
+                break
+            curr_path = parent_path
+
+        if self._path_cache_disabled:
+            # no entries because we don't have a path cache
+            return [(ancestor, None, []) for ancestor in ancestors]
+
+        self._validate_lookup_cache()
+
+        # {(root name, db path): [rows]} for all the entries found for the paths.
+        rows_by_db_path = {}
+        # db paths which aren't cached, keyed by root name
+        missing_db_paths = {}
+        db_keys = []
+        for ancestor in ancestors:
+            try:
+                # the rows returned by the database are matched back to these keys.
+                db_key = self._get_db_key(ancestor)
+            except TankError:
+                # fail gracefully if path is not a valid path
+                # eg. doesn't belong to the project
+                db_keys.append(None)
+                continue
+
+            root_name = db_key[0]
+            db_keys.append(db_key)
+
+            found_entity, entity_rows = _lookup_cache.get(self._path_cache_file, ("entity",) + db_key)
+            found_secondary, secondary_rows = _lookup_cache.get(
+                self._path_cache_file, ("secondary_entities",) + db_key
+            )
+            if found_entity and found_secondary:
+                rows_by_db_path[db_key] = (entity_rows, secondary_rows)
+            else:
+                missing_db_paths.setdefault(root_name, []).append(db_key[1])
+
+        if missing_db_paths:
+            c = self._connection.cursor()
+            try:
+                for root_name, db_paths in missing_db_paths.iteritems():
+                    for db_path in db_paths:
+                        rows_by_db_path[(root_name, db_path)] = ([], [])
+
+                    # split sql into batches - sqlite has a max number of terms for its in statement
+                    for i in range(0, len(db_paths), self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT):
+                        subset_db_paths = db_paths[i:i + self.SQLITE_MAX_ITEMS_FOR_IN_STATEMENT]
+                        res = c.execute(
+                            "SELECT entity_type, entity_id, entity_name, path, primary_entity FROM path_cache "
+                            "WHERE root = ? AND path IN (%s)" % self._gen_param_string(subset_db_paths),
+                            [root_name] + subset_db_paths
+                        )
+                        for entity_type, entity_id, entity_name, db_path, primary in res:
+                            rows = rows_by_db_path[(root_name, db_path)][0 if primary else 1]
+                            rows.append((entity_type, entity_id, entity_name))
+            finally:
+                c.close()
+
+            for root_name, db_paths in missing_db_paths.iteritems():
+                for db_path in db_paths:
+                    entity_rows, secondary_rows = rows_by_db_path[(root_name, db_path)]
+                    _lookup_cache.set(self._path_cache_file, ("entity", root_name, db_path), entity_rows)
+                    _lookup_cache.set(
+                        self._path_cache_file, ("secondary_entities", root_name, db_path), secondary_rows
+                    )
+
+        results = []
+        for ancestor, db_key in zip(ancestors, db_keys):
+            if db_key is None:
+                results.append((ancestor, None, []))
+                continue
+
+            entity_rows, secondary_rows = rows_by_db_path[db_key]
+            if len(entity_rows) > 1:
+                # never supposed to happen!
+                raise TankError("More than one entry in path database for %s!" % ancestor)
+
+            # convert to string, not unicode!
+            entities = [
+                {"type": str(d[0]), "id": d[1], "name": str(d[2])}
+                for d in entity_rows + secondary_rows
+            ]
+            results.append((ancestor, entities[0] if entity_rows else None, entities[len(entity_rows):]))
+
+        return results
+
     def ensure_all_entries_are_in_shotgun(self):
         """
         Ensures that all the path cache data in this database is also registered in Shotgun.
@@ -135,6 +135,13 @@ class PipelineConfiguration(object):
             False
         )
 
+        # keep a private copy of the path cache on the local disk of each
+        # machine rather than using the location defined by the cache hook.
+        self._use_path_cache_local_mirror = pipeline_config_metadata.get(
+            "path_cache_local_mirror",
+            False
+        )
+
         # figure out whether to use the bundle cache or the
         # local pipeline configuration 'install' cache
         if pipeline_config_metadata.get("use_bundle_cache"):
@@ -216,6 +223,19 @@ class PipelineConfiguration(object):
 
         self._descriptor = descriptor
 
+        # set how often the cached data of the yaml files of the configuration
+        # is checked against the files on disk, see YamlCache.set_validation_ttl.
+        if "yaml_cache_ttl" in pipeline_config_metadata:
+            yaml_cache.g_yaml_cache.set_validation_ttl(
+                self._pc_root,
+                pipeline_config_metadata["yaml_cache_ttl"]
+            )
+
+        # the files of immutable configurations never change, so there's no
+        # need to check them on disk once they have been cached.
+        if not is_installed and self._descriptor.is_immutable():
+            yaml_cache.g_yaml_cache.set_validation_ttl(self._descriptor.get_config_folder(), None)
+
         #
         # Now handle the case of a baked and immutable configuration.
         #
@@ -357,15 +377,37 @@ class PipelineConfiguration(object):
 
     def _get_yaml_cache_location(self):
         """
-        Returns the location of the yaml cache for this configuration.
+        Returns the location of the legacy pickled yaml cache for this configuration.
         """
         return os.path.join(self._pc_root, "yaml_cache.pickle")
 
+    def _get_yaml_cache_file_location(self):
+        """
+        Returns the location of the yaml cache file for this configuration.
+        """
+        return os.path.join(self._pc_root, yaml_cache.YamlCacheFile.FILE_NAME)
+
     def _populate_yaml_cache(self):
         """
-        Loads pickled yaml_cache items if they are found and merges them into
+        Registers the yaml cache file of the configuration with the global YamlCache
+        if it is found, so that yaml data can be read from it as needed.
+
+        Configurations cached by older versions of the core have a pickled cache
+        instead, in which case all the pickled items are loaded and merged into
         the global YamlCache.
         """
+        cache_file = self._get_yaml_cache_file_location()
+        if os.path.exists(cache_file):
+            try:
+                yaml_cache_file = yaml_cache.YamlCacheFile(cache_file)
+            except Exception as e:
+                log.warning("Could not read yaml cache %s: %s" % (cache_file, e))
+                return
+
+            yaml_cache.g_yaml_cache.add_cache_file(yaml_cache_file)
+            log.debug("Indexed %s items from yaml cache %s" % (len(yaml_cache_file), cache_file))
+            return
+
         cache_file = self._get_yaml_cache_location()
         if not os.path.exists(cache_file):
             return
@@ -557,6 +599,20 @@ class PipelineConfiguration(object):
         self._update_metadata({"use_shotgun_path_cache": True})
         self._use_shotgun_path_cache = True
 
+    def get_path_cache_local_mirror_enabled(self):
+        """
+        Returns true if each machine should keep a private copy of the path
+        cache on its local disk.
+
+        In this mode, the path cache is always located in the local cache
+        folder of the pipeline configuration, regardless of the location
+        returned by the ``cache_location`` core hook, and it is kept up to
+        date with Shotgun in the background. This is enabled by setting
+        ``path_cache_local_mirror: true`` in the ``pipeline_configuration.yml``
+        file and requires the Shotgun path cache to be enabled.
+        """
+        return self._use_shotgun_path_cache and self._use_path_cache_local_mirror
+
     ########################################################################################
     # storage roots related
 
@@ -21,7 +21,9 @@ import uuid
 
 from .. import hook
 from ..util.metrics import EventMetric
+from ..util import yaml_cache
 from ..log import LogManager
+from ..profiling import Profiler
 from ..errors import TankError, TankNoDefaultValueError
 from .errors import TankContextChangeNotSupportedError
 from . import constants
@@ -57,6 +59,19 @@ class TankBundle(object):
         self.__environment = env
         self.__log = log
 
+        # {setting name: resolved value} for the settings that only depend on
+        # the bundle's settings and schema, see get_setting. Reset whenever the
+        # settings or the context of the bundle change.
+        self.__resolved_settings = {}
+        # number of setting resolutions avoided thanks to the resolved settings.
+        self.__resolved_settings_hits = 0
+
+        # {(setting name, hook expression): resolved hook paths}, see __get_hook_paths.
+        self.__resolved_hook_paths = {}
+        # {(setting name, hook expression, base class): hook instance} for stateless
+        # hooks that can be reused by the next execution of the same hook.
+        self.__stateless_hooks = {}
+
         # emit an engine started event
         tk.execute_core_hook(constants.TANK_BUNDLE_INIT_HOOK_NAME, bundle=self)
 
@@ -452,7 +467,8 @@ class TankBundle(object):
                 self.log_debug("Importing python modules in %s..." % python_folder)
                 # alias the python folder with a UID to ensure it is unique every time it is imported
                 self.__module_uid = "tkimp%s" % uuid.uuid4().hex
-                imp.load_module(self.__module_uid, None, python_folder, ("", "", imp.PKG_DIRECTORY) )
+                with Profiler().timer("bundle.import", python_folder):
+                    imp.load_module(self.__module_uid, None, python_folder, ("", "", imp.PKG_DIRECTORY) )
             
             # we can now find our actual module in sys.modules as GUID.module_name
             mod_name = "%s.%s" % (self.__module_uid, module_name)
@@ -500,11 +516,25 @@ class TankBundle(object):
             >>> app.get_setting('entity_types')
             ['Sequence', 'Shot', 'Asset', 'Task']
 
+        Settings which are not computed by a hook are only resolved once and
+        their dictionaries and lists are read-only. Use :func:`copy.deepcopy`
+        to get a copy that can be modified.
+
         :param key: config name
         :param default: default value to return
         :returns: Value from the environment configuration
         """
-        return self.__resolve_setting_value(self.__settings, key, default)
+        # settings are only resolved once, unless they are computed by a hook.
+        # they are frozen so the same value can be returned to all callers.
+        if key in self.__resolved_settings:
+            self.__resolved_settings_hits += 1
+            return self.__resolved_settings[key]
+
+        value = self.__resolve_setting_value(self.__settings, key, default)
+        if self.__is_setting_value_static(key):
+            value = yaml_cache._freeze(value)
+            self.__resolved_settings[key] = value
+        return value
             
     def get_template(self, key):
         """
@@ -566,14 +596,7 @@ class TankBundle(object):
         :returns: The return value from the hook
         """
         hook_name = self.get_setting(key)
-        resolved_hook_paths = self.__resolve_hook_expression(key, hook_name)
-        return hook.execute_hook_method(
-            resolved_hook_paths,
-            self,
-            None,
-            base_class=base_class,
-            **kwargs
-        )
+        return self.__execute_hook_method(key, hook_name, None, base_class, kwargs)
         
     def execute_hook_method(self, key, method_name, base_class=None, **kwargs):
         """
@@ -616,14 +639,7 @@ class TankBundle(object):
         :returns: The return value from the hook
         """
         hook_name = self.get_setting(key)
-        resolved_hook_paths = self.__resolve_hook_expression(key, hook_name)
-        return hook.execute_hook_method(
-            resolved_hook_paths,
-            self,
-            method_name,
-            base_class=base_class,
-            **kwargs
-        )
+        return self.__execute_hook_method(key, hook_name, method_name, base_class, kwargs)
 
     def execute_hook_expression(self, hook_expression, method_name, base_class=None, **kwargs):
         """
@@ -651,13 +667,7 @@ class TankBundle(object):
             hook. This will override the default hook base class, ``Hook``.
         :returns: The return value from the hook
         """
-        resolved_hook_paths = self.__resolve_hook_expression(None, hook_expression)
-        return hook.execute_hook_method(
-            resolved_hook_paths,
-            self,
-            method_name,
-            base_class=base_class,
-            **kwargs)
+        return self.__execute_hook_method(None, hook_expression, method_name, base_class, kwargs)
 
     def execute_hook_by_name(self, hook_name, **kwargs):
         """
@@ -714,7 +724,7 @@ class TankBundle(object):
             hook. This will override the default hook base class, ``Hook``.
         :returns: :class:`Hook` instance.
         """
-        resolved_hook_paths = self.__resolve_hook_expression(None, hook_expression)
+        resolved_hook_paths = self.__get_hook_paths(None, hook_expression)
         return hook.create_hook_instance(
             resolved_hook_paths,
             self,
@@ -760,6 +770,8 @@ class TankBundle(object):
         :param new_context: The new context to associate with the bundle.
         """
         self.__context = new_context
+        self.__reset_resolved_settings()
+        self.__reset_resolved_hooks()
 
     def _set_settings(self, settings):
         """
@@ -768,6 +780,127 @@ class TankBundle(object):
         :param settings:    The new settings dict to store.
         """
         self.__settings = settings
+        self.__reset_resolved_settings()
+        self.__reset_resolved_hooks()
+
+    @property
+    def _resolved_settings_hits(self):
+        """
+        Number of setting resolutions avoided with the resolved settings since
+        they were last reset, see :meth:`get_setting`. For debugging purposes.
+        """
+        return self.__resolved_settings_hits
+
+    def _log_resolved_settings_hits(self):
+        """
+        Logs the number of setting resolutions avoided with the resolved settings
+        since they were last reset. Called when the settings are reset and when
+        the bundle is destroyed.
+        """
+        if self.__resolved_settings_hits:
+            core_logger.debug(
+                "%r: %d setting resolutions avoided with %d resolved settings." % (
+                    self, self.__resolved_settings_hits, len(self.__resolved_settings)
+                )
+            )
+
+    def __reset_resolved_settings(self):
+        """
+        Discards the resolved settings, see :meth:`get_setting`.
+        """
+        self._log_resolved_settings_hits()
+        self.__resolved_settings = {}
+        self.__resolved_settings_hits = 0
+
+    def __reset_resolved_hooks(self):
+        """
+        Discards the resolved hook paths and the stateless hook instances,
+        see :meth:`__execute_hook_method`.
+        """
+        self.__resolved_hook_paths = {}
+        self.__stateless_hooks = {}
+
+    def __get_hook_paths(self, settings_name, hook_expression):
+        """
+        Returns the paths of the hooks a hook expression resolves to, see
+        :meth:`__resolve_hook_expression`.
+
+        Resolved paths are kept until the bundle's settings or context change,
+        except for expressions referring to an environment variable which
+        are resolved every time since the variable can be changed at any time.
+
+        :param settings_name: The name of the hook setting in the configuration
+            or None if the expression isn't associated with a setting.
+        :param hook_expression: The path expression to a hook.
+        :returns: List of paths to hooks files.
+        """
+        key = (settings_name, hook_expression)
+        resolved_hook_paths = self.__resolved_hook_paths.get(key)
+        if resolved_hook_paths is None:
+            resolved_hook_paths = self.__resolve_hook_expression(settings_name, hook_expression)
+            if "{$" not in hook_expression:
+                self.__resolved_hook_paths[key] = resolved_hook_paths
+        return resolved_hook_paths
+
+    def __execute_hook_method(self, settings_name, hook_expression, method_name, base_class, kwargs):
+        """
+        Executes a method of the hook a hook expression resolves to.
+
+        Hooks are usually stateless, in which case the instance used to execute
+        the method is kept and reused by the next execution of the same hook
+        rather than creating a new instance every time. An instance is only
+        ever used by one thread at a time and is discarded as soon as it holds
+        state of its own, see :meth:`hook.is_stateless_hook`.
+
+        :param settings_name: The name of the hook setting in the configuration
+            or None if the expression isn't associated with a setting.
+        :param hook_expression: The path expression to a hook.
+        :param method_name: Method inside the hook to execute, None for the default one.
+        :param base_class: A python class to use as the base class for the hook.
+        :param kwargs: Keyword arguments to pass to the method.
+        :returns: The return value from the hook
+        """
+        hook_class = hook.get_hook_class(
+            self.__get_hook_paths(settings_name, hook_expression),
+            base_class=base_class
+        )
+
+        # take the instance so that no other thread can use it while it is executing.
+        key = (settings_name, hook_expression, base_class)
+        hook_instance = self.__stateless_hooks.pop(key, None)
+        if type(hook_instance) is not hook_class:
+            # no instance available or the hooks have been reloaded since.
+            hook_instance = hook_class(self)
+
+        ret_val = hook.execute_hook_instance_method(hook_instance, method_name, **kwargs)
+
+        if hook.is_stateless_hook(hook_instance):
+            self.__stateless_hooks[key] = hook_instance
+
+        return ret_val
+
+    def __is_setting_value_static(self, key):
+        """
+        Checks if the resolved value of a setting only depends on the bundle's
+        settings and schema and can therefore be resolved once.
+
+        Values that depend on the default passed by the caller or that are
+        computed by a core hook, using the ``hook:`` syntax, need to be
+        resolved every time.
+
+        :param key: setting name
+        :returns: True if the value can be resolved once, False otherwise.
+        """
+        schema = self.__descriptor.configuration_schema.get(key, None)
+
+        if key in self.__settings:
+            value = self.__settings[key]
+        elif schema and _has_default_value(schema, self._get_engine_name()):
+            value = resolve_default_value(schema, None, self._get_engine_name())
+        else:
+            return False
+
+        return not _is_procedural_value(value)
 
     def __resolve_hook_path(self, settings_name, hook_expression):
         """
@@ -1046,6 +1179,36 @@ class TankBundle(object):
         return engine_name
 
 
+def _is_procedural_value(value):
+    """
+    Checks if a setting value, or any of the values it holds, is computed
+    by a core hook using the ``hook:`` syntax.
+
+    :param value: Setting value, before post-processing.
+    :returns: True if the value is procedural, False otherwise.
+    """
+    if isinstance(value, basestring):
+        return value.startswith("hook:")
+    elif isinstance(value, list):
+        return any(_is_procedural_value(x) for x in value)
+    elif isinstance(value, dict):
+        return any(_is_procedural_value(x) for x in value.itervalues())
+    return False
+
+
+def _has_default_value(schema, engine_name=None):
+    """
+    Checks if a schema defines a default value, see :meth:`resolve_default_value`.
+
+    :param schema: The schema for the setting.
+    :param engine_name: Optional name of the current engine if there is one.
+    :returns: True if the schema has a default value, False otherwise.
+    """
+    if engine_name and "%s_%s" % (constants.TANK_SCHEMA_DEFAULT_VALUE_KEY, engine_name) in schema:
+        return True
+    return constants.TANK_SCHEMA_DEFAULT_VALUE_KEY in schema
+
+
 def _post_process_settings_r(tk, key, value, schema, bundle=None):
     """
     Recursive post-processing of settings values
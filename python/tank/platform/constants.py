@@ -53,6 +53,17 @@ BUNDLE_PYTHON_FOLDER = "python"
 # force use old, non-structure preseving parser
 USE_LEGACY_YAML_ENV_VAR = "TK_USE_LEGACY_YAML"
 
+# environment variable that if set, makes engines preload their apps on a pool
+# of threads. It can be set to the number of threads to use.
+PARALLEL_APP_LOADING_ENV_VAR = "TK_PARALLEL_APP_LOADING"
+
+# number of threads used to preload apps if no number is given
+DEFAULT_APP_PRELOAD_THREAD_COUNT = 8
+
+# environment variable that if set, makes engines defer the initialization of
+# apps which declare their commands in their manifest until they are used.
+LAZY_APP_LOADING_ENV_VAR = "TK_LAZY_APP_LOADING"
+
 # the file to look for that defines and bootstraps an engine
 ENGINE_FILE = "engine.py"
 
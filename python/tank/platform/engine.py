@@ -16,7 +16,9 @@ from __future__ import with_statement
 
 import os
 import re
+import collections
 import sys
+import time
 import logging
 import pprint
 import traceback
@@ -26,6 +28,8 @@ import threading
 
 from ..util.qt_importer import QtImporter
 from ..util.loader import load_plugin
+from ..util.concurrency import parallel_map
+from ..descriptor.io_descriptor import BundleCacheIndex
 from .. import hook
 
 from ..errors import TankError
@@ -39,6 +43,7 @@ from .errors import (
 from ..util.metrics import EventMetric
 from ..util.metrics import MetricsDispatcher
 from ..log import LogManager
+from ..profiling import Profiler
 
 from . import application
 from . import constants
@@ -82,6 +87,13 @@ class Engine(TankBundle):
         self.__shared_frameworks = {}
         self.__commands = {}
         self.__command_pool = {}
+        # {app instance name: (fingerprint, app)} for the apps of the pool
+        # which were loaded for the current context, see __load_apps.
+        self.__app_fingerprints = {}
+        # {app instance name: (app, framework instance names, stub command properties)}
+        # for the apps whose initialization is deferred, see __defer_app.
+        self.__deferred_apps = {}
+        self.__post_engine_inits_run = False
         self.__panels = {}
         self.__currently_initializing_app = None
         
@@ -196,8 +208,10 @@ class Engine(TankBundle):
         # run any init that needs to be done before the apps are loaded:
         self.pre_app_init()
         
-        # now load all apps and their settings
-        self.__load_apps()
+        # now load all apps and their settings. The bundle cache folders
+        # are listed once rather than checking each app in each bundle cache.
+        with BundleCacheIndex.snapshot():
+            self.__load_apps()
         
         # execute the post engine init for all apps
         # note that this is executed before the post_app_init
@@ -570,6 +584,14 @@ class Engine(TankBundle):
         
         :returns: dictionary with keys being app name and values being app objects
         """
+        if self.__deferred_apps:
+            # apps whose initialization is deferred are initialized when
+            # they are accessed.
+            return _DeferredAppsDict(
+                self.__applications,
+                self.__deferred_apps.keys(),
+                self.__initialize_deferred_app,
+            )
         return self.__applications
     
     @property
@@ -721,6 +743,7 @@ class Engine(TankBundle):
             self.__destroy_apps()
 
             self.log_debug("Destroying %s" % self)
+            self._log_resolved_settings_hits()
             self.destroy_engine()
 
             # finally remove the current engine reference
@@ -730,6 +753,11 @@ class Engine(TankBundle):
             # next time an engine is initialized
             hook.clear_hooks_cache()
 
+            # release the path cache database connections held by this thread.
+            # avoid cyclic dependencies, the path cache uses the engine busy overlay.
+            from .. import path_cache
+            path_cache.close_pooled_connections()
+
             # clean up the main thread invoker - it's a QObject so it's important we
             # explicitly set the value to None!
             self._invoker = None
@@ -838,7 +866,8 @@ class Engine(TankBundle):
             self.__env = new_env
             self._set_context(new_context)
             self._set_settings(new_engine_settings)
-            self.__load_apps(reuse_existing_apps=True, old_context=old_context)
+            with BundleCacheIndex.snapshot():
+                self.__load_apps(reuse_existing_apps=True, old_context=old_context)
 
             # Call the post_context_change method to allow for any engine
             # specific post-change logic to be run.
@@ -2453,6 +2482,8 @@ class Engine(TankBundle):
         # out here since those apps also exist in self.__application_pool,
         # which is persistent.
         self.__applications = dict()
+        self.__deferred_apps = dict()
+        self.__post_engine_inits_run = False
 
         # The commands dict will be repopulated either by new app inits,
         # or by pulling existing commands for reused apps from the persistant
@@ -2460,190 +2491,595 @@ class Engine(TankBundle):
         self.__commands = dict()
         self.__register_reload_command()
 
-        for app_instance_name in self.__env.get_apps(self.__engine_instance_name):
-            # Get a handle to the app bundle.
+        app_instance_names = self.__env.get_apps(self.__engine_instance_name)
+
+        # Apps are fingerprinted with their descriptor and settings and with
+        # the frameworks of the environment. During a context change, apps
+        # whose fingerprint didn't change since they were loaded are kept:
+        # their descriptor doesn't need to be resolved again nor their
+        # settings to be reset. They are still validated against the new
+        # context and their frameworks set up for it.
+        environment_fingerprint = self.__get_environment_fingerprint()
+        fingerprints = dict(
+            (app_instance_name, self.__get_app_fingerprint(app_instance_name, environment_fingerprint))
+            for app_instance_name in app_instance_names
+        )
+        unchanged_apps = {}
+        if reuse_existing_apps and old_context is not None:
+            for app_instance_name in app_instance_names:
+                (fingerprint, app) = self.__app_fingerprints.get(app_instance_name, (None, None))
+                if fingerprint is not None and fingerprint == fingerprints[app_instance_name]:
+                    unchanged_apps[app_instance_name] = app
+
+        # the I/O bound part of loading the apps can be done up front on a
+        # pool of threads. Apps are then still validated and initialized one
+        # by one, in order, on the current thread.
+        preloaded_apps = {}
+        thread_count = _get_app_preload_thread_count()
+        if thread_count:
+            preloaded_apps = self.__preload_apps(
+                [x for x in app_instance_names if x not in unchanged_apps],
+                thread_count
+            )
+
+        for app_instance_name in app_instance_names:
+            time_before = time.time()
+            with Profiler().timer("engine.load_app", app_instance_name):
+                if app_instance_name in unchanged_apps:
+                    if not self.__reuse_unchanged_app(unchanged_apps[app_instance_name], old_context):
+                        # restart the app rather than trying to change its context again.
+                        self.__load_app(app_instance_name, False, None)
+                else:
+                    self.__load_app(
+                        app_instance_name,
+                        reuse_existing_apps,
+                        old_context,
+                        preloaded_apps.get(app_instance_name)
+                    )
+            self.log_debug("App %s loaded in %fs" % (app_instance_name, time.time() - time_before))
+
+            app = self.__applications.get(app_instance_name)
+            fingerprint = fingerprints[app_instance_name]
+            if app is not None and app.context_change_allowed and fingerprint is not None:
+                self.__app_fingerprints[app_instance_name] = (fingerprint, app)
+            else:
+                self.__app_fingerprints.pop(app_instance_name, None)
+
+    def __get_environment_fingerprint(self):
+        """
+        Returns a fingerprint of the frameworks of the environment, which apps
+        depend on besides their own descriptor and settings.
+
+        :returns: A hashable fingerprint.
+        """
+        frameworks = []
+        for fw_instance_name in sorted(self.__env.get_frameworks()):
+            frameworks.append((
+                fw_instance_name,
+                _get_fingerprint(self.__env.get_framework_descriptor_dict(fw_instance_name)),
+                _get_fingerprint(self.__env.get_framework_settings(fw_instance_name)),
+            ))
+        return tuple(frameworks)
+
+    def __get_app_fingerprint(self, app_instance_name, environment_fingerprint):
+        """
+        Returns a fingerprint of the descriptor and settings of an app.
+
+        :param app_instance_name: Instance name of the app in the environment.
+        :param environment_fingerprint: Fingerprint returned by
+                                        :meth:`__get_environment_fingerprint`.
+        :returns: A hashable fingerprint, or None if the app is not properly
+                  configured in the environment.
+        """
+        try:
+            return (
+                _get_fingerprint(
+                    self.__env.get_app_descriptor_dict(self.__engine_instance_name, app_instance_name)
+                ),
+                _get_fingerprint(
+                    self.__env.get_app_settings(self.__engine_instance_name, app_instance_name)
+                ),
+                environment_fingerprint,
+            )
+        except TankError:
+            # reported when loading the app.
+            return None
+
+    def __reuse_unchanged_app(self, app, old_context):
+        """
+        Changes the context of an app whose descriptor and settings are the
+        same in the new context, see :meth:`__load_apps`.
+
+        :param app: The app to change the context of.
+        :param old_context: The context being changed away from.
+        :returns: True if the context of the app was changed, False otherwise.
+        """
+        try:
+            # the app is validated against the new context, like when it is loaded.
+            if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME:
+                validation.validate_context(app.descriptor, self.context)
+            validation.validate_settings(
+                app.instance_name,
+                self.tank,
+                self.context,
+                app.descriptor.configuration_schema,
+                app.settings,
+            )
+        except Exception as e:
+            # reported when the app is loaded again.
+            self.log_debug("App %r doesn't validate in the new context and will be restarted: %s" % (app, e))
+            return False
+
+        try:
+            # Update the app's internal context pointer.
+            app._set_context(self.context)
+
+            # Make sure our frameworks are up and running properly for
+            # the new context.
+            setup_frameworks(self, app, self.__env, app.descriptor)
+
+            # Repopulate the app's commands into the engine.
+            for command_name, command in self.__command_pool.iteritems():
+                if app is command.get("properties", dict()).get("app"):
+                    self.__commands[command_name] = command
+
+            # Run the post method in case there's custom logic implemented
+            # for the app.
+            app.post_context_change(old_context, self.context)
+        except Exception:
+            self.log_warning(
+                "App %r failed to change context and will be restarted: %s" % (
+                    app,
+                    traceback.format_exc()
+                )
+            )
+            return False
+
+        self.log_debug("App %s is unchanged and was kept for new context %s." % (
+            app.instance_name,
+            str(self.context)
+        ))
+        self.__applications[app.instance_name] = app
+        return True
+
+    def __preload_apps(self, app_instance_names, thread_count):
+        """
+        Performs the I/O bound part of loading apps on a pool of threads: the
+        app descriptors are resolved, their manifests read, their frameworks
+        validated and their python files read ahead of their import.
+
+        Python modules are not imported by the worker threads: imports are
+        serialized by the interpreter's import lock anyway, and the code run
+        at import time by bundles expects to be run by the main thread, in
+        the order the apps are loaded.
+
+        :param app_instance_names: List of instance names of the apps to preload.
+        :param thread_count: Number of worker threads to use.
+        :returns: Dictionary keyed by app instance name with a dictionary of
+                  preloaded data, see :meth:`__load_app`, for each app
+                  that could be preloaded.
+        """
+        def preload_app(app_instance_name):
+            with Profiler().timer("engine.preload_app", app_instance_name):
+                descriptor = self.__env.get_app_descriptor(
+                    self.__engine_instance_name,
+                    app_instance_name,
+                )
+                preloaded_app = {"descriptor": descriptor, "frameworks": None}
+                if not descriptor.exists_local():
+                    return preloaded_app
+
+                # read the manifest.
+                descriptor.configuration_schema
+
+                try:
+                    preloaded_app["frameworks"] = validation.validate_and_return_frameworks(
+                        descriptor, self.__env
+                    )
+                except TankError:
+                    # validated again, and reported, when loading the app.
+                    pass
+
+                _read_python_files(descriptor.get_path())
+                return preloaded_app
+
+        time_before = time.time()
+        preloaded_apps = {}
+        results = parallel_map(preload_app, app_instance_names, thread_count)
+        for app_instance_name, (preloaded_app, exc_info) in zip(app_instance_names, results):
+            if exc_info:
+                # the app will be loaded as usual, and the error reported then.
+                self.log_debug(
+                    "Could not preload app %s: %s" % (app_instance_name, exc_info[1])
+                )
+            else:
+                preloaded_apps[app_instance_name] = preloaded_app
+
+        self.log_debug(
+            "Preloaded %d apps with %d threads in %fs" % (
+                len(preloaded_apps), thread_count, time.time() - time_before
+            )
+        )
+        return preloaded_apps
+
+    def __load_app(self, app_instance_name, reuse_existing_apps, old_context, preloaded_app=None):
+        """
+        Loads an app of the engine's environment, see :meth:`__load_apps`.
+        Apps which fail to initialize are skipped.
+
+        :param app_instance_name: Instance name of the app in the environment.
+        :param reuse_existing_apps: Whether to use an already-running app rather
+                                    than starting up a new instance.
+        :param old_context: The context being changed away from during a context
+                            change, None otherwise.
+        :param preloaded_app: Optional dictionary with the ``descriptor`` of the app
+                              and the instance names of its ``frameworks``, or None
+                              if they couldn't be validated, as returned by
+                              :meth:`__preload_apps`.
+        """
+        # Get a handle to the app bundle.
+        if preloaded_app:
+            descriptor = preloaded_app["descriptor"]
+            framework_instance_names = preloaded_app["frameworks"]
+        else:
             descriptor = self.__env.get_app_descriptor(
                 self.__engine_instance_name,
                 app_instance_name,
             )
+            framework_instance_names = None
 
-            if not descriptor.exists_local():
-                self.log_error("Cannot start app! %s does not exist on disk." % descriptor)
-                continue
+        if not descriptor.exists_local():
+            self.log_error("Cannot start app! %s does not exist on disk." % descriptor)
+            return
+
+        # Load settings for app - skip over the ones that don't validate
+        try:
+            # get the app settings data and validate it.
+            app_schema = descriptor.configuration_schema
+            app_settings = self.__env.get_app_settings(
+                self.__engine_instance_name,
+                app_instance_name,
+            )
+
+            # check that the context contains all the info that the app needs
+            if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME: 
+                # special case! The shotgun engine is special and does not have a 
+                # context until you actually run a command, so disable the validation.
+                validation.validate_context(descriptor, self.context)
+
+            # make sure the current operating system platform is supported
+            validation.validate_platform(descriptor)
 
-            # Load settings for app - skip over the ones that don't validate
+            # for multi engine apps, make sure our engine is supported
+            supported_engines = descriptor.supported_engines
+            if supported_engines and self.name not in supported_engines:
+                raise TankError("The app could not be loaded since it only supports "
+                                "the following engines: %s. Your current engine has been "
+                                "identified as '%s'" % (supported_engines, self.name))
+
+            # now validate the configuration                
+            validation.validate_settings(
+                app_instance_name,
+                self.tank,
+                self.context,
+                app_schema,
+                app_settings,
+            )
+
+        except TankError as e:
+            # validation error - probably some issue with the settings!
+            # report this as an error message.
+            self.log_error("App configuration Error for %s (configured in environment '%s'). "
+                           "It will not be loaded: %s" % (app_instance_name, self.__env.disk_location, e))
+            return
+
+        except Exception:
+            # code execution error in the validation. Report this as an error 
+            # with the engire call stack!
+            self.log_exception("A general exception was caught while trying to "
+                               "validate the configuration loaded from '%s' for app %s. "
+                               "The app will not be loaded." % (self.__env.disk_location, app_instance_name))
+            return
+
+        # If we're told to reuse existing app instances, check for it and
+        # return if it's already there. This is most likely a context
+        # change that's in progress, which means we only want to load apps
+        # that aren't already up and running.
+        install_path = descriptor.get_path()
+        app_pool = self.__application_pool
+
+        if reuse_existing_apps and install_path in app_pool:
+            # If we were given an "old" context that's being switched away
+            # from, we can run the post change method and do a bit of
+            # reinitialization of certain portions of the app.
+            if old_context is not None and app_instance_name in app_pool[install_path]:
+                app = self.__application_pool[install_path][app_instance_name]
+
+                try:
+                    # Update the app's internal context pointer.
+                    app._set_context(self.context)
+
+                    # Update the app settings.
+                    app._set_settings(app_settings)
+
+                    # Set the instance name.
+                    app.instance_name = app_instance_name
+
+                    # Make sure our frameworks are up and running properly for
+                    # the new context.
+                    setup_frameworks(self, app, self.__env, descriptor, framework_instance_names)
+
+                    # Repopulate the app's commands into the engine.
+                    for command_name, command in self.__command_pool.iteritems():
+                        if app is command.get("properties", dict()).get("app"):
+                            self.__commands[command_name] = command
+
+                    # Run the post method in case there's custom logic implemented
+                    # for the app.
+                    app.post_context_change(old_context, self.context)
+                except Exception:
+                    # If any of the reinitialization failed we will warn and
+                    # continue on to a restart of the app via the normal means.
+                    self.log_warning(
+                        "App %r failed to change context and will be restarted: %s" % (
+                            app,
+                            traceback.format_exc()
+                        )
+                    )
+                else:
+                    # If the reinitialization of the reused app succeeded, we
+                    # just have to add it to the apps list and move on to
+                    # the next app.
+                    self.log_debug("App %s successfully reinitialized for new context %s." % (
+                        app_instance_name,
+                        str(self.context)
+                    ))
+                    self.__applications[app_instance_name] = app
+                    return
+
+        # In lazy mode, apps which declare the commands they register are
+        # only initialized when they are needed.
+        if _is_lazy_app_loading_enabled() and self.name != constants.SHOTGUN_ENGINE_NAME:
+            if self.__defer_app(app_instance_name, descriptor, app_settings, framework_instance_names):
+                return
+
+        # load the app
+        try:
+            # now get the app location and resolve it into a version object
+            app_dir = descriptor.get_path()
+
+            # create the object, run the constructor
+            app = application.get_application(self, 
+                                              app_dir, 
+                                              descriptor, 
+                                              app_settings, 
+                                              app_instance_name, 
+                                              self.__env)
+
+            # load any frameworks required
+            setup_frameworks(self, app, self.__env, descriptor, framework_instance_names)
+
+            # track the init of the app
+            self.__currently_initializing_app = app
             try:
-                # get the app settings data and validate it.
-                app_schema = descriptor.configuration_schema
-                app_settings = self.__env.get_app_settings(
-                    self.__engine_instance_name,
-                    app_instance_name,
+                app.init_app()
+            finally:
+                self.__currently_initializing_app = None
+
+        except TankError as e:
+            self.log_error("App %s failed to initialize. It will not be loaded: %s" % (app_dir, e))
+
+        except Exception:
+            self.log_exception("App %s failed to initialize. It will not be loaded." % app_dir)
+        else:
+            # note! Apps are keyed by their instance name, meaning that we 
+            # could theoretically have multiple instances of the same app.
+            self.__applications[app_instance_name] = app
+
+        # For the sake of potetial context changes, apps and commands are cached
+        # into a persistent pool such that they can be reused at some later time.
+        # This is required because, during context changes, some apps that were
+        # active in the old context might not be active in the new context. Because
+        # we might then switch BACK to the old context at some later time, or some
+        # future context might simply make use of some of the same apps, we want
+        # to keep a running cache of everything that's been initialized over time.
+        # This will allow us to reuse those (assuming they support on-the-fly
+        # context changes) rather than having to import and instantiate the same
+        # app(s) all over again, thereby hurting performance.
+
+        # Likewise, with commands, those from the old context that are not associated
+        # with apps that are active in the new context are filtered out of the engine's
+        # list of commands. When switching back to the old context, or any time the
+        # associated app is reused, we can then add back in the commands that the app
+        # had previously registered. With that, we're not required to re-run the init
+        # process for the app.
+
+        self.__update_pools(app_instance_name)
+
+    def __update_pools(self, app_instance_name):
+        """
+        Adds an app which has just been initialized, and the commands it
+        registered, to the persistent pools used during context changes.
+
+        :param app_instance_name: Instance name of the app in the environment.
+        """
+        # Update the persistent application pool for use in context changes.
+        for app in self.__applications.values():
+            # We will only track apps that we know can handle a context
+            # change. Any that do not will not be treated as a persistent
+            # app.
+            if app.context_change_allowed and app.instance_name == app_instance_name:
+                app_path = app.descriptor.get_path()
+
+                if app_path not in self.__application_pool:
+                    self.__application_pool[app_path] = dict()
+
+                self.__application_pool[app_path][app_instance_name] = app
+
+        # Update the persistent commands pool for use in context changes. The
+        # commands registered in place of deferred apps are left out, they are
+        # registered again if the apps are still deferred after the change.
+        stub_properties = set(
+            id(properties)
+            for (_, _, app_stub_properties) in self.__deferred_apps.itervalues()
+            for properties in app_stub_properties
+        )
+        for command_name, command in self.__commands.iteritems():
+            if id(command["properties"]) not in stub_properties:
+                self.__command_pool[command_name] = command
+
+    def __defer_app(self, app_instance_name, descriptor, app_settings, framework_instance_names):
+        """
+        Creates an app which declares its commands in its manifest and registers
+        these commands in place of the app's own, so that the app's frameworks
+        and its :meth:`Application.init_app` method are only set up and run when
+        one of these commands is run, or when the app is accessed via :meth:`apps`.
+
+        :param app_instance_name: Instance name of the app in the environment.
+        :param descriptor: Descriptor of the app.
+        :param app_settings: Validated settings of the app.
+        :param framework_instance_names: Instance names of the frameworks of the
+                                         app, or None if they still need to be validated.
+        :returns: True if the initialization of the app was deferred, False if
+                  the app should be initialized right away.
+        """
+        declared_commands = descriptor.declared_commands
+        if declared_commands is None:
+            return False
+
+        if not isinstance(declared_commands, list) or not all(
+            isinstance(command, dict) and command.get("name") for command in declared_commands
+        ):
+            self.log_warning(
+                "The commands declared by %s should be a list of dictionaries with a name "
+                "and optional properties. It will be initialized right away." % descriptor
+            )
+            return False
+
+        try:
+            # create the object, run the constructor
+            app = application.get_application(
+                self,
+                descriptor.get_path(),
+                descriptor,
+                app_settings,
+                app_instance_name,
+                self.__env
+            )
+        except TankError as e:
+            self.log_error("App %s failed to initialize. It will not be loaded: %s" % (descriptor, e))
+            return True
+        except Exception:
+            self.log_exception("App %s failed to initialize. It will not be loaded." % descriptor)
+            return True
+
+        stub_properties = []
+        self.__currently_initializing_app = app
+        try:
+            for declared_command in declared_commands:
+                command_name = declared_command["name"]
+                properties = dict(declared_command.get("properties") or {})
+                callback = self.__get_deferred_command_callback(app_instance_name, command_name)
+                self.register_command(command_name, callback, properties)
+                stub_properties.append(properties)
+
+                # the command the app registers once initialized logs the
+                # metrics, so the stub is registered without its wrapper.
+                for command in self.__commands.itervalues():
+                    if command["properties"] is properties:
+                        command["callback"] = callback
+        finally:
+            self.__currently_initializing_app = None
+
+        self.log_debug(
+            "Initialization of app %s deferred until one of its %d commands is run." % (
+                app_instance_name, len(stub_properties)
+            )
+        )
+        self.__deferred_apps[app_instance_name] = (app, framework_instance_names, stub_properties)
+        return True
+
+    def __get_deferred_command_callback(self, app_instance_name, command_name):
+        """
+        Returns a callback initializing an app whose initialization was deferred
+        and running the command it registered under the given name.
+
+        :param app_instance_name: Instance name of the app in the environment.
+        :param command_name: Name of the command declared by the app.
+        :returns: A callback accepting any arguments, passed to the app's command.
+        """
+        def run_deferred_command(*args, **kwargs):
+            app = self.__initialize_deferred_app(app_instance_name)
+            if app is None:
+                raise TankError(
+                    "Cannot run command '%s': app %s is not loaded." % (command_name, app_instance_name)
                 )
 
-                # check that the context contains all the info that the app needs
-                if self.__engine_instance_name != constants.SHOTGUN_ENGINE_NAME: 
-                    # special case! The shotgun engine is special and does not have a 
-                    # context until you actually run a command, so disable the validation.
-                    validation.validate_context(descriptor, self.context)
-                
-                # make sure the current operating system platform is supported
-                validation.validate_platform(descriptor)
-                                
-                # for multi engine apps, make sure our engine is supported
-                supported_engines = descriptor.supported_engines
-                if supported_engines and self.name not in supported_engines:
-                    raise TankError("The app could not be loaded since it only supports "
-                                    "the following engines: %s. Your current engine has been "
-                                    "identified as '%s'" % (supported_engines, self.name))
-                
-                # now validate the configuration                
-                validation.validate_settings(
-                    app_instance_name,
-                    self.tank,
-                    self.context,
-                    app_schema,
-                    app_settings,
+            for name, command in self.__commands.iteritems():
+                properties = command["properties"]
+                if properties.get("app") is not app:
+                    continue
+                if name == command_name or name == "%s:%s" % (properties.get("prefix"), command_name):
+                    return command["callback"](*args, **kwargs)
+
+            raise TankError(
+                "App %s did not register the command '%s' declared in its manifest." % (
+                    app_instance_name, command_name
                 )
+            )
 
-            except TankError as e:
-                # validation error - probably some issue with the settings!
-                # report this as an error message.
-                self.log_error("App configuration Error for %s (configured in environment '%s'). "
-                               "It will not be loaded: %s" % (app_instance_name, self.__env.disk_location, e))
-                continue
-            
-            except Exception:
-                # code execution error in the validation. Report this as an error 
-                # with the engire call stack!
-                self.log_exception("A general exception was caught while trying to "
-                                   "validate the configuration loaded from '%s' for app %s. "
-                                   "The app will not be loaded." % (self.__env.disk_location, app_instance_name))
-                continue
+        return run_deferred_command
 
-            # If we're told to reuse existing app instances, check for it and
-            # continue if it's already there. This is most likely a context
-            # change that's in progress, which means we only want to load apps
-            # that aren't already up and running.
-            install_path = descriptor.get_path()
-            app_pool = self.__application_pool
-
-            if reuse_existing_apps and install_path in app_pool:
-                # If we were given an "old" context that's being switched away
-                # from, we can run the post change method and do a bit of
-                # reinitialization of certain portions of the app.
-                if old_context is not None and app_instance_name in app_pool[install_path]:
-                    app = self.__application_pool[install_path][app_instance_name]
-
-                    try:
-                        # Update the app's internal context pointer.
-                        app._set_context(self.context)
-
-                        # Update the app settings.
-                        app._set_settings(app_settings)
-
-                        # Set the instance name.
-                        app.instance_name = app_instance_name
-
-                        # Make sure our frameworks are up and running properly for
-                        # the new context.
-                        setup_frameworks(self, app, self.__env, descriptor)
-
-                        # Repopulate the app's commands into the engine.
-                        for command_name, command in self.__command_pool.iteritems():
-                            if app is command.get("properties", dict()).get("app"):
-                                self.__commands[command_name] = command
-
-                        # Run the post method in case there's custom logic implemented
-                        # for the app.
-                        app.post_context_change(old_context, self.context)
-                    except Exception:
-                        # If any of the reinitialization failed we will warn and
-                        # continue on to a restart of the app via the normal means.
-                        self.log_warning(
-                            "App %r failed to change context and will be restarted: %s" % (
-                                app,
-                                traceback.format_exc()
-                            )
-                        )
-                    else:
-                        # If the reinitialization of the reused app succeeded, we
-                        # just have to add it to the apps list and continue on to
-                        # the next app.
-                        self.log_debug("App %s successfully reinitialized for new context %s." % (
-                            app_instance_name,
-                            str(self.context)
-                        ))
-                        self.__applications[app_instance_name] = app
-                        continue
+    def __initialize_deferred_app(self, app_instance_name):
+        """
+        Initializes an app whose initialization was deferred, see :meth:`__defer_app`.
+
+        The commands registered in place of the app's own are removed before
+        the app is initialized. Apps which aren't deferred are left as they are.
+
+        :param app_instance_name: Instance name of the app in the environment.
+        :returns: The app, or None if it is not loaded or failed to initialize.
+        """
+        if app_instance_name not in self.__deferred_apps:
+            return self.__applications.get(app_instance_name)
 
-            # load the app
+        (app, framework_instance_names, stub_properties) = self.__deferred_apps.pop(app_instance_name)
+        for command_name, command in self.__commands.items():
+            if any(command["properties"] is properties for properties in stub_properties):
+                del self.__commands[command_name]
+
+        time_before = time.time()
+        with Profiler().timer("engine.load_app", app_instance_name):
             try:
-                # now get the app location and resolve it into a version object
-                app_dir = descriptor.get_path()
-
-                # create the object, run the constructor
-                app = application.get_application(self, 
-                                                  app_dir, 
-                                                  descriptor, 
-                                                  app_settings, 
-                                                  app_instance_name, 
-                                                  self.__env)
-                
                 # load any frameworks required
-                setup_frameworks(self, app, self.__env, descriptor)
-                
+                setup_frameworks(self, app, self.__env, app.descriptor, framework_instance_names)
+
                 # track the init of the app
                 self.__currently_initializing_app = app
                 try:
                     app.init_app()
                 finally:
                     self.__currently_initializing_app = None
-            
+
             except TankError as e:
-                self.log_error("App %s failed to initialize. It will not be loaded: %s" % (app_dir, e))
-                
+                self.log_error("App %s failed to initialize. It will not be loaded: %s" % (app, e))
+                return None
+
             except Exception:
-                self.log_exception("App %s failed to initialize. It will not be loaded." % app_dir)
-            else:
-                # note! Apps are keyed by their instance name, meaning that we 
-                # could theoretically have multiple instances of the same app.
-                self.__applications[app_instance_name] = app
-
-            # For the sake of potetial context changes, apps and commands are cached
-            # into a persistent pool such that they can be reused at some later time.
-            # This is required because, during context changes, some apps that were
-            # active in the old context might not be active in the new context. Because
-            # we might then switch BACK to the old context at some later time, or some
-            # future context might simply make use of some of the same apps, we want
-            # to keep a running cache of everything that's been initialized over time.
-            # This will allow us to reuse those (assuming they support on-the-fly
-            # context changes) rather than having to import and instantiate the same
-            # app(s) all over again, thereby hurting performance.
-
-            # Likewise, with commands, those from the old context that are not associated
-            # with apps that are active in the new context are filtered out of the engine's
-            # list of commands. When switching back to the old context, or any time the
-            # associated app is reused, we can then add back in the commands that the app
-            # had previously registered. With that, we're not required to re-run the init
-            # process for the app.
-
-            # Update the persistent application pool for use in context changes.
-            for app in self.__applications.values():
-                # We will only track apps that we know can handle a context
-                # change. Any that do not will not be treated as a persistent
-                # app.
-                if app.context_change_allowed and app.instance_name == app_instance_name:
-                    app_path = app.descriptor.get_path()
-
-                    if app_path not in self.__application_pool:
-                        self.__application_pool[app_path] = dict()
-
-                    self.__application_pool[app_path][app_instance_name] = app
-
-            # Update the persistent commands pool for use in context changes.
-            for command_name, command in self.__commands.iteritems():
-                self.__command_pool[command_name] = command
-            
+                self.log_exception("App %s failed to initialize. It will not be loaded." % app)
+                return None
+
+        self.log_debug("Deferred app %s initialized in %fs" % (app_instance_name, time.time() - time_before))
+        self.__applications[app_instance_name] = app
+        self.__update_pools(app_instance_name)
+
+        # apps initialized after the engine ran the post_engine_init methods
+        # of its apps run theirs right away.
+        if self.__post_engine_inits_run:
+            self.__run_post_engine_init(app)
+
+        return app
+
     def __destroy_frameworks(self):
         """
         Destroy frameworks
@@ -2666,6 +3102,7 @@ class Engine(TankBundle):
         for app in self.__applications.values():
             app._destroy_frameworks()
             self.log_debug("Destroying %s" % app)
+            app._log_resolved_settings_hits()
             app.destroy_app()
 
     def __register_reload_command(self):
@@ -2703,14 +3140,23 @@ class Engine(TankBundle):
         Executes the post_engine_init method for all running apps.
         """
         for app in self.__applications.values():
-            try:
-                app.post_engine_init()
-            except TankError as e:
-                self.log_error("App %s Failed to run its post_engine_init. It is loaded, but"
-                               "may not operate in its desired state! Details: %s" % (app, e))
-            except Exception:
-                self.log_exception("App %s failed run its post_engine_init. It is loaded, but"
-                                   "may not operate in its desired state!" % app)
+            self.__run_post_engine_init(app)
+        self.__post_engine_inits_run = True
+
+    def __run_post_engine_init(self, app):
+        """
+        Executes the post_engine_init method of an app.
+
+        :param app: The app to run the method of.
+        """
+        try:
+            app.post_engine_init()
+        except TankError as e:
+            self.log_error("App %s Failed to run its post_engine_init. It is loaded, but"
+                           "may not operate in its desired state! Details: %s" % (app, e))
+        except Exception:
+            self.log_exception("App %s failed run its post_engine_init. It is loaded, but"
+                               "may not operate in its desired state!" % app)
 
 
 ##########################################################################################
@@ -3185,3 +3631,140 @@ def _get_command_prefix(properties):
         # Second, distinguish commands by group name.
         prefix_parts.append(properties["group"])
     return ":".join(prefix_parts)
+
+
+def _get_fingerprint(data):
+    """
+    Returns a hashable representation of configuration data which is
+    equal for equal data, regardless of the order of dictionary keys.
+
+    :param data: Configuration data, as read from a yaml file.
+    :returns: Nested tuples representing the data.
+    """
+    if isinstance(data, dict):
+        return (dict, tuple(sorted((k, _get_fingerprint(v)) for k, v in data.iteritems())))
+    if isinstance(data, (list, tuple)):
+        return (list, tuple(_get_fingerprint(v) for v in data))
+    return data
+
+
+def _get_app_preload_thread_count():
+    """
+    Returns the number of threads to use to preload apps, as set with the
+    ``TK_PARALLEL_APP_LOADING`` environment variable.
+
+    The variable can be set to the number of threads to use, or to any other
+    non-empty value to use the default number of threads.
+
+    :returns: Number of threads, 0 if apps should not be preloaded.
+    """
+    value = os.environ.get(constants.PARALLEL_APP_LOADING_ENV_VAR)
+    if not value:
+        return 0
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        return constants.DEFAULT_APP_PRELOAD_THREAD_COUNT
+
+
+def _is_lazy_app_loading_enabled():
+    """
+    Returns whether the initialization of apps which declare their commands
+    is deferred, as set with the ``TK_LAZY_APP_LOADING`` environment variable.
+
+    :returns: True if lazy app loading is enabled, False otherwise.
+    """
+    return bool(os.environ.get(constants.LAZY_APP_LOADING_ENV_VAR))
+
+
+class _DeferredAppsDict(collections.Mapping):
+    """
+    Read-only dictionary of the apps of an engine, returned by :meth:`Engine.apps`
+    when the initialization of some apps is deferred.
+
+    Looking up an app initializes it if its initialization is deferred, and apps
+    which fail to initialize are removed. Checking if an app is in the dictionary
+    doesn't initialize it, so a deferred app is reported until it fails to
+    initialize. Whether an app is available is only known once it is initialized,
+    so anything enumerating the apps, like iterating over the dictionary, its keys,
+    values or items, its length, :meth:`copy` or ``dict(engine.apps)``, initializes
+    all the deferred apps first.
+    """
+
+    def __init__(self, apps, deferred_app_names, initialize_app):
+        """
+        :param apps: Dictionary of the initialized apps, keyed by instance name.
+        :param deferred_app_names: Instance names of the deferred apps.
+        :param initialize_app: Callable initializing a deferred app from its
+                               instance name and returning it, or None if the
+                               app failed to initialize.
+        """
+        self._apps = dict(apps)
+        self._deferred_app_names = set(deferred_app_names)
+        self._initialize_app = initialize_app
+
+    def _initialize(self, app_instance_name):
+        """
+        Initializes an app if its initialization is deferred.
+        """
+        if app_instance_name in self._deferred_app_names:
+            self._deferred_app_names.discard(app_instance_name)
+            app = self._initialize_app(app_instance_name)
+            if app is not None:
+                self._apps[app_instance_name] = app
+
+    def _initialize_all(self):
+        """
+        Initializes all the apps whose initialization is deferred.
+        """
+        for app_instance_name in sorted(self._deferred_app_names):
+            self._initialize(app_instance_name)
+
+    def __getitem__(self, app_instance_name):
+        self._initialize(app_instance_name)
+        return self._apps[app_instance_name]
+
+    def __contains__(self, app_instance_name):
+        return app_instance_name in self._apps or app_instance_name in self._deferred_app_names
+
+    has_key = __contains__
+
+    def __iter__(self):
+        self._initialize_all()
+        return iter(self._apps)
+
+    def __len__(self):
+        self._initialize_all()
+        return len(self._apps)
+
+    def copy(self):
+        """
+        Returns a dictionary of all the apps, initializing the deferred ones.
+        """
+        self._initialize_all()
+        return dict(self._apps)
+
+
+def _read_python_files(bundle_path):
+    """
+    Reads the python files of a bundle without importing them, so that they
+    are in the file system cache by the time the bundle is imported.
+
+    :param str bundle_path: Path to the bundle on disk.
+    """
+    paths = [os.path.join(bundle_path, constants.APP_FILE)]
+    python_folder = os.path.join(bundle_path, constants.BUNDLE_PYTHON_FOLDER)
+    for folder, _, file_names in os.walk(python_folder):
+        paths.extend(
+            os.path.join(folder, file_name)
+            for file_name in file_names if file_name.endswith((".py", ".pyc"))
+        )
+
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                while fh.read(1024 * 1024):
+                    pass
+        except IOError:
+            # missing files are reported when importing the bundle.
+            pass
@@ -26,6 +26,7 @@ from .errors import TankMissingEnvironmentFile
 
 from ..util.yaml_cache import g_yaml_cache
 from .. import LogManager
+from ..profiling import Profiler
 
 logger = LogManager.get_logger(__name__)
 
@@ -58,7 +59,8 @@ class Environment(object):
         self.__context = context
 
         # validate and populate config
-        self._refresh()
+        with Profiler().timer("environment.load", env_path):
+            self._refresh()
 
 
     def __repr__(self):
@@ -197,9 +199,11 @@ class Environment(object):
     def __load_data(self, path):
         """
         loads the main data from disk, raw form
+
+        The data is shared with the global yaml cache and is read-only.
         """
         logger.debug("Loading environment data from path: %s", self._env_path)
-        return g_yaml_cache.get(path) or {}
+        return g_yaml_cache.get(path, frozen=True) or {}
 
     def __load_environment_data(self):
         """
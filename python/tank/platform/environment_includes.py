@@ -32,6 +32,8 @@ import os
 import re
 import sys
 import copy
+import threading
+import collections
 
 from ..errors import TankError
 from ..template import TemplatePath
@@ -45,6 +47,57 @@ from ..util.includes import resolve_include
 
 log = LogManager.get_logger(__name__)
 
+# Templates built for templated include paths, keyed by
+# (include path, primary data root).
+_include_templates = {}
+
+# Maximum number of processed files held in memory, see _process_includes_r.
+MAX_PROCESSED_FILES = 500
+
+# {(file name, included files): (data, included files results, result)}
+# for the files processed by _process_includes_r, most recently used last.
+_processed_files = collections.OrderedDict()
+_processed_files_lock = threading.Lock()
+
+
+def _get_include_template(file_name, include, primary_data_root):
+    """
+    Returns the template for a templated include path.
+
+    Templates are only built once for a given include path.
+
+    :param file_name: The yml file the include is defined in.
+    :param include: The include path, with {tokens}.
+    :param primary_data_root: The primary data root of the project.
+    :returns: A :class:`TemplatePath` instance.
+    """
+    key = (include, primary_data_root)
+    template = _include_templates.get(key)
+    if template is not None:
+        return template
+
+    # extract all {tokens}
+    _key_name_regex = "[a-zA-Z_ 0-9]+"
+    regex = r"(?<={)%s(?=})" % _key_name_regex
+    key_names = re.findall(regex, include)
+
+    # try to construct a path object for each template
+    try:
+        # create template key objects
+        template_keys = {}
+        for key_name in key_names:
+            template_keys[key_name] = StringKey(key_name)
+
+        # Make a template
+        template = TemplatePath(include, template_keys, primary_data_root)
+    except TankError as e:
+        raise TankError("Syntax error in %s: Could not transform include path '%s' "
+                        "into a template: %s" % (file_name, include, e))
+
+    _include_templates[key] = template
+    return template
+
+
 def _resolve_includes(file_name, data, context):
     """
     Parses the includes section and returns a list of valid paths
@@ -72,31 +125,15 @@ def _resolve_includes(file_name, data, context):
                 )
                 continue
             
-            # extract all {tokens}
-            _key_name_regex = "[a-zA-Z_ 0-9]+"
-            regex = r"(?<={)%s(?=})" % _key_name_regex
-            key_names = re.findall(regex, include)
-    
             # get all the data roots for this project
             # note - it is possible that this call may raise an exception for configs
             # which don't have a primary storage defined - this is logical since such
             # configurations cannot make use of references into the file system hierarchy
             # (because no such hierarchy exists)
             primary_data_root = context.tank.pipeline_configuration.get_primary_data_root()
-    
-            # try to construct a path object for each template
-            try:
-                # create template key objects        
-                template_keys = {}
-                for key_name in key_names:
-                    template_keys[key_name] = StringKey(key_name)
-        
-                # Make a template
-                template = TemplatePath(include, template_keys, primary_data_root)
-            except TankError as e:
-                raise TankError("Syntax error in %s: Could not transform include path '%s' "
-                                "into a template: %s" % (file_name, include, e))
-            
+
+            template = _get_include_template(file_name, include, primary_data_root)
+
             # and turn the template into a path based on the context
             try:
                 f = context.as_template_fields(template)
@@ -174,7 +211,8 @@ def process_includes(file_name, data, context):
     :param context:     The current context
     
     :returns:           The flattened yml data after all includes have
-                        been recursively processed.
+                        been recursively processed. The data is shared with
+                        other callers and must not be modified.
     """
     # call the recursive method:
     data, _ = _process_includes_r(file_name, data, context)
@@ -189,6 +227,13 @@ def _process_includes_r(file_name, data, context):
     1. Load include data into a big dictionary X
     2. recursively go through the current file and replace any 
        @ref with a dictionary value from X
+
+    The result for a file is memoized, keyed by the file and the list of files
+    it includes in the given context. It is reused as long as the data of the file
+    and the results for the files it includes are the same objects as when it
+    was computed. Since the data comes from the global yaml cache, which returns
+    the same read-only data until a file changes, a file is only processed again
+    when it or one of the files it includes changes.
     
     :param file_name:   The root yml file to process
     :param data:        The contents of the root yml file to process
@@ -197,20 +242,37 @@ def _process_includes_r(file_name, data, context):
     :returns:           A tuple containing the flattened yml data 
                         after all includes have been recursively processed
                         together with a lookup for frameworks to the file 
-                        they were loaded from.
+                        they were loaded from. Both are shared with other
+                        callers and must not be modified.
     """
-    # first build our big fat lookup dict
+    # first resolve the included files and their data
     include_files = _resolve_includes(file_name, data, context)
-    
-    lookup_dict = {}
-    fw_lookup = {}
+
+    included_results = []
     for include_file in include_files:
-                
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
-                
+        included_data = g_yaml_cache.get(include_file, frozen=True) or {}
+
         # now resolve this data before proceeding
-        included_data, included_fw_lookup = _process_includes_r(include_file, included_data, context)
+        included_results.append(_process_includes_r(include_file, included_data, context))
+
+    key = (file_name, tuple(include_files))
+    with _processed_files_lock:
+        processed = _processed_files.pop(key, None)
+        if processed is not None:
+            (processed_data, processed_included_results, result) = processed
+            # empty files don't have data in the cache.
+            if (
+                (processed_data is data or not (processed_data or data)) and
+                all(a is b for (a, b) in zip(processed_included_results, included_results))
+            ):
+                _processed_files[key] = processed
+                return result
+
+    # build our big fat lookup dict
+    lookup_dict = {}
+    fw_lookup = {}
+    for include_file, (included_data, included_fw_lookup) in zip(include_files, included_results):
 
         # update our big lookup dict with this included data:
         if "frameworks" in included_data and isinstance(included_data["frameworks"], dict):
@@ -223,7 +285,10 @@ def _process_includes_r(file_name, data, context):
             for fw_name in included_data["frameworks"].keys():
                 fw_lookup[fw_name] = include_file
 
-            del(included_data["frameworks"])
+            # the included data is shared, leave it untouched.
+            included_data = dict(
+                (k, v) for (k, v) in included_data.iteritems() if k != "frameworks"
+            )
 
         fw_lookup.update(included_fw_lookup)
         lookup_dict.update(included_data)
@@ -231,12 +296,19 @@ def _process_includes_r(file_name, data, context):
     # now go through our own data, recursively, and replace any refs.
     # recurse down in dicts and lists
     try:
-        data = _resolve_refs_r(lookup_dict, data)
-        data = _resolve_frameworks(lookup_dict, data)
+        resolved_data = _resolve_refs_r(lookup_dict, data)
+        resolved_data = _resolve_frameworks(lookup_dict, resolved_data)
     except TankError as e:
         raise TankError("Include error. Could not resolve references for %s: %s" % (file_name, e))
-    
-    return data, fw_lookup
+
+    result = (resolved_data, fw_lookup)
+
+    with _processed_files_lock:
+        _processed_files[key] = (data, tuple(included_results), result)
+        while len(_processed_files) > MAX_PROCESSED_FILES:
+            _processed_files.popitem(last=False)
+
+    return result
     
 
 def find_framework_location(file_name, framework_name, context):
@@ -252,7 +324,7 @@ def find_framework_location(file_name, framework_name, context):
                             defined in or None if not found.
     """
     # load the data in for the root file:
-    data = g_yaml_cache.get(file_name) or {}
+    data = g_yaml_cache.get(file_name, frozen=True) or {}
 
     # track root frameworks:
     root_fw_lookup = {}
@@ -312,7 +384,7 @@ def find_reference(file_name, context, token, absolute_location=False):
     :rtype: tuple
     """
     # load the data in 
-    data = g_yaml_cache.get(file_name) or {}
+    data = g_yaml_cache.get(file_name, frozen=True) or {}
     
     # first build our big fat lookup dict
     include_files = _resolve_includes(file_name, data, context)
@@ -321,7 +393,7 @@ def find_reference(file_name, context, token, absolute_location=False):
 
     for include_file in include_files:
         # path exists, so try to read it
-        included_data = g_yaml_cache.get(include_file) or {}
+        included_data = g_yaml_cache.get(include_file, frozen=True) or {}
         
         if token in included_data:
             # If we've been asked to ensure an absolute location, we need
@@ -60,6 +60,7 @@ class Framework(TankBundle):
                 fw._destroy_framework()
         # and destroy self
         self.log_debug("Destroying %s" % self)
+        self._log_resolved_settings_hits()
         self.destroy_framework()
 
     ##########################################################################################
@@ -216,14 +217,19 @@ class Framework(TankBundle):
 #
 
 
-def setup_frameworks(engine_obj, parent_obj, env, parent_descriptor):
+def setup_frameworks(engine_obj, parent_obj, env, parent_descriptor, framework_instance_names=None):
     """
     Checks if any frameworks are needed for the current item
     and in that case loads them - recursively
-    """
 
-    # look into the environment, get descriptors for all frameworks that our item needs:
-    framework_instance_names = validation.validate_and_return_frameworks(parent_descriptor, env)
+    :param framework_instance_names: Optional list of (framework name, instance name)
+        tuples for the frameworks needed by the item, as returned by
+        :meth:`validation.validate_and_return_frameworks`, if they were already
+        validated.
+    """
+    if framework_instance_names is None:
+        # look into the environment, get descriptors for all frameworks that our item needs:
+        framework_instance_names = validation.validate_and_return_frameworks(parent_descriptor, env)
 
     # looks like all of the frameworks are valid! Load them one by one
     for fw_name, fw_inst_name in framework_instance_names:
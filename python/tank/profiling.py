@@ -0,0 +1,234 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Built-in profiling of the operations which typically make Toolkit slow to
+start, such as loading hooks, importing bundles, loading environments and
+reading templates.
+
+Profiling is off by default. It is turned on by setting the ``TK_PROFILING``
+environment variable or via the :class:`Profiler` API::
+
+    sgtk.Profiler().enabled = True
+    engine = sgtk.platform.start_engine("tk-maya", tk, ctx)
+
+    for (category, name), (count, total) in sgtk.Profiler().get_stats().iteritems():
+        print "%s %s: %d calls, %fs" % (category, name, count, total)
+
+    sgtk.Profiler().write_chrome_trace("/tmp/startup.json")
+
+The resulting file uses the Chrome trace event format and can be opened
+in ``chrome://tracing``. The ``tank`` command writes such a file when it
+is passed a ``--profile=/path/to/trace.json`` argument.
+"""
+
+import os
+import json
+import time
+import threading
+from functools import wraps
+
+from . import constants
+
+
+class Profiler(object):
+    """
+    Collects the wall time and number of calls of profiled operations.
+
+    This is a singleton: all instances share the same state.
+
+    Operations are identified by a category, e.g. ``hook.execute``, and a
+    name, e.g. the path of a hook file, and are profiled with :meth:`timer`::
+
+        with Profiler().timer("environment.load", env_path):
+            env = Environment(env_path, pipeline_config)
+
+    Besides the statistics for each operation, the individual events are
+    recorded, up to :attr:`MAX_EVENTS`, to be written as a trace with
+    :meth:`write_chrome_trace`.
+    """
+
+    # maximum number of individual events kept for traces.
+    MAX_EVENTS = 100000
+
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        # create the instance if it hasn't been created already
+        if not cls.__instance:
+            instance = super(Profiler, cls).__new__(cls, *args, **kwargs)
+
+            instance._lock = threading.Lock()
+            # time events are relative to.
+            instance._start_time = time.time()
+            # {(category, name): [number of calls, total time]}
+            instance._stats = {}
+            # list of (category, name, start, duration, thread id)
+            instance._events = []
+
+            # check the TK_PROFILING flag at startup
+            instance._enabled = constants.PROFILING_ENV_VAR in os.environ
+
+            cls.__instance = instance
+
+        return cls.__instance
+
+    def _get_enabled(self):
+        """
+        Controls if operations are profiled.
+
+        .. note:: Profiling is off by default. To enable it from startup,
+                  set the environment variable ``TK_PROFILING``.
+        """
+        return self._enabled
+
+    def _set_enabled(self, state):
+        self._enabled = bool(state)
+
+    enabled = property(_get_enabled, _set_enabled)
+
+    def timer(self, category, name):
+        """
+        Returns a context manager profiling the operation it wraps, or
+        doing nothing if profiling is disabled.
+
+        :param str category: Category of the operation, e.g. ``hook.load``.
+        :param str name: Name of the operation within its category.
+        :returns: A context manager.
+        """
+        if not self._enabled:
+            return _NULL_TIMER
+        return _Timer(self, category, name)
+
+    @staticmethod
+    def timed(category):
+        """
+        Decorator profiling the calls to a function, named after the function::
+
+            @Profiler.timed("templates.read")
+            def read_templates(pipeline_configuration):
+                ...
+
+        :param str category: Category of the calls.
+        """
+        def decorator(func):
+            name = "%s.%s" % (func.__module__, func.__name__)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with Profiler().timer(category, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, category, name, start, duration):
+        """
+        Records an operation.
+
+        :param str category: Category of the operation.
+        :param str name: Name of the operation within its category.
+        :param float start: Time the operation started at, as returned by ``time.time()``.
+        :param float duration: Time the operation took, in seconds.
+        """
+        with self._lock:
+            stats = self._stats.setdefault((category, name), [0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            if len(self._events) < self.MAX_EVENTS:
+                self._events.append(
+                    (category, name, start, duration, threading.current_thread().ident)
+                )
+
+    def get_stats(self):
+        """
+        Returns the statistics of the operations profiled so far.
+
+        :returns: A dictionary where the keys are (category, name) tuples and
+            the values (number of calls, total time in seconds) tuples.
+        """
+        with self._lock:
+            return dict((key, tuple(stats)) for key, stats in self._stats.iteritems())
+
+    def clear(self):
+        """
+        Discards the statistics and events recorded so far.
+        """
+        with self._lock:
+            self._start_time = time.time()
+            self._stats = {}
+            self._events = []
+
+    def write_chrome_trace(self, path):
+        """
+        Writes the events recorded so far to a file in the Chrome trace event
+        format, which can be opened in ``chrome://tracing``.
+
+        :param str path: Path of the file to write.
+        """
+        with self._lock:
+            start_time = self._start_time
+            events = list(self._events)
+
+        pid = os.getpid()
+        trace_events = []
+        for category, name, start, duration, thread_id in events:
+            trace_events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                # time stamps and durations are in microseconds.
+                "ts": int((start - start_time) * 1000000),
+                "dur": int(duration * 1000000),
+                "pid": pid,
+                "tid": thread_id,
+            })
+
+        with open(path, "w") as fh:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, fh)
+
+
+class _Timer(object):
+    """
+    Context manager recording the operation it wraps with a :class:`Profiler`.
+    """
+
+    def __init__(self, profiler, category, name):
+        """
+        :param profiler: :class:`Profiler` to record the operation with.
+        :param str category: Category of the operation.
+        :param str name: Name of the operation within its category.
+        """
+        self._profiler = profiler
+        self._category = category
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._profiler.record(self._category, self._name, self._start, time.time() - self._start)
+        return False
+
+
+class _NullTimer(object):
+    """
+    Context manager doing nothing, used when profiling is disabled.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
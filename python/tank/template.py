@@ -20,7 +20,8 @@ import sys
 from . import templatekey
 from .errors import TankError
 from . import constants
-from .template_path_parser import TemplatePathParser
+from .profiling import Profiler
+from .template_path_parser import CompiledTemplatePathParser, PathNormalizer
 
 class Template(object):
     """
@@ -104,6 +105,10 @@ class Template(object):
         self._prefix = ''
         self._static_tokens = []
 
+        # parsers for each definition variation, compiled the
+        # first time a path is parsed against this template.
+        self._path_parsers = None
+
     def __repr__(self):
         class_name = self.__class__.__name__
         if self.name:
@@ -347,14 +352,19 @@ class Template(object):
         cleaned_definition = re.sub(regex, "%(\g<1>)s", definition)
         return cleaned_definition
 
+    def _expand_definition(self, definition):
+        """
+        Expands the definition to include the prefix unless the definition is empty in which
+        case we just want to parse the prefix.  For example, in the case of a path template,
+        having an empty definition would result in expanding to the project/storage root
+        """
+        return os.path.join(self._prefix, definition) if definition else self._prefix
+
     def _calc_static_tokens(self, definition):
         """
         Finds the tokens from a definition which are not involved in defining keys.
         """
-        # expand the definition to include the prefix unless the definition is empty in which
-        # case we just want to parse the prefix.  For example, in the case of a path template, 
-        # having an empty definition would result in expanding to the project/storage root
-        expanded_definition = os.path.join(self._prefix, definition) if definition else self._prefix
+        expanded_definition = self._expand_definition(definition)
         regex = r"{%s}" % constants.TEMPLATE_KEY_NAME_REGEX
         tokens = re.split(regex, expanded_definition.lower())
         # Remove empty strings
@@ -456,20 +466,100 @@ class Template(object):
         :returns: Values found in the path based on keys in template
         :rtype: Dictionary
         """
-        path_parser = None
         fields = None
+        last_error = None
 
-        for ordered_keys, static_tokens in zip(self._ordered_keys, self._static_tokens):
-            path_parser = TemplatePathParser(ordered_keys, static_tokens)
-            fields = path_parser.parse_path(input_path, skip_keys)
+        for path_parser in self._get_path_parsers():
+            fields, last_error = path_parser.parse_path(input_path, skip_keys)
             if fields != None:
                 break
 
         if fields is None:
-            raise TankError("Template %s: %s" % (str(self), path_parser.last_error))
+            raise TankError("Template %s: %s" % (str(self), last_error))
 
         return fields
 
+    def get_fields_many(self, input_paths, skip_keys=None):
+        """
+        Extracts key name, value pairs from many paths in one pass. Example::
+
+            >>> input_paths = ['/studio_root/sgtk/demo_project_1/sequences/seq_1/shot_2/comp/publish/henry.v003.ma',
+            ...                '/studio_root/sgtk/demo_project_1/sequences/seq_1/shot_2/comp/publish/henry.v004.ma']
+            >>> for path, fields in template_path.get_fields_many(input_paths):
+            ...     print fields["version"]
+            3
+            4
+
+        This is equivalent to calling :meth:`get_fields` for each path, but the work
+        done for a directory is shared by consecutive paths from that directory, which
+        makes it well suited to scanning folders or image sequences. Results are
+        generated as the paths are consumed, so very large collections of paths
+        don't need to be held in memory.
+
+        :param input_paths: Iterable of source paths for values
+        :param skip_keys: Optional keys to skip
+        :type skip_keys: List
+
+        :returns: Generator of (input path, fields) tuples, where fields is the dictionary
+                  of values found in the path or None if the path doesn't fit the template.
+        """
+        return self._get_fields_many(((path, path) for path in input_paths), skip_keys)
+
+    def _get_fields_many(self, input_paths, skip_keys):
+        """
+        Extracts fields from many paths, see :meth:`get_fields_many`.
+
+        :param input_paths: Iterable of (input path, path to parse) tuples.
+        :param skip_keys: Optional keys to skip
+
+        :returns: Generator of (input path, fields) tuples.
+        """
+        normalizer = PathNormalizer()
+        fields_parser = self._make_fields_parser(skip_keys)
+        for input_path, parsed_path in input_paths:
+            yield input_path, fields_parser(*normalizer.normalize(parsed_path))
+
+    def _make_fields_parser(self, skip_keys=None):
+        """
+        Returns a function extracting fields from normalized paths. The function
+        remembers the directory matched by the previous call and reuses it for
+        paths from the same directory.
+
+        :param skip_keys: Optional keys to skip
+
+        :returns: Function taking a normalized path and its lower cased version, and
+                  returning the fields found in the path or None if the path doesn't
+                  fit the template.
+        """
+        path_parsers = self._get_path_parsers()
+        directory_caches = [{} for _ in path_parsers]
+
+        def parse(input_path, lower_path):
+            for path_parser, directory_cache in zip(path_parsers, directory_caches):
+                fields, _ = path_parser.parse_normalized_path(input_path, lower_path, skip_keys, directory_cache)
+                if fields is not None:
+                    return fields
+            return None
+
+        return parse
+
+    def _get_path_parsers(self):
+        """
+        Returns the parsers used to extract fields from a path, one for each
+        definition variation. They are compiled on first use and then reused
+        for the lifetime of the template.
+
+        :returns: List of :class:`CompiledTemplatePathParser`
+        """
+        if self._path_parsers is None:
+            self._path_parsers = [
+                CompiledTemplatePathParser(self._expand_definition(definition), ordered_keys, static_tokens)
+                for definition, ordered_keys, static_tokens in zip(
+                    self._definitions, self._ordered_keys, self._static_tokens
+                )
+            ]
+        return self._path_parsers
+
 
 class TemplatePath(Template):
     """
@@ -642,6 +732,23 @@ class TemplateString(Template):
         adj_path = os.path.join(self._prefix, input_path)
         return super(TemplateString, self).get_fields(adj_path, skip_keys=skip_keys)
 
+    def get_fields_many(self, input_paths, skip_keys=None):
+        """
+        Extracts key name, value pairs from many strings in one pass.
+        See :meth:`Template.get_fields_many`.
+
+        :param input_paths: Iterable of source strings for values
+        :param skip_keys: Optional keys to skip
+        :type skip_keys: List
+
+        :returns: Generator of (input string, fields) tuples, where fields is the dictionary
+                  of values found in the string or None if the string doesn't fit the template.
+        """
+        # add path prefix as original design was to require project root
+        return self._get_fields_many(
+            ((path, os.path.join(self._prefix, path)) for path in input_paths), skip_keys
+        )
+
 def split_path(input_path):
     """
     Split a path into tokens.
@@ -656,6 +763,7 @@ def split_path(input_path):
     cur_path = cur_path.replace("\\", "/")
     return cur_path.split("/")
 
+@Profiler.timed("templates.read")
 def read_templates(pipeline_configuration):
     """
     Creates templates and keys based on contents of templates file.
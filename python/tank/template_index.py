@@ -0,0 +1,199 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Index over a collection of templates used to quickly find the templates
+matching a given path.
+"""
+
+from .template import TemplatePath
+from .template_path_parser import PathNormalizer
+
+
+class TemplatesDict(dict):
+    """
+    Dictionary of templates, keyed by template name, which counts the
+    modifications made to it. This lets a :class:`TemplateIndex` built from
+    the dictionary tell if it is still current without comparing all the
+    templates.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(TemplatesDict, self).__init__(*args, **kwargs)
+        self.modification_count = 0
+
+    def __setitem__(self, key, value):
+        super(TemplatesDict, self).__setitem__(key, value)
+        self.modification_count += 1
+
+    def __delitem__(self, key):
+        super(TemplatesDict, self).__delitem__(key)
+        self.modification_count += 1
+
+    def clear(self):
+        super(TemplatesDict, self).clear()
+        self.modification_count += 1
+
+    def pop(self, *args):
+        self.modification_count += 1
+        return super(TemplatesDict, self).pop(*args)
+
+    def popitem(self):
+        self.modification_count += 1
+        return super(TemplatesDict, self).popitem()
+
+    def setdefault(self, *args):
+        self.modification_count += 1
+        return super(TemplatesDict, self).setdefault(*args)
+
+    def update(self, *args, **kwargs):
+        super(TemplatesDict, self).update(*args, **kwargs)
+        self.modification_count += 1
+
+
+class TemplateIndex(object):
+    """
+    Index of templates keyed by their most discriminating static token.
+
+    Resolving a path against a template requires all the static tokens
+    of one of the template variations to be found, in order, in the
+    lower cased path (see :class:`TemplatePathParser`). The index takes
+    advantage of this and files each template variation under the static
+    token that is shared by the fewest other variations. When looking up a
+    path, only the variations whose discriminating token is contained in the
+    path are considered and the remaining static tokens are then checked
+    with a cheap ordered string search. The handful of templates left after
+    that are fully validated.
+
+    Only :class:`TemplatePath` objects are indexed. Any other template is
+    always validated against the path, the same way a linear scan would.
+    """
+
+    def __init__(self, templates):
+        """
+        :param templates: :class:`TemplatesDict` of templates, keyed by template name.
+        """
+        # keep track of the templates the index was built from, so that we
+        # can detect if the dictionary was replaced or modified afterwards.
+        self._templates = templates
+        self._modification_count = templates.modification_count
+
+        # templates which are always validated, stored alongside their
+        # position in the dictionary iteration order. Results are always
+        # returned in that order so that they are identical to a scan of
+        # the dictionary.
+        self._unindexed = []
+
+        # {discriminating token: [(position, template, static tokens), ...]}
+        self._buckets = {}
+
+        indexed = []
+        token_counts = {}
+        for position, template in enumerate(templates.values()):
+            if not isinstance(template, TemplatePath):
+                self._unindexed.append((position, template))
+                continue
+            for static_tokens in template._static_tokens:
+                indexed.append((position, template, static_tokens))
+                for token in set(static_tokens):
+                    token_counts[token] = token_counts.get(token, 0) + 1
+
+        for position, template, static_tokens in indexed:
+            if not static_tokens:
+                # nothing to discriminate on - always check this template.
+                self._unindexed.append((position, template))
+                continue
+            # pick the rarest token, favouring the longest one on a tie
+            token = min(static_tokens, key=lambda t: (token_counts[t], -len(t)))
+            self._buckets.setdefault(token, []).append((position, template, static_tokens))
+
+    def is_current(self, templates):
+        """
+        Checks if the index reflects the given templates.
+
+        :param templates: :class:`TemplatesDict` of templates, keyed by template name.
+        :returns: True if the index was built from the same dictionary and it
+                  wasn't modified since, False otherwise.
+        """
+        return (
+            templates is self._templates and
+            templates.modification_count == self._modification_count
+        )
+
+    def templates_from_path(self, path):
+        """
+        Finds the templates matching the given path.
+
+        :param path: Path to match against the templates.
+        :returns: List of :class:`Template` objects matching the path, in the
+                  iteration order of the indexed templates dictionary.
+        """
+        for _, matching_templates in self.templates_from_paths([path]):
+            return matching_templates
+
+    def templates_from_paths(self, paths):
+        """
+        Finds the templates matching each of the given paths.
+
+        Paths are processed one at a time as they are consumed from the iterable.
+        Consecutive paths from the same directory share the work done to
+        normalize and match that directory.
+
+        :param paths: Iterable of paths to match against the templates.
+        :returns: Generator of (path, list of matching :class:`Template` objects)
+                  tuples, see :meth:`templates_from_path`.
+        """
+        normalizer = PathNormalizer()
+        # {position: fields parser}, created the first time a template is
+        # a candidate for a path.
+        fields_parsers = {}
+
+        for path in paths:
+            normalized_path, lower_path = normalizer.normalize(path)
+
+            candidates = dict(self._unindexed)
+            for token, entries in self._buckets.iteritems():
+                if token not in lower_path:
+                    continue
+                for position, template, static_tokens in entries:
+                    if position not in candidates and self._tokens_in_order(lower_path, static_tokens):
+                        candidates[position] = template
+
+            matching_templates = []
+            for position in sorted(candidates):
+                template = candidates[position]
+                if isinstance(template, TemplatePath):
+                    if position not in fields_parsers:
+                        fields_parsers[position] = template._make_fields_parser()
+                    is_valid = fields_parsers[position](normalized_path, lower_path) is not None
+                else:
+                    is_valid = template.validate(path)
+                if is_valid:
+                    matching_templates.append(template)
+
+            yield path, matching_templates
+
+    @staticmethod
+    def _tokens_in_order(lower_path, static_tokens):
+        """
+        Checks that all static tokens can be found, in order and without
+        overlapping, in the given path.
+
+        :param lower_path: Normalized and lower cased path.
+        :param static_tokens: List of lower cased static tokens.
+        :returns: True if all tokens were found, False otherwise.
+        """
+        position = 0
+        for token in static_tokens:
+            position = lower_path.find(token, position)
+            if position < 0:
+                return False
+            position += len(token)
+        return True
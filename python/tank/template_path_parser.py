@@ -13,6 +13,11 @@ Parsing of template paths into values for specified keys using a list of static
 """
 
 import os
+import re
+import string
+
+from . import constants
+from . import templatekey
 from .errors import TankError
 
 class TemplatePathParser(object):
@@ -358,4 +363,357 @@ class TemplatePathParser(object):
                                                                     fully_resolved, 
                                                                     last_error))
             
-        return possible_values
\ No newline at end of file
+        return possible_values
+
+
+class CompiledTemplatePathParser(object):
+    """
+    Regular expression based parser for a single template definition.
+
+    The static tokens and keys of the definition are compiled once into a
+    single anchored regular expression where each key is matched by a
+    character class derived from the values the key accepts, e.g. digits for
+    an :class:`IntegerKey` or letters and digits for a :class:`StringKey`
+    filtered by ``alphanumeric``. When no key can contain the first character
+    of the static token following it, there is only one way to split a path
+    into key values and the regular expression finds it directly, without the
+    combinatorial search carried out by :class:`TemplatePathParser`.
+
+    Definitions for which this doesn't hold are genuinely ambiguous. They,
+    and a few corner cases which can't be decided from the regular expression
+    alone, are handed over to :class:`TemplatePathParser` so that both engines
+    always return the same fields.
+
+    Unlike :class:`TemplatePathParser`, instances don't hold any state about
+    the last parsed path and can be shared between calls and threads.
+    """
+
+    def __init__(self, expanded_definition, ordered_keys, static_tokens):
+        """
+        :param expanded_definition: Template definition, including its prefix.
+        :param ordered_keys:        Template key objects in order that they appear in the
+                                    template definition.
+        :param static_tokens:       Lower cased pieces of the definition that don't represent
+                                    Template Keys.
+        """
+        self.ordered_keys = ordered_keys
+        self.static_tokens = static_tokens
+        self._key_names = set(key.name for key in ordered_keys)
+
+        # tokens which can end a path before all keys have been given a value
+        # (see TemplatePathParser.__find_possible_key_values_recursive)
+        self._early_end_tokens = ()
+        self._regex = None
+
+        # the same expression split at the last path separator of the
+        # definition, so that the directory of a path can be matched once
+        # for all the files it contains. Key values can't contain path
+        # separators, so the split is always at the last separator of a path.
+        self._directory_regex = None
+        self._file_regex = None
+        self._num_directory_keys = 0
+
+        # split the definition into alternating tokens and key names:
+        # [token, key, token, key, ..., token]
+        regex = r"{(%s)}" % constants.TEMPLATE_KEY_NAME_REGEX
+        pieces = re.split(regex, expanded_definition.lower())
+        tokens = pieces[0::2]
+        if not ordered_keys or len(pieces[1::2]) != len(ordered_keys):
+            return
+        if not tokens[0] or not all(tokens[1:-1]):
+            # the definition starts with a key or has consecutive keys, which
+            # means values can't be delimited by static tokens.
+            return
+        if [t for t in tokens if t] != static_tokens:
+            return
+        if any(ord(c) > 127 for c in "".join(static_tokens)):
+            return
+
+        pattern = [re.escape(tokens[0])]
+        for key, token in zip(ordered_keys, tokens[1:]):
+            disallowed_chars = _get_disallowed_chars(key)
+            if token:
+                if ord(token[0]) > 127 or token[0] not in disallowed_chars:
+                    # the key value could contain the following token.
+                    return
+            pattern.append("([^%s]+)" % _char_class_ranges(disallowed_chars))
+            pattern.append(re.escape(token))
+
+        self._regex = re.compile("%s\\Z" % "".join(pattern))
+        self._early_end_tokens = tuple(t for t in tokens[1:len(ordered_keys)] if t)
+
+        # pattern holds the escaped token i at index 2 * i
+        for index in reversed(range(len(tokens))):
+            sep_index = tokens[index].rfind(os.path.sep)
+            if sep_index >= 0:
+                directory_pattern = pattern[:2 * index] + [re.escape(tokens[index][:sep_index + 1])]
+                file_pattern = [re.escape(tokens[index][sep_index + 1:])] + pattern[2 * index + 1:]
+                self._directory_regex = re.compile("%s\\Z" % "".join(directory_pattern))
+                self._file_regex = re.compile("%s\\Z" % "".join(file_pattern))
+                self._num_directory_keys = index
+                break
+
+    def parse_path(self, input_path, skip_keys):
+        """
+        Parses a path against the template definition to extract valid values for the keys.
+
+        :param input_path:  The path to parse.
+        :param skip_keys:   List of keys for whom we do not need to find values.
+
+        :returns:           Tuple of the fields found, mapping key names to their values, or
+                            None if the fields can't be resolved, and the last error found while
+                            parsing the path.
+        """
+        input_path = os.path.normpath(input_path)
+        return self.parse_normalized_path(input_path, input_path.lower(), skip_keys)
+
+    def parse_normalized_path(self, input_path, lower_path, skip_keys, directory_cache=None):
+        """
+        Parses an already normalized path against the template definition to extract
+        valid values for the keys.
+
+        :param input_path:      The path to parse, normalized with ``os.path.normpath``.
+        :param lower_path:      The lower cased normalized path.
+        :param skip_keys:       List of keys for whom we do not need to find values.
+        :param directory_cache: Optional dictionary used to store the values matched for the
+                                directory of the path, which are then reused for the following
+                                paths in the same directory. Only the last directory is kept.
+
+        :returns:               Tuple of the fields found, mapping key names to their values, or
+                                None if the fields can't be resolved, and the last error found while
+                                parsing the path.
+        """
+        if (
+            self._regex is None
+            or len(lower_path) != len(input_path)
+            or (skip_keys and self._key_names.intersection(skip_keys))
+        ):
+            return self._fallback_parse_path(input_path, skip_keys)
+
+        # the recursive parser also considers paths starting with the
+        # first key if the first token can be found further in the path.
+        if len(self.ordered_keys) >= len(self.static_tokens) and lower_path.find(self.static_tokens[0], 1) >= 0:
+            return self._fallback_parse_path(input_path, skip_keys)
+
+        values, directory_values = self._match(input_path, lower_path, directory_cache)
+        if values is None:
+            if lower_path.endswith(self._early_end_tokens):
+                return self._fallback_parse_path(input_path, skip_keys)
+            return None, ("Tried to extract fields from path '%s', "
+                          "but the path does not fit the template." % input_path)
+
+        fields = {}
+        str_values = {}
+        for index, (key, str_value) in enumerate(zip(self.ordered_keys, values)):
+
+            # can't have two different values for the same key:
+            if str_values.setdefault(key.name, str_value) != str_value:
+                return None, ("Conflicting values found for key %s: %s and %s"
+                              % (key.name, str_values[key.name], str_value))
+
+            if directory_values is not None and index < self._num_directory_keys:
+                # values found in the directory are the same for all its files.
+                if index not in directory_values:
+                    directory_values[index] = self._value_from_str(key, str_value)
+                value, error = directory_values[index]
+            else:
+                value, error = self._value_from_str(key, str_value)
+            if error:
+                return None, error
+            fields[key.name] = value
+
+        return fields, None
+
+    def _value_from_str(self, key, str_value):
+        """
+        Converts a string value found in a path to a value for a key.
+
+        :param key:       :class:`TemplateKey` the value is for.
+        :param str_value: String value found in the path.
+
+        :returns:         Tuple of the value, or None, and an error message if
+                          the string is not a valid value for the key.
+        """
+        try:
+            return key.value_from_str(str_value), None
+        except TankError as e:
+            # use the %r form for the error, see TemplatePathParser
+            return None, "Failed to get value for key '%s' - %r" % (key.name, e)
+
+    def _match(self, input_path, lower_path, directory_cache):
+        """
+        Matches a path against the compiled regular expression.
+
+        :param input_path:      The normalized path to match.
+        :param lower_path:      The lower cased normalized path.
+        :param directory_cache: Optional dictionary of directory matches, see :meth:`parse_normalized_path`.
+
+        :returns:               Tuple of the list of string values of the ordered keys, or None
+                                if the path doesn't match, and the dictionary of values converted
+                                for the keys of the directory, keyed by key index, or None if the
+                                directory cache wasn't used.
+        """
+        if directory_cache is None or self._directory_regex is None:
+            match = self._regex.match(lower_path)
+            if match is None:
+                return None, None
+            return [input_path[match.start(index + 1):match.end(index + 1)]
+                    for index in range(len(self.ordered_keys))], None
+
+        file_start = lower_path.rfind(os.path.sep) + 1
+        directory = input_path[:file_start]
+        if directory not in directory_cache:
+            directory_cache.clear()
+            match = self._directory_regex.match(lower_path[:file_start])
+            if match is None:
+                directory_cache[directory] = (None, None)
+            else:
+                directory_cache[directory] = ([
+                    directory[match.start(index + 1):match.end(index + 1)]
+                    for index in range(self._num_directory_keys)
+                ], {})
+
+        directory_str_values, directory_values = directory_cache[directory]
+        if directory_str_values is None:
+            return None, None
+        match = self._file_regex.match(lower_path, file_start)
+        if match is None:
+            return None, None
+        return directory_str_values + [
+            input_path[match.start(index + 1):match.end(index + 1)]
+            for index in range(len(self.ordered_keys) - self._num_directory_keys)
+        ], directory_values
+
+    def _fallback_parse_path(self, input_path, skip_keys):
+        """
+        Parses the path with a :class:`TemplatePathParser`.
+
+        :param input_path:  The path to parse.
+        :param skip_keys:   List of keys for whom we do not need to find values.
+
+        :returns:           Tuple of the fields found and the last error found while
+                            parsing the path.
+        """
+        parser = TemplatePathParser(self.ordered_keys, self.static_tokens)
+        fields = parser.parse_path(input_path, skip_keys)
+        return fields, parser.last_error
+
+
+class PathNormalizer(object):
+    """
+    Normalizes and lower cases paths, reusing the work done for the
+    directory of the previous path.
+
+    Normalizing a path whose last component is a plain file name is the same as
+    normalizing its directory and appending the file name, which means consecutive
+    paths from the same directory, e.g. the frames of an image sequence, only
+    need their file name to be lower cased.
+    """
+
+    def __init__(self):
+        self._directory = None
+        self._normalized_directory = None
+        self._lower_directory = None
+
+    def normalize(self, input_path):
+        """
+        Normalizes a path.
+
+        :param input_path: The path to normalize.
+        :returns:          Tuple of the path normalized with ``os.path.normpath`` and
+                           the same path lower cased.
+        """
+        file_start = input_path.rfind(os.path.sep) + 1
+        if os.path.altsep:
+            file_start = max(file_start, input_path.rfind(os.path.altsep) + 1)
+        file_name = input_path[file_start:]
+
+        if file_name in ("", os.curdir, os.pardir):
+            normalized_path = os.path.normpath(input_path)
+            return normalized_path, normalized_path.lower()
+
+        directory = input_path[:file_start]
+        if directory != self._directory:
+            normalized_directory = os.path.normpath(directory) if directory else ""
+            if not os.path.isabs(normalized_directory):
+                # relative paths can be collapsed further by normpath, e.g. ./name
+                normalized_path = os.path.normpath(input_path)
+                return normalized_path, normalized_path.lower()
+            if not normalized_directory.endswith(os.path.sep):
+                normalized_directory += os.path.sep
+            self._directory = directory
+            self._normalized_directory = normalized_directory
+            self._lower_directory = normalized_directory.lower()
+
+        return self._normalized_directory + file_name, self._lower_directory + file_name.lower()
+
+
+def _char_class_ranges(chars):
+    """
+    Returns a regular expression character class body matching the given
+    ASCII characters, with consecutive characters collapsed into ranges.
+
+    :param chars: Set of characters.
+    :returns:     String, e.g. ``\\x00-\\x2f\\x3a-\\x60``
+    """
+    ranges = []
+    for code in sorted(ord(c) for c in chars):
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return "".join(
+        "\\x%02x" % start if start == end else "\\x%02x-\\x%02x" % (start, end)
+        for start, end in ranges
+    )
+
+
+def _get_disallowed_chars(key):
+    """
+    Returns the ASCII characters which can't appear in the lower cased
+    string value of a key. Non ASCII characters are always considered valid.
+
+    :param key: :class:`TemplateKey` instance.
+    :returns:   Set of characters.
+    """
+    allowed_chars = None
+
+    if isinstance(key, templatekey.SequenceKey):
+        # integers, frame specs such as %04d or @@@@, 'FORMAT: %d' strings
+        # and flame style [1001-1050] patterns.
+        allowed_chars = set(string.digits + string.whitespace + "[-]")
+        for spec in key.VALID_FORMAT_STRINGS + key._frame_specs + [key.FRAMESPEC_FORMAT_INDICATOR]:
+            allowed_chars.update(spec.lower())
+
+    elif isinstance(key, templatekey.IntegerKey):
+        allowed_chars = set(string.digits)
+        if not key._zero_padded:
+            # values can be padded with spaces
+            allowed_chars.update(string.whitespace)
+
+    elif isinstance(key, templatekey.StringKey):
+        if key.filter_by == "alphanumeric":
+            allowed_chars = set(string.ascii_lowercase + string.digits)
+        elif key.filter_by == "alpha":
+            allowed_chars = set(string.ascii_lowercase)
+
+    if (
+        isinstance(key, (templatekey.StringKey, templatekey.IntegerKey))
+        and not isinstance(key, templatekey.SequenceKey)
+        and key.choices
+    ):
+        # values are compared case insensitively to the choices.
+        try:
+            choices_chars = set("".join(str(choice).lower() for choice in key.choices))
+        except UnicodeError:
+            choices_chars = None
+        if choices_chars is not None and allowed_chars is not None:
+            allowed_chars &= choices_chars
+        elif choices_chars is not None:
+            allowed_chars = choices_chars
+
+    # path separators are never allowed in key values.
+    disallowed_chars = set([os.path.sep])
+    if allowed_chars is not None:
+        disallowed_chars.update(chr(c) for c in range(128) if chr(c) not in allowed_chars)
+    return disallowed_chars
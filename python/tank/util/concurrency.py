@@ -0,0 +1,102 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+"""
+Helpers to run I/O bound work on several threads.
+"""
+
+import sys
+import Queue
+import threading
+
+
+def parallel_map(func, items, thread_count):
+    """
+    Calls a function on each item of a list using a pool of worker threads.
+
+    Exceptions raised by the function don't interrupt the other calls and are
+    returned to the caller, who can decide how to report or re-raise them::
+
+        for path, (exists, exc_info) in zip(paths, parallel_map(os.path.exists, paths, 4)):
+            ...
+
+    :param func: Callable taking an item as its only argument.
+    :param items: List of items to call the function on.
+    :param int thread_count: Maximum number of worker threads. If lower than 2
+        or if there is a single item, the calls are made on the calling thread.
+    :returns: A list with a (result, exc_info) tuple for each item, in the order
+        of the items. exc_info is None if the call succeeded, the value returned
+        by ``sys.exc_info()`` otherwise.
+    """
+    results = [None] * len(items)
+    for index, result, exc_info in parallel_iter(func, items, thread_count):
+        results[index] = (result, exc_info)
+    return results
+
+
+def parallel_iter(func, items, thread_count):
+    """
+    Calls a function on each item of a list using a pool of worker threads and
+    yields the results as the calls complete.
+
+    Results are yielded on the calling thread, which can therefore report
+    progress, or update a user interface, while the other calls are running::
+
+        for index, result, exc_info in parallel_iter(download, urls, 4):
+            report_progress("Downloaded %s" % urls[index])
+
+    :param func: Callable taking an item as its only argument.
+    :param items: List of items to call the function on.
+    :param int thread_count: Maximum number of worker threads. If lower than 2
+        or if there is a single item, the calls are made on the calling thread,
+        in the order of the items.
+    :returns: A generator of (index, result, exc_info) tuples, one for each
+        item, where index is the index of the item in the list. exc_info is None
+        if the call succeeded, the value returned by ``sys.exc_info()`` otherwise.
+    """
+    def call(index):
+        try:
+            return (index, func(items[index]), None)
+        except Exception:
+            return (index, None, sys.exc_info())
+
+    thread_count = min(thread_count, len(items))
+    if thread_count < 2:
+        for index in range(len(items)):
+            yield call(index)
+        return
+
+    queue = Queue.Queue()
+    for index in range(len(items)):
+        queue.put(index)
+    results = Queue.Queue()
+
+    def worker():
+        while True:
+            try:
+                index = queue.get_nowait()
+            except Queue.Empty:
+                return
+            results.put(call(index))
+
+    threads = []
+    for _ in range(thread_count):
+        thread = threading.Thread(target=worker)
+        # don't prevent the application from exiting if it is interrupted.
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    for _ in range(len(items)):
+        yield results.get()
+
+    # the workers are done, make sure they have exited before returning.
+    for thread in threads:
+        thread.join()
@@ -45,3 +45,6 @@ SHOTGUN_SCHEMA_CACHE_KEY = "shotgun_schema"
 
 # tk instance cache of sg local storages
 SHOTGUN_LOCAL_STORAGES_CACHE_KEY = "shotgun_local_storages"
+
+# number of threads the files of a downloaded zip file are extracted on
+DEFAULT_UNZIP_THREAD_COUNT = 4
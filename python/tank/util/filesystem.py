@@ -19,6 +19,7 @@ import stat
 import shutil
 import datetime
 import functools
+import threading
 from contextlib import contextmanager
 
 from .. import LogManager
@@ -62,9 +63,16 @@ def with_cleared_umask(func):
             # regardless of umask setting.
             log.debug("Creating folder %s..." % path)
             os.makedirs(path, permissions)
+
+    The umask is a process wide setting, so it is only cleared when the
+    method runs on the main thread. On other threads, e.g. when bundles are
+    downloaded in parallel, the umask is left untouched and the methods of
+    this module set the permissions of what they create explicitly.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        if not isinstance(threading.current_thread(), threading._MainThread):
+            return func(*args, **kwargs)
         # set umask to zero, store old umask
         old_umask = os.umask(0)
         try:
@@ -128,7 +136,7 @@ def ensure_folder_exists(path, permissions=0o775, create_placeholder_file=False)
     """
     if not os.path.exists(path):
         try:
-            os.makedirs(path, permissions)
+            _make_folders(path, permissions)
 
             if create_placeholder_file:
                 ph_path = os.path.join(path, "placeholder")
@@ -150,6 +158,27 @@ def ensure_folder_exists(path, permissions=0o775, create_placeholder_file=False)
                 raise
 
 
+def _make_folders(path, permissions):
+    """
+    Helper method used by ensure_folder_exists(). Creates a folder and its
+    missing parent folders like ``os.makedirs`` and sets their permissions
+    explicitly, so they don't depend on the umask.
+
+    :param path: path to create
+    :param permissions: Permissions to use for the created folders
+    """
+    parent = os.path.dirname(path)
+    if parent and parent != path and not os.path.exists(parent):
+        try:
+            _make_folders(parent, permissions)
+        except OSError as e:
+            # the parent may have been created by someone else in the meantime.
+            if e.errno != errno.EEXIST:
+                raise
+    os.mkdir(path, permissions)
+    os.chmod(path, permissions)
+
+
 @with_cleared_umask
 def copy_file(src, dst, permissions=0o666):
     """
@@ -228,6 +257,7 @@ def copy_folder(src, dst, folder_permissions=0o775, skip_list=None):
 
     if not os.path.exists(dst):
         os.mkdir(dst, folder_permissions)
+        os.chmod(dst, folder_permissions)
 
     names = os.listdir(src)
     for name in names:
@@ -19,6 +19,8 @@ import uuid
 import urllib2
 import urlparse
 import time
+import hashlib
+import multiprocessing
 import tempfile
 import zipfile
 
@@ -27,12 +29,17 @@ from ...errors import TankError
 from ...log import LogManager
 from ..zip import unzip_file
 from .. import filesystem
+from .. import constants
 
 log = LogManager.get_logger(__name__)
 
+# size of the chunks downloaded content is written to disk by.
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @LogManager.log_timing
-def download_url(sg, url, location, use_url_extension=False):
+def download_url(sg, url, location, use_url_extension=False, progress_callback=None,
+                 resume=False, checksum=None, checksum_algorithm="md5"):
     """
     Convenience method that downloads a file from a given url.
     This method will take into account any proxy settings which have
@@ -49,6 +56,13 @@ def download_url(sg, url, location, use_url_extension=False):
     - location="/path/to/file" and use_url_extension=False would return "/path/to/file"
     - location="/path/to/file" and use_url_extension=True would return "/path/to/file.png"
 
+    The content is streamed to disk in chunks, into a partial file which is
+    renamed once the download is complete. With ``resume`` set to True, the
+    partial file of a previous attempt is kept when a download fails and the
+    next attempt asks the server for the remaining content only, via an HTTP
+    ``Range`` header. Servers which don't support ranges send the whole content
+    again, in which case the download starts over.
+
     :param sg: Shotgun API instance to get proxy connection settings from
     :param url: url to download
     :param location: path on disk where the payload should be written.
@@ -59,6 +73,14 @@ def download_url(sg, url, location, use_url_extension=False):
                                    to construct the full path name to the downloaded
                                    contents. The newly constructed full path name
                                    will be returned.
+    :param progress_callback: Optional callable called as chunks are written, with
+                              the number of bytes downloaded so far and the total
+                              number of bytes, or None if the server didn't report it.
+    :param bool resume: Resume the download where a previous failed attempt stopped.
+    :param str checksum: Optional expected hexadecimal digest of the content. The
+                         download fails if the digest of the content doesn't match.
+    :param str checksum_algorithm: Name of the :mod:`hashlib` algorithm the checksum
+                                   was computed with. Defaults to md5.
 
     :returns: Full filepath to the downloaded file. This may have been altered from
               the input ``location`` if ``use_url_extension`` is True and a file extension
@@ -81,16 +103,39 @@ def download_url(sg, url, location, use_url_extension=False):
     
     # inherit the timeout value from the sg API    
     timeout = sg.config.timeout_secs
-    
+
+    # content is written to a partial file first. When resuming, the content
+    # already written by a previous attempt is skipped.
+    partial_location = get_partial_download_path(location)
+    offset = 0
+    if resume and os.path.exists(partial_location):
+        offset = os.path.getsize(partial_location)
+
     # download the given url
     try:
-        request = urllib2.Request(url)
-        if timeout and sys.version_info >= (2,6):
-            # timeout parameter only available in python 2.6+
-            response = urllib2.urlopen(request, timeout=timeout)
-        else:
-            # use system default
-            response = urllib2.urlopen(request)
+        while True:
+            request = urllib2.Request(url)
+            if offset:
+                log.debug("Resuming download of '%s' from byte %s." % (url, offset))
+                request.add_header("Range", "bytes=%d-" % offset)
+
+            try:
+                if timeout and sys.version_info >= (2,6):
+                    # timeout parameter only available in python 2.6+
+                    response = urllib2.urlopen(request, timeout=timeout)
+                else:
+                    # use system default
+                    response = urllib2.urlopen(request)
+            except urllib2.HTTPError as e:
+                if offset and e.code == 416:
+                    # the requested range is not satisfiable, the partial file
+                    # doesn't match the content anymore. Start over.
+                    log.debug("Cannot resume the download of '%s'. Starting over." % url)
+                    filesystem.safe_delete_file(partial_location)
+                    offset = 0
+                    continue
+                raise
+            break
 
         if use_url_extension:
             # Make sure the disk location has the same extension as the url path.
@@ -99,18 +144,94 @@ def download_url(sg, url, location, use_url_extension=False):
             url_ext = os.path.splitext(urlparse.urlparse(response.geturl()).path)[-1]
             if url_ext:
                 location = "%s%s" % (location, url_ext)
-            
-        f = open(location, "wb")
-        try:
-            f.write(response.read())
-        finally:
-            f.close()
+
+        if offset and response.getcode() != 206:
+            # the server sent the whole content rather than the requested range.
+            log.debug("Server doesn't support resuming the download of '%s'. Starting over." % url)
+            offset = 0
+
+        __write_response(
+            response, partial_location, offset, progress_callback, checksum, checksum_algorithm
+        )
+
+        # the download is complete, move the file to its final location.
+        if os.path.exists(location):
+            os.remove(location)
+        os.rename(partial_location, location)
     except Exception as e:
+        if not resume:
+            filesystem.safe_delete_file(partial_location)
         raise TankError("Could not download contents of url '%s'. Error reported: %s" % (url, e))
 
     return location
 
 
+def get_partial_download_path(location):
+    """
+    Returns the path of the file content is written to while it is
+    downloaded by :meth:`download_url`.
+
+    :param str location: Path the content is downloaded to.
+    :returns: Path of the partial file.
+    """
+    return "%s.part" % location
+
+
+def __write_response(response, path, offset, progress_callback, checksum, checksum_algorithm):
+    """
+    Writes the content of an url response to a file in chunks.
+
+    :param response: Response returned by :func:`urllib2.urlopen`.
+    :param str path: Path of the file to write to.
+    :param int offset: Number of bytes already written to the file by a previous
+                       attempt, which the response doesn't include. The file is
+                       truncated if 0.
+    :param progress_callback: Optional callable reporting progress, see :meth:`download_url`.
+    :param str checksum: Optional expected hexadecimal digest of the whole content.
+    :param str checksum_algorithm: Name of the :mod:`hashlib` algorithm for the checksum.
+    :raises: :class:`TankError` if the content is incomplete or the checksum doesn't match.
+    """
+    hasher = hashlib.new(checksum_algorithm) if checksum else None
+
+    total_size = None
+    content_length = response.info().get("Content-Length")
+    if content_length is not None:
+        total_size = offset + int(content_length)
+
+    if offset and hasher:
+        # the checksum covers the content written by the previous attempt.
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(DOWNLOAD_CHUNK_SIZE), ""):
+                hasher.update(chunk)
+
+    downloaded_size = offset
+    with open(path, "ab" if offset else "wb") as fh:
+        while True:
+            chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            fh.write(chunk)
+            if hasher:
+                hasher.update(chunk)
+            downloaded_size += len(chunk)
+            if progress_callback:
+                progress_callback(downloaded_size, total_size)
+
+    if total_size is not None and downloaded_size < total_size:
+        raise TankError(
+            "Download interrupted after %s of %s bytes." % (downloaded_size, total_size)
+        )
+
+    if hasher and hasher.hexdigest().lower() != checksum.lower():
+        # the content is corrupt, there is no point in resuming from it.
+        filesystem.safe_delete_file(path)
+        raise TankError(
+            "The %s checksum of the downloaded content is %s, expected %s." % (
+                checksum_algorithm, hasher.hexdigest(), checksum
+            )
+        )
+
+
 def __setup_sg_auth_and_proxy(sg):
     """
     Borrowed from the Shotgun Python API, setup urllib2 with a cookie for authentication on
@@ -139,6 +260,22 @@ def __setup_sg_auth_and_proxy(sg):
     urllib2.install_opener(opener)
 
 
+def __get_unzip_thread_count():
+    """
+    Returns the number of threads downloaded zip files should be extracted on.
+
+    Extracting is partly CPU bound, so no more threads than there are
+    processors are used.
+
+    :returns: Number of threads.
+    """
+    try:
+        cpu_count = multiprocessing.cpu_count()
+    except NotImplementedError:
+        cpu_count = 1
+    return min(constants.DEFAULT_UNZIP_THREAD_COUNT, cpu_count)
+
+
 @LogManager.log_timing
 def download_and_unpack_attachment(sg, attachment_id, target, retries=5, auto_detect_bundle=False):
     """
@@ -156,24 +293,23 @@ def download_and_unpack_attachment(sg, attachment_id, target, retries=5, auto_de
         the bundle in a subfolder, this should be correctly unfolded.
     :raises: ShotgunAttachmentDownloadError on failure
     """
-    # @todo: progress feedback here - when the SG api supports it!
     # sometimes people report that this download fails (because of flaky connections etc)
-    # engines can often be 30-50MiB - as a quick fix, just retry the download if it fails
+    # engines can often be 30-50MiB - retry the download if it fails, resuming it
+    # where the previous attempt stopped.
     attempt = 0
     done = False
     invalid_zip_file = False
 
+    url = sg.get_attachment_download_url({"type": "Attachment", "id": attachment_id})
+    zip_tmp = os.path.join(tempfile.gettempdir(), "%s_tank.zip" % uuid.uuid4().hex)
+
     while not invalid_zip_file and not done and attempt < retries:
 
-        zip_tmp = os.path.join(tempfile.gettempdir(), "%s_tank.zip" % uuid.uuid4().hex)
         try:
             time_before = time.time()
-            log.debug("Downloading attachment id %s..." % attachment_id)
-            bundle_content = sg.download_attachment(attachment_id)
-
-            log.debug("Download complete. Saving into %s" % zip_tmp)
-            with open(zip_tmp, "wb") as fh:
-                fh.write(bundle_content)
+            log.debug("Downloading attachment id %s into %s..." % (attachment_id, zip_tmp))
+            download_url(sg, url, zip_tmp, resume=True)
+            log.debug("Download complete.")
 
             file_size = os.path.getsize(zip_tmp)
 
@@ -186,7 +322,7 @@ def download_and_unpack_attachment(sg, attachment_id, target, retries=5, auto_de
             log.debug("Unpacking %s bytes to %s..." % (file_size, target))
             filesystem.ensure_folder_exists(target)
             try:
-                unzip_file(zip_tmp, target, auto_detect_bundle)
+                unzip_file(zip_tmp, target, auto_detect_bundle, __get_unzip_thread_count())
             except zipfile.BadZipfile:
                 invalid_zip_file = True
 
@@ -203,6 +339,9 @@ def download_and_unpack_attachment(sg, attachment_id, target, retries=5, auto_de
             # remove zip file
             filesystem.safe_delete_file(zip_tmp)
 
+    # remove what was downloaded by the attempts which failed.
+    filesystem.safe_delete_file(get_partial_download_path(zip_tmp))
+
     if invalid_zip_file:
         # the attachment in shotgun could not be unpacked
         raise ShotgunAttachmentDownloadError("Shotgun attachment with id %s is not a zip file!" % attachment_id)
@@ -16,7 +16,13 @@ unless it's changed on disk.
 from __future__ import with_statement
 
 import os
+import sys
 import copy
+import time
+import struct
+import cPickle
+import fnmatch
+import hashlib
 import threading
 
 from tank_vendor import yaml
@@ -26,6 +32,80 @@ from ..errors import (
     TankFileDoesNotExistError,
 )
 
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary returned by :meth:`YamlCache.get` when frozen data
+    is requested.
+
+    Any attempt at modifying the dictionary raises a ``TypeError``. Copying the
+    dictionary, with :func:`copy.copy` or :func:`copy.deepcopy`, returns a regular
+    mutable ``dict``, so callers that need to modify the data only pay for a copy
+    when they actually do so.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "Cached yaml data is read-only. Use copy.deepcopy() to get a mutable copy."
+        )
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return dict(
+            (copy.deepcopy(key, memo), copy.deepcopy(value, memo))
+            for key, value in self.iteritems()
+        )
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """
+    Read-only list returned by :meth:`YamlCache.get` when frozen data is requested.
+
+    See :class:`FrozenDict` for details.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(
+            "Cached yaml data is read-only. Use copy.deepcopy() to get a mutable copy."
+        )
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _read_only
+    __iadd__ = __imul__ = _read_only
+    append = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def _freeze(data):
+    """
+    Converts yaml data into its read-only equivalent.
+
+    :param data: Data loaded from a yaml file.
+    :returns: The same data where dictionaries and lists have been replaced
+              with :class:`FrozenDict` and :class:`FrozenList` instances.
+    """
+    if isinstance(data, dict):
+        return FrozenDict((key, _freeze(value)) for key, value in data.iteritems())
+    elif isinstance(data, list):
+        return FrozenList(_freeze(value) for value in data)
+    return data
+
+
 class CacheItem(object):
     """
     Represents a single item in the global yaml cache.
@@ -47,6 +127,7 @@ class CacheItem(object):
         """
         self._path = os.path.normpath(path)
         self._data = data
+        self._frozen_data = None
 
         if stat is None:
             try:
@@ -65,9 +146,24 @@ class CacheItem(object):
 
     def _set_data(self, config_data):
         self._data = config_data
+        self._frozen_data = None
 
     data = property(_get_data, _set_data)
 
+    @property
+    def frozen_data(self):
+        """
+        A read-only version of the item's data, see :class:`FrozenDict`.
+
+        It is built the first time it is requested and then shared by all the callers.
+        """
+        # items unpickled from a yaml_cache.pickle file don't have frozen data.
+        frozen_data = getattr(self, "_frozen_data", None)
+        if frozen_data is None:
+            frozen_data = _freeze(self._data)
+            self._frozen_data = frozen_data
+        return frozen_data
+
     @property
     def path(self):
         """The path to the file on disk that the item was sourced from."""
@@ -122,6 +218,165 @@ class CacheItem(object):
     def __str__(self):
         return str(self.path)
 
+    def __getstate__(self):
+        # the frozen data is a copy of the data, no need to pickle it.
+        state = self.__dict__.copy()
+        state["_frozen_data"] = None
+        return state
+
+
+class YamlCacheFile(object):
+    """
+    Indexed file storing the yaml data of several files on disk, as written by
+    the ``tank cache_yaml`` command.
+
+    The file starts with a header followed by the pickled data of every
+    yaml file. The header holds the offset of an index listing, for each yaml
+    file, the location of its data in the file, a hash of that data and the
+    modification time and size the yaml file had when its data was stored.
+    Only the index is read when the cache file is opened, the data of a yaml
+    file is only read when that file is requested from the cache.
+    """
+
+    # Name of the cache file in a pipeline configuration.
+    FILE_NAME = "yaml_cache.bin"
+
+    # Identifies the format of the file. The version must be increased
+    # whenever the layout of the file changes.
+    MAGIC = "TKYC"
+    VERSION = 1
+
+    # magic, version, index offset, index size
+    _HEADER = struct.Struct("<4sIQQ")
+
+    def __init__(self, path):
+        """
+        Reads the index of a cache file.
+
+        :param path: Path to the cache file.
+        :raises: tank.errors.TankUnreadableFileError: The file is missing or isn't
+                 a cache file written by this version of the core.
+        """
+        self._path = path
+
+        try:
+            with open(path, "rb") as fh:
+                (magic, version, index_offset, index_size) = self._HEADER.unpack(
+                    fh.read(self._HEADER.size)
+                )
+                if magic != self.MAGIC or version != self.VERSION:
+                    raise TankUnreadableFileError(
+                        "'%s' is not a version %d yaml cache file." % (path, self.VERSION)
+                    )
+                fh.seek(index_offset)
+                self._index = cPickle.loads(fh.read(index_size))
+        except TankUnreadableFileError:
+            raise
+        except Exception as e:
+            raise TankUnreadableFileError("Unable to read yaml cache file '%s': %s" % (path, e))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, path):
+        return path in self._index
+
+    @property
+    def path(self):
+        """The path to the cache file."""
+        return self._path
+
+    def load(self, item):
+        """
+        Reads the data of a yaml file from the cache.
+
+        :param item: The CacheItem to read the data for.
+        :returns: Tuple with a boolean indicating if the data was found and the data.
+                  The data isn't found if the yaml file isn't in the cache or if it
+                  has changed on disk since it was cached.
+        """
+        entry = self._index.get(item.path)
+        if entry is None:
+            return (False, None)
+
+        (offset, size, digest, mtime, file_size) = entry
+        if mtime != item.stat.st_mtime or file_size != item.stat.st_size:
+            return (False, None)
+
+        try:
+            with open(self._path, "rb") as fh:
+                fh.seek(offset)
+                blob = fh.read(size)
+        except Exception:
+            return (False, None)
+
+        # the cache file may have been rewritten since its index was read.
+        if hashlib.sha1(blob).hexdigest() != digest:
+            return (False, None)
+
+        return (True, cPickle.loads(blob))
+
+    @classmethod
+    def write(cls, path, cache_items):
+        """
+        Writes a cache file.
+
+        The file is written next to its final location and then renamed, so
+        that processes reading the previous cache file are not affected.
+
+        :param path: Path to the cache file.
+        :param cache_items: List of CacheItems to store in the file.
+        """
+        index = {}
+        tmp_path = "%s.%d.tmp" % (path, os.getpid())
+        with open(tmp_path, "wb") as fh:
+            fh.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, 0, 0))
+            for item in cache_items:
+                blob = cPickle.dumps(item.data, cPickle.HIGHEST_PROTOCOL)
+                index[item.path] = (
+                    fh.tell(),
+                    len(blob),
+                    hashlib.sha1(blob).hexdigest(),
+                    item.stat.st_mtime,
+                    item.stat.st_size
+                )
+                fh.write(blob)
+
+            index_blob = cPickle.dumps(index, cPickle.HIGHEST_PROTOCOL)
+            index_offset = fh.tell()
+            fh.write(index_blob)
+
+            fh.seek(0)
+            fh.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, index_offset, len(index_blob)))
+
+        # rename can't replace a file on Windows.
+        if sys.platform == "win32" and os.path.exists(path):
+            os.remove(path)
+        os.rename(tmp_path, path)
+
+    @classmethod
+    def build(cls, path, folders):
+        """
+        Finds all the yaml files in the given folders and writes their
+        data into a cache file.
+
+        The files are loaded through the global yaml cache.
+
+        :param path: Path to the cache file.
+        :param folders: List of folders to search for yaml files.
+        :returns: Number of yaml files cached.
+        """
+        cache_items = {}
+        for folder in folders:
+            for root, dir_names, file_names in os.walk(folder):
+                for file_name in fnmatch.filter(file_names, "*.yml"):
+                    item = g_yaml_cache._add(CacheItem(os.path.join(root, file_name)))
+                    cache_items[item.path] = item
+
+        cls.write(path, cache_items.values())
+        return len(cache_items)
+
+
 class YamlCache(object):
     """
     Main yaml cache class
@@ -134,6 +389,13 @@ class YamlCache(object):
         self._cache = cache_dict or dict()
         self._lock = threading.Lock()
         self._is_static = is_static
+        # YamlCacheFile instances to read yaml data from before reading it
+        # from the yaml files.
+        self._cache_files = []
+        # (folder, ttl) validation policies, see set_validation_ttl
+        self._validation_ttls = []
+        # {path: time} of the last time a cached item was checked against its file.
+        self._validated_at = {}
 
     def _get_is_static(self):
         """
@@ -156,8 +418,75 @@ class YamlCache(object):
         with self._lock:
             if path in self._cache:
                 del self._cache[path]
+            self._validated_at.pop(path, None)
+
+    def set_validation_ttl(self, folder, ttl):
+        """
+        Sets how often the cached data of the yaml files in a folder is checked
+        against the files on disk.
+
+        By default, the modification time and size of a file are checked every time
+        its data is requested, which requires a round trip to the file server when
+        the file is on shared storage. With a time to live, the data is returned
+        without checking the file for the given number of seconds after the last
+        check. If policies are set for nested folders, the policy of the deepest
+        folder applies.
+
+        :param folder: Folder the policy applies to, including its sub-folders.
+        :param ttl: Number of seconds during which the cached data is returned without
+                    checking the file on disk. 0 checks the file on every request and
+                    None never checks it again once the data has been cached, which is
+                    suitable for folders that never change.
+        """
+        folder = os.path.join(os.path.normpath(folder), "")
+        with self._lock:
+            self._validation_ttls = [
+                (f, t) for (f, t) in self._validation_ttls if f != folder
+            ] + [(folder, ttl)]
+
+    def _get_validation_ttl(self, path):
+        """
+        Returns the validation time to live for a yaml file, see :meth:`set_validation_ttl`.
 
-    def get(self, path, deepcopy_data=True):
+        :param path: Normalized path to the yaml file.
+        :returns: Number of seconds or None.
+        """
+        if self.is_static:
+            return None
+
+        matched_folder = ""
+        ttl = 0
+        for (folder, folder_ttl) in self._validation_ttls:
+            if path.startswith(folder) and len(folder) > len(matched_folder):
+                matched_folder = folder
+                ttl = folder_ttl
+        return ttl
+
+    def _get_unexpired_item(self, path, ttl):
+        """
+        Returns the cached item for a yaml file if it doesn't need to be checked
+        against the file on disk yet.
+
+        :param path: Normalized path to the yaml file.
+        :param ttl: Validation time to live of the file, see :meth:`set_validation_ttl`.
+        :returns: The cached CacheItem or None.
+        """
+        if ttl == 0:
+            return None
+
+        with self._lock:
+            item = self._cache.get(path)
+            validated_at = self._validated_at.get(path)
+
+        if item is None or validated_at is None:
+            return None
+
+        if ttl is not None and time.time() - validated_at >= ttl:
+            return None
+
+        return item
+
+    def get(self, path, deepcopy_data=True, frozen=False):
         """
         Retrieve the yaml data for the specified path.  If it's not already
         in the cache of the cached version is out of date then this will load
@@ -165,6 +494,9 @@ class YamlCache(object):
         
         :param path:            The path of the yaml file to load.
         :param deepcopy_data:   Return deepcopy of data. Default is True.
+        :param frozen:          Return a read-only version of the data shared by
+                                all the callers instead of a copy, see :class:`FrozenDict`.
+                                Takes precedence over ``deepcopy_data``. Default is False.
         :returns:               The raw yaml data loaded from the file.
         """
         # Adding a new CacheItem to the cache will cause the file mtime
@@ -173,7 +505,20 @@ class YamlCache(object):
         # the appropriate item back to us, which will be either the new
         # item we have created here with the yaml data stored within, or
         # the existing cached data.
-        item = self._add(CacheItem(path))
+        #
+        # Depending on the validation policy of the file, the data may
+        # be returned without checking the file on disk at all.
+        path = os.path.normpath(path)
+        ttl = self._get_validation_ttl(path)
+        item = self._get_unexpired_item(path, ttl)
+        if item is None:
+            item = self._add(CacheItem(path))
+            if ttl != 0:
+                with self._lock:
+                    self._validated_at[path] = time.time()
+
+        if frozen:
+            return item.frozen_data
 
         # If asked to, return a deep copy of the cached data to ensure that 
         # the cached data is not updated accidentally!
@@ -182,6 +527,22 @@ class YamlCache(object):
         else:
             return item.data
 
+    def add_cache_file(self, cache_file):
+        """
+        Adds a cache file to read yaml data from.
+
+        When the data of a yaml file isn't in the cache, it is read from the cache
+        files if one of them holds the data for the current version of the yaml
+        file, instead of being loaded from the yaml file. If a cache file with the
+        same path was already added, it is replaced.
+
+        :param cache_file: A :class:`YamlCacheFile` instance.
+        """
+        with self._lock:
+            self._cache_files = [
+                f for f in self._cache_files if f.path != cache_file.path
+            ] + [cache_file]
+
     def get_cached_items(self):
         """
         Returns a list of all CacheItems stored in the cache.
@@ -254,7 +615,16 @@ class YamlCache(object):
     def _populate_cache_item_data(self, item):
         """
         Loads the CacheItem's YAML data from disk.
+
+        The data is read from the cache files if one of them holds it, see
+        :meth:`add_cache_file`.
         """
+        for cache_file in self._cache_files:
+            (found, data) = cache_file.load(item)
+            if found:
+                item.data = data
+                return
+
         path = item.path
         try:
             with open(path, "r") as fh:
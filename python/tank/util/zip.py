@@ -9,17 +9,23 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import shutil
 import zipfile
+import threading
 from . import filesystem
+from .concurrency import parallel_map
 from .. import LogManager
 
 log = LogManager.get_logger(__name__)
 
 SYSTEM_FILE_ITEMS = set(["__MACOSX", ".DS_Store"])
 
+# size of the chunks files are extracted by.
+_COPY_BUFFER_SIZE = 1024 * 1024
+
 
 @filesystem.with_cleared_umask
-def unzip_file(src_zip_file, target_folder, auto_detect_bundle=False):
+def unzip_file(src_zip_file, target_folder, auto_detect_bundle=False, thread_count=1):
     """
     Unzips the given file into the given folder.
 
@@ -37,11 +43,15 @@ def unzip_file(src_zip_file, target_folder, auto_detect_bundle=False):
         (config, app, engine, framework) and that this should be attempted to be
         detected and unpacked intelligently. For example, if the zip file contains
         the bundle in a subfolder, this should be correctly unfolded.
+    :param int thread_count: Number of threads the files are extracted on. When
+        greater than 1, the folder tree is created first and the files are then
+        extracted concurrently, which is faster for archives holding many files.
     """
     log.debug("Unpacking %s into %s" % (src_zip_file, target_folder))
     zip_obj = zipfile.ZipFile(src_zip_file, "r")
 
-    extraction_done = False
+    items = zip_obj.namelist()
+    root_to_omit = None
 
     if auto_detect_bundle:
         # enable additional flexibility in order to auto detect a bundle structure
@@ -66,21 +76,22 @@ def unzip_file(src_zip_file, target_folder, auto_detect_bundle=False):
                 "Will extract content out of the folder." % root_to_omit
             )
 
-            for x in zip_obj.namelist():
-                if x.startswith(root_to_omit):
-                    _process_item(zip_obj, x, target_folder, root_to_omit)
+            items = [x for x in items if x.startswith(root_to_omit)]
 
-            extraction_done = True
+    try:
+        if thread_count > 1 and len(items) > 1:
+            _extract_items_in_parallel(src_zip_file, items, target_folder, root_to_omit, thread_count)
+        else:
+            # loosely based on:
+            # http://forums.devshed.com/python-programming-11/unzipping-a-zip-file-having-folders-and-subfolders-534487.html
+            #
+            # make sure we are using consistent permissions
+            for x in items:
+                # process them one by one
+                _process_item(zip_obj, x, target_folder, root_to_omit)
+    finally:
+        zip_obj.close()
 
-    # loosely based on:
-    # http://forums.devshed.com/python-programming-11/unzipping-a-zip-file-having-folders-and-subfolders-534487.html
-    #
-    # make sure we are using consistent permissions
-    # get list of file names contained in archive
-    if not extraction_done:
-        for x in zip_obj.namelist():
-            # process them one by one
-            _process_item(zip_obj, x, target_folder)
 
 @filesystem.with_cleared_umask
 def zip_file(source_folder, target_zip_file):
@@ -101,18 +112,68 @@ def zip_file(source_folder, target_zip_file):
     log.debug("Zip complete. Size: %s" % os.path.getsize(target_zip_file))
 
 
-def _process_item(zip_obj, item_path, target_path, root_to_omit=None):
+def _extract_items_in_parallel(src_zip_file, items, target_folder, root_to_omit, thread_count):
     """
-    Helper method used by unzip_file()
+    Helper method used by unzip_file() to extract items on several threads.
 
-    Modified version of _extract_member in
-    http://hg.python.org/cpython/file/538f4e774c18/Lib/zipfile.py
+    The folder tree is created in a single pass before the files are extracted,
+    so that the threads only have to write the content of files.
 
-    :param zip_obj: Zipfile object to extract from
-    :param item_path: XZip file object to unpack
+    :param src_zip_file: Path to zip file to uncompress
+    :param items: List of the items of the zip file to extract
+    :param target_folder: Folder to extract into
+    :param root_to_omit: Optional root folder of the items to omit
+    :param int thread_count: Number of threads to extract the files on
+    """
+    files = []
+    folders = set()
+    for item_path in items:
+        target_path = _get_target_path(item_path, target_folder, root_to_omit)
+        if item_path[-1] == "/":
+            folders.add(target_path)
+        else:
+            folders.add(os.path.dirname(target_path))
+            files.append((item_path, target_path))
+
+    for folder in sorted(folders):
+        if folder:
+            filesystem.ensure_folder_exists(folder, 0o777)
+
+    # zip file objects can't be read from several threads at once, each
+    # thread opens the zip file once and keeps it for all the files it extracts.
+    thread_data = threading.local()
+    zip_objs = []
+    zip_objs_lock = threading.Lock()
+
+    def extract(item):
+        zip_obj = getattr(thread_data, "zip_obj", None)
+        if zip_obj is None:
+            zip_obj = zipfile.ZipFile(src_zip_file, "r")
+            thread_data.zip_obj = zip_obj
+            with zip_objs_lock:
+                zip_objs.append(zip_obj)
+        _extract_file(zip_obj, item[0], item[1])
+
+    try:
+        results = parallel_map(extract, files, thread_count)
+    finally:
+        for zip_obj in zip_objs:
+            zip_obj.close()
+
+    for (item_path, _), (_, exc_info) in zip(files, results):
+        if exc_info:
+            log.debug("Failed to extract %s" % item_path, exc_info=exc_info)
+            raise exc_info[1]
+
+
+def _get_target_path(item_path, target_path, root_to_omit=None):
+    """
+    Helper method used by unzip_file()
+
+    :param item_path: Path of an item in a zip file
     :param target_path: Path to unpack into
-    :param root_to_omit:
-    :returns: Full path to the unpacked file or folder
+    :param root_to_omit: Optional root folder of the item to omit
+    :returns: Full path to the item once unpacked
     """
     # build the destination pathname, replacing
     # forward slashes to platform specific separators.
@@ -138,36 +199,69 @@ def _process_item(zip_obj, item_path, target_path, root_to_omit=None):
     else:
         target_path = os.path.join(target_path, processed_item_path)
 
-    target_path = os.path.normpath(target_path)
+    return os.path.normpath(target_path)
+
+
+def _extract_file(zip_obj, item_path, target_path):
+    """
+    Helper method used by unzip_file()
+
+    Writes the content of a file of a zip file to disk, without reading it
+    all in memory, and restores its permissions.
+
+    :param zip_obj: Zipfile object to extract from
+    :param item_path: Path of the file in the zip file
+    :param target_path: Path to write the file to
+    """
+    with zip_obj.open(item_path) as source_obj:
+        with open(target_path, "wb") as target_obj:
+            shutil.copyfileobj(source_obj, target_obj, _COPY_BUFFER_SIZE)
+    # Restore permissions on the extracted file
+    # Took bits and bobs from here :
+    # http://bugs.python.org/file34893/issue15795_test_and_doc_fixes.patch
+    zip_info = zip_obj.getinfo(item_path)
+    # Only preserve execution bits: --x--x--x
+    # That is binary 001001001 = 0x49
+    # External attr seems to be 4 bytes long
+    # permissions being stored in 2 top most bytes, hence the 16 shift
+    # See : http://unix.stackexchange.com/questions/14705/the-zip-formats-external-file-attribute
+    # If one execution bit is set, give execution rights to everyone
+    # Permissions are always set explicitly, since the umask is not cleared
+    # when extracting on a thread other than the main one.
+    mode = zip_info.external_attr >> 16 & 0x49
+    if mode:
+        os.chmod(target_path, 0o777)
+    else:
+        os.chmod(target_path, 0o666)
+
+
+def _process_item(zip_obj, item_path, target_path, root_to_omit=None):
+    """
+    Helper method used by unzip_file()
+
+    Modified version of _extract_member in
+    http://hg.python.org/cpython/file/538f4e774c18/Lib/zipfile.py
+
+    :param zip_obj: Zipfile object to extract from
+    :param item_path: XZip file object to unpack
+    :param target_path: Path to unpack into
+    :param root_to_omit:
+    :returns: Full path to the unpacked file or folder
+    """
+    target_path = _get_target_path(item_path, target_path, root_to_omit)
 
     # Create all upper directories if necessary.
     upperdirs = os.path.dirname(target_path)
-    if upperdirs and not os.path.exists(upperdirs):
-        os.makedirs(upperdirs, 0o777)
+    if upperdirs:
+        filesystem.ensure_folder_exists(upperdirs, 0o777)
 
     if item_path[-1] == '/':
         # this is a directory!
         if not os.path.isdir(target_path):
-            os.mkdir(target_path, 0o777)
+            filesystem.ensure_folder_exists(target_path, 0o777)
 
     else:
-        # this is a file! - write it in a way which is compatible
-        # with py25 zipfile library interface
-        target_obj = open(target_path, "wb")
-        target_obj.write(zip_obj.read(item_path))
-        target_obj.close()
-        # Restore permissions on the extracted file
-        # Took bits and bobs from here :
-        # http://bugs.python.org/file34893/issue15795_test_and_doc_fixes.patch
-        zip_info = zip_obj.getinfo(item_path)
-        # Only preserve execution bits: --x--x--x
-        # That is binary 001001001 = 0x49
-        # External attr seems to be 4 bytes long
-        # permissions being stored in 2 top most bytes, hence the 16 shift
-        # See : http://unix.stackexchange.com/questions/14705/the-zip-formats-external-file-attribute
-        # If one execution bit is set, give execution rights to everyone
-        mode = zip_info.external_attr >> 16 & 0x49
-        if mode:
-            os.chmod(target_path, 0o777)
+        # this is a file!
+        _extract_file(zip_obj, item_path, target_path)
 
     return target_path
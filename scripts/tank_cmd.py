@@ -50,6 +50,7 @@ formatter = None
 ARG_SCRIPT_NAME = "script-name"
 ARG_SCRIPT_KEY = "script-key"
 ARG_CREDENTIALS_FILE = "credentials-file"
+ARG_PROFILE = "profile"
 
 SHOTGUN_ENTITY_TYPES = ['ActionMenuItem', 'ApiUser', 'AppWelcomeUserConnection', 'Asset', 'AssetAssetConnection',
                         'AssetBlendshapeConnection', 'AssetElementConnection', 'AssetEpisodeConnection',
@@ -184,6 +185,10 @@ General options and info
 ----------------------------------------------
 - To show this help, add a -h or --help flag.
 - To display verbose debug, add a --debug flag.
+- To profile the command, add the --profile=/path/to/trace.json argument
+  anywhere on the command line. Timings of the hooks, bundles, environments
+  and templates loaded are written to the file in the Chrome trace event
+  format, which can be opened in chrome://tracing.
 - To provide a script name and script key on the command line for
   authentication, add the --script-name=scriptname and
   --script-key=scriptkey arguments anywhere on the command line.
@@ -1463,6 +1468,13 @@ if __name__ == "__main__":
         logger.debug("")
     cmd_line = [arg for arg in cmd_line if arg != "--debug"]
 
+    # check if there is a --profile=path argument. In that case turn on
+    # profiling and write a trace to the given path when exiting.
+    profile_args, cmd_line = _extract_args(cmd_line, [ARG_PROFILE])
+    profile_path = profile_args[-1][1] if profile_args else None
+    if profile_path:
+        tank.Profiler().enabled = True
+
     # help requested?
     for x in cmd_line:
         if x == "--help" or x == "-h":
@@ -1687,6 +1699,14 @@ if __name__ == "__main__":
 
     # Do not use 8, it is alread being used when login was cancelled.
 
+    if profile_path:
+        try:
+            tank.Profiler().write_chrome_trace(profile_path)
+        except Exception as e:
+            logger.error("Could not write profiling trace to %s: %s" % (profile_path, e))
+        else:
+            logger.info("Profiling trace written to %s" % profile_path)
+
     logger.debug("Exiting with exit code %s" % exit_code)
     sys.exit(exit_code)
 
@@ -10,6 +10,8 @@
 
 from __future__ import with_statement
 import os
+import time
+import threading
 
 import sgtk
 from mock import patch, Mock
@@ -153,7 +155,7 @@ class TestFunctionality(ShotgunTestBase):
         # with what was added during __init__, and then we remove the parameters we know can't
         # be serialized. We're left with a small list of values that can be serialized.
         instance_data_members = instance_attrs - class_attrs - unserializable_attrs
-        self.assertEqual(len(instance_data_members), 7)
+        self.assertEqual(len(instance_data_members), 8)
 
         # Create a manager that hasn't been updated yet.
         clean_mgr = ToolkitManager()
@@ -163,6 +165,7 @@ class TestFunctionality(ShotgunTestBase):
         modified_mgr = ToolkitManager()
         modified_mgr.bundle_cache_fallback_paths = ["/a/b/c"]
         modified_mgr.caching_policy = ToolkitManager.CACHE_FULL
+        modified_mgr.bundle_download_thread_count = 1
         modified_mgr.pipeline_configuration = "Primary"
         modified_mgr.base_configuration = "sgtk:descriptor:app_store?"\
             "version=v0.18.91&name=tk-config-basic"
@@ -186,6 +189,123 @@ class TestFunctionality(ShotgunTestBase):
         # back correctly.
         self.assertEqual(restored_mgr.extract_settings(), modified_settings)
 
+    @patch("tank.authentication.ShotgunAuthenticator.get_user", return_value=Mock())
+    def test_cache_bundles(self, _):
+        """
+        Ensures missing bundles are downloaded in parallel, that a failed
+        download doesn't prevent the others and that progress is reported
+        from the calling thread.
+        """
+        main_thread = threading.current_thread()
+        download_threads = []
+
+        def make_descriptor(name, exists_local, fails=False):
+            descriptor = Mock()
+            descriptor.get_uri.return_value = "sgtk:descriptor:dev?name=%s" % name
+            descriptor.exists_local.return_value = exists_local
+
+            def download_local():
+                download_threads.append(threading.current_thread())
+                if fails:
+                    raise sgtk.descriptor.TankDescriptorError("Failed to download %s" % name)
+            descriptor.download_local.side_effect = download_local
+            return descriptor
+
+        engine_descriptor = make_descriptor("engine", True)
+        app_descriptors = [
+            make_descriptor("app1", False),
+            make_descriptor("app2", False, fails=True),
+            make_descriptor("app3", False),
+            make_descriptor("app4", True),
+        ]
+        env = Mock()
+        env.get_engines.return_value = ["tk-engine"]
+        env.get_engine_descriptor.return_value = engine_descriptor
+        env.get_apps.return_value = range(len(app_descriptors))
+        env.get_app_descriptor.side_effect = lambda engine, app: app_descriptors[app]
+        env.get_frameworks.return_value = []
+        pipeline_configuration = Mock()
+        pipeline_configuration.get_environments.return_value = ["project"]
+        pipeline_configuration.get_environment.return_value = env
+
+        progress = []
+
+        def progress_callback(progress_value, message):
+            self.assertIs(threading.current_thread(), main_thread)
+            progress.append((progress_value, message))
+
+        mgr = ToolkitManager()
+        mgr.bundle_download_thread_count = 3
+        mgr._cache_bundles(pipeline_configuration, "tk-engine", progress_callback)
+
+        for descriptor in [engine_descriptor] + app_descriptors:
+            self.assertEqual(
+                descriptor.download_local.call_count, 0 if descriptor.exists_local() else 1
+            )
+        self.assertEqual(len(download_threads), 3)
+        self.assertNotIn(main_thread, download_threads)
+
+        progress_values = [progress_value for progress_value, _message in progress]
+        self.assertEqual(progress_values, sorted(progress_values))
+        self.assertAlmostEqual(progress_values[-1], ToolkitManager._END_DOWNLOADING_APPS_RATE)
+        messages = [message for _, message in progress]
+        self.assertEqual(len([m for m in messages if m.startswith("Checking")]), 2)
+        self.assertEqual(len([m for m in messages if m.startswith("Downloaded")]), 2)
+        self.assertEqual(len([m for m in messages if m.startswith("Failed to download")]), 1)
+
+        with self.assertRaises(sgtk.bootstrap.TankBootstrapError):
+            mgr.bundle_download_thread_count = 0
+
+    @patch("tank.authentication.ShotgunAuthenticator.get_user", return_value=Mock())
+    def test_cache_bundles_umask(self, _):
+        """
+        Ensures downloading bundles in parallel leaves the umask of the process
+        unchanged and that folders and files are still created with the
+        permissions requested.
+        """
+        download_root = os.path.join(self.tank_temp, "cache_bundles_umask")
+
+        def make_descriptor(index):
+            descriptor = Mock()
+            descriptor.get_uri.return_value = "sgtk:descriptor:dev?name=app%s" % index
+
+            def download_local():
+                folder = os.path.join(download_root, "app%s" % index, "v1.0.0")
+                sgtk.util.filesystem.ensure_folder_exists(folder, 0o777)
+                sgtk.util.filesystem.touch_file(os.path.join(folder, "info.yml"))
+                time.sleep(0.001)
+            descriptor.download_local.side_effect = download_local
+            descriptor.exists_local.return_value = False
+            return descriptor
+
+        descriptors = [make_descriptor(index) for index in range(40)]
+
+        env = Mock()
+        env.get_engines.return_value = []
+        env.get_frameworks.return_value = range(len(descriptors))
+        env.get_framework_descriptor.side_effect = lambda framework: descriptors[framework]
+        pipeline_configuration = Mock()
+        pipeline_configuration.get_environments.return_value = ["project"]
+        pipeline_configuration.get_environment.return_value = env
+
+        mgr = ToolkitManager()
+        mgr.bundle_download_thread_count = 4
+
+        old_umask = os.umask(0o022)
+        try:
+            mgr._cache_bundles(pipeline_configuration, None, lambda *args: None)
+            self.assertEqual(os.umask(0o022), 0o022)
+        finally:
+            os.umask(old_umask)
+
+        for index in range(len(descriptors)):
+            folder = os.path.join(download_root, "app%s" % index)
+            self.assertEqual(sgtk.util.filesystem.get_permissions(folder), 0o777)
+            self.assertEqual(sgtk.util.filesystem.get_permissions(os.path.join(folder, "v1.0.0")), 0o777)
+            self.assertEqual(
+                sgtk.util.filesystem.get_permissions(os.path.join(folder, "v1.0.0", "info.yml")), 0o666
+            )
+
 
 class _MockedShotgunUser(object):
     """
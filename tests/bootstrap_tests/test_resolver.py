@@ -649,6 +649,59 @@ class TestPipelineLocationFieldPriority(TestResolverBase):
             {"name": "tk-config-test", "type": "app_store", "version": "v3.1.2"}
         )
 
+    def test_pc_latest_descriptors_resolved_at_once(self):
+        """
+        Test that the latest versions of descriptors without a version
+        token are resolved at once.
+        """
+        self._create_pc(
+            "Primary",
+            self._project,
+            plugin_ids="foo.*",
+            descriptor="sgtk:descriptor:app_store?name=tk-config-test"
+        )
+        self._create_pc(
+            "Sandbox",
+            self._project,
+            plugin_ids="foo.*",
+            descriptor="sgtk:descriptor:app_store?name=tk-config-other"
+        )
+
+        def find_latest_versions(descriptors, constraint_patterns=None):
+            return [
+                sgtk.descriptor.create_descriptor(
+                    self.mockgun,
+                    sgtk.descriptor.Descriptor.CONFIG,
+                    dict(descriptor.get_dict(), version="v1.0.0")
+                )
+                for descriptor in descriptors
+            ]
+
+        with patch(
+            "tank.descriptor.io_descriptor.appstore.IODescriptorAppStore.has_remote_access",
+            return_value=True
+        ), patch(
+            "tank.descriptor.io_descriptor.appstore.IODescriptorAppStore.get_latest_version",
+            side_effect=Exception("Descriptors should be resolved at once.")
+        ), patch(
+            "sgtk.descriptor.Descriptor.find_latest_versions",
+            side_effect=find_latest_versions
+        ) as find_latest_versions_mock:
+            pcs = self.resolver.find_matching_pipeline_configurations(
+                pipeline_config_name=None,
+                current_login="john.smith",
+                sg_connection=self.mockgun
+            )
+
+        self.assertEqual(find_latest_versions_mock.call_count, 1)
+        self.assertEqual(
+            sorted(pc["config_descriptor"].get_uri() for pc in pcs),
+            [
+                "sgtk:descriptor:app_store?name=tk-config-other&version=v1.0.0",
+                "sgtk:descriptor:app_store?name=tk-config-test&version=v1.0.0"
+            ]
+        )
+
     def test_pc_uploaded(self):
         """
         Test that uploaded zip field is used when no descriptor or path
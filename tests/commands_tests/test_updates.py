@@ -17,9 +17,12 @@ from __future__ import with_statement
 import os
 import logging
 
+from mock import patch
+
 from tank_test.tank_test_base import TankTestBase, setUpModule # noqa
 
 from tank.platform.environment import InstalledEnvironment
+from tank.descriptor import Descriptor
 
 from tank_test.mock_appstore import TankMockStoreDescriptor, patch_app_store
 
@@ -99,6 +102,25 @@ class TestSimpleUpdates(TankTestBase):
         desc = env.get_framework_descriptor("tk-framework-test_v1.x.x")
         self.assertEqual(desc.version, "v1.1.0")
 
+    def test_latest_versions_resolved_at_once(self):
+        """
+        Test that the latest versions of all the items are resolved at once.
+        """
+        command = self.tk.get_command("updates")
+        command.set_logger(logging.getLogger("/dev/null"))
+        with patch.object(
+            Descriptor, "find_latest_version", side_effect=Exception("Items should be resolved at once.")
+        ), patch.object(
+            Descriptor, "find_latest_versions", wraps=Descriptor.find_latest_versions
+        ) as find_latest_versions_mock:
+            command.execute({"environment_filter": "simple"})
+
+        self.assertEqual(find_latest_versions_mock.call_count, 1)
+
+        env = InstalledEnvironment(os.path.join(self.project_config, "env", "simple.yml"), self.pipeline_configuration)
+        self.assertEqual(env.get_app_descriptor("tk-test", "tk-multi-nodep").version, "v2.0.0")
+        self.assertEqual(env.get_framework_descriptor("tk-framework-test_v1.x.x").version, "v1.1.0")
+
 
 class TestIncludeUpdates(TankTestBase):
     """
@@ -15,6 +15,7 @@ from mock import Mock, patch
 
 import tank
 from tank.api import Tank
+from tank.errors import TankMultipleMatchingTemplatesError
 from tank.template import TemplatePath, TemplateString
 from tank.templatekey import StringKey, IntegerKey, SequenceKey
 
@@ -60,6 +61,65 @@ class TestTemplateFromPath(TankTestBase):
         self.assertIsNotNone(template)
         self.assertIsInstance(template, TemplateString)
 
+    def test_matches_linear_scan(self):
+        """Make sure the template index returns the same templates as validating all of them."""
+        fields = {
+            "Sequence": "Sequence_1",
+            "Shot": "shot_010",
+            "Step": "Anm",
+            "name": "jfk",
+            "version": 3,
+            "Asset": "car",
+            "sg_asset_type": "vehicle",
+            "SEQ": 1001,
+            "width": 1920,
+            "height": 1080,
+        }
+        paths = []
+        for template in self.tk.templates.values():
+            try:
+                paths.append(template.apply_fields(fields))
+            except tank.TankError:
+                pass
+        self.assertTrue(paths)
+        for path in paths:
+            expected = [t for t in self.tk.templates.values() if t.validate(path)]
+            self.assertEqual(expected, self.tk.templates_from_path(path))
+
+        # the batch version should return the same results
+        paths.append(os.path.join(self.project_root, "sequences", "Sequence 1", "shot_010", "Anm", "publish"))
+        paths.append("Nuke Script Name, v002")
+        results = list(self.tk.templates_from_paths(paths))
+        self.assertEqual(paths, [path for path, _ in results])
+        for path, templates in results:
+            self.assertEqual(self.tk.templates_from_path(path), templates)
+
+    def test_modified_templates(self):
+        """Templates added after the index was built must be picked up."""
+        keys = {"name": StringKey("name")}
+        template = TemplatePath("foo/{name}.bar", keys, self.project_root, "foo_template")
+        path = os.path.join(self.project_root, "foo", "something.bar")
+
+        self.assertIsNone(self.tk.template_from_path(path))
+        self.tk.templates[template.name] = template
+        self.assertEqual(template, self.tk.template_from_path(path))
+
+        # replacing a template is picked up as well.
+        other_template = TemplatePath("foo/{name}.bar", keys, self.project_root, "foo_template")
+        self.tk.templates.update({template.name: other_template})
+        self.assertIs(other_template, self.tk.template_from_path(path))
+
+        self.tk.templates = {}
+        self.assertIsNone(self.tk.template_from_path(path))
+
+    def test_ambiguous_path(self):
+        """Multiple templates matching a path should raise."""
+        keys = {"name": StringKey("name"), "other": StringKey("other")}
+        self.tk.templates["foo_name"] = TemplatePath("foo/{name}.bar", keys, self.project_root, "foo_name")
+        self.tk.templates["foo_other"] = TemplatePath("foo/{other}.bar", keys, self.project_root, "foo_other")
+        path = os.path.join(self.project_root, "foo", "something.bar")
+        self.assertRaises(TankMultipleMatchingTemplatesError, self.tk.template_from_path, path)
+
 
 class TestTemplatesLoaded(TankTestBase):
     """Test case for the loading of templates from project level config."""
@@ -303,6 +363,54 @@ class TestAbstractPathsFromTemplate(TankTestBase):
         self.assertEquals(set(expected), set(result))
 
 
+class TestSequencesFromTemplate(TankTestBase):
+    """Tests Tank.sequences_from_template method."""
+    def setUp(self):
+        super(TestSequencesFromTemplate, self).setUp()
+        self.setup_fixtures()
+
+        keys = {"Shot": StringKey("Shot"),
+                "name": StringKey("name"),
+                "SEQ": SequenceKey("SEQ", format_spec="04")}
+
+        definition = "shots/{Shot}/images/{name}.{SEQ}.exr"
+        self.template = TemplatePath(definition, keys, self.project_root)
+
+        self.shot_a_path = os.path.join(self.project_root, "shots", "AAA", "images")
+        self.shot_b_path = os.path.join(self.project_root, "shots", "BBB", "images")
+        for frame in [1, 2, 3, 5, 6, 10]:
+            self.create_file(os.path.join(self.shot_a_path, "filename.%04d.exr" % frame))
+        for frame in [1, 2]:
+            self.create_file(os.path.join(self.shot_a_path, "anothername.%04d.exr" % frame))
+            self.create_file(os.path.join(self.shot_b_path, "filename.%04d.exr" % frame))
+        # files which are not frames of a sequence
+        self.create_file(os.path.join(self.shot_a_path, "filename.%04d.exr"))
+        self.create_file(os.path.join(self.shot_a_path, "filename.v001.exr"))
+
+    def test_all_sequences(self):
+        expected = [(os.path.join(self.shot_a_path, "filename.%04d.exr"), [(1, 3), (5, 6), (10, 10)]),
+                    (os.path.join(self.shot_a_path, "anothername.%04d.exr"), [(1, 2)]),
+                    (os.path.join(self.shot_b_path, "filename.%04d.exr"), [(1, 2)])]
+        result = self.tk.sequences_from_template(self.template, {})
+        self.assertEquals(sorted(expected), sorted(result))
+
+    def test_specify_fields(self):
+        expected = [(os.path.join(self.shot_a_path, "filename.%04d.exr"), [(1, 3), (5, 6), (10, 10)])]
+        result = self.tk.sequences_from_template(self.template, {"Shot": "AAA", "name": "filename"})
+        self.assertEquals(expected, result)
+
+    def test_skip_keys(self):
+        expected = [(os.path.join(self.shot_a_path, "filename.%04d.exr"), [(1, 3), (5, 6), (10, 10)]),
+                    (os.path.join(self.shot_b_path, "filename.%04d.exr"), [(1, 2)])]
+        result = self.tk.sequences_from_template(self.template, {"Shot": "AAA", "name": "filename"},
+                                                 skip_keys=["Shot"])
+        self.assertEquals(sorted(expected), sorted(result))
+
+    def test_no_sequence_key(self):
+        template = TemplatePath("shots/{Shot}/images/{name}.exr", self.template.keys, self.project_root)
+        self.assertRaises(tank.TankError, self.tk.sequences_from_template, template, {})
+
+
 class TestPathsFromTemplateGlob(TankTestBase):
     """Tests for Tank.paths_from_template method which check the string sent to glob.glob."""
     def setUp(self):
@@ -17,6 +17,8 @@ from tank_test.tank_test_base import ShotgunTestBase, temp_env_var
 from tank_test.tank_test_base import setUpModule # noqa
 from tank.template_includes import _get_includes as get_template_includes
 from tank.platform.environment_includes import _resolve_includes as get_environment_includes
+from tank.platform.environment_includes import process_includes as process_environment_includes
+from tank.util.yaml_cache import g_yaml_cache
 from mock import patch
 
 
@@ -181,3 +183,40 @@ class TestEnvironmentIncludes(Includes.Imp):
         if isinstance(includes, str):
             includes = [includes]
         return get_environment_includes(self._file_name, {"includes": includes}, None)
+
+
+class TestEnvironmentIncludesMemoization(ShotgunTestBase):
+    """
+    Tests that processed environment includes are reused until a file changes.
+    """
+
+    def setUp(self):
+        super(TestEnvironmentIncludesMemoization, self).setUp()
+        self._folder = os.path.join(self.tank_temp, "memoized_includes")
+        os.makedirs(self._folder)
+        self._env_file = os.path.join(self._folder, "env.yml")
+        self._include_file = os.path.join(self._folder, "include.yml")
+        self._write(self._env_file, "include: include.yml\nengines: {tk-test: '@engine'}\n")
+        self._write(self._include_file, "engine: {location: v1}\n")
+
+    def _write(self, path, content):
+        with open(path, "w") as fh:
+            fh.write(content)
+
+    def _process_includes(self):
+        data = g_yaml_cache.get(self._env_file, frozen=True)
+        return process_environment_includes(self._env_file, data, None)
+
+    def test_memoization(self):
+        """
+        Make sure results are reused and recomputed when an included file changes.
+        """
+        data = self._process_includes()
+        self.assertEqual(data["engines"], {"tk-test": {"location": "v1"}})
+        self.assertIs(self._process_includes(), data)
+
+        # a different size guarantees the yaml cache detects the change.
+        self._write(self._include_file, "engine: {location: v123}\n")
+        data = self._process_includes()
+        self.assertEqual(data["engines"], {"tk-test": {"location": "v123"}})
+        self.assertIs(self._process_includes(), data)
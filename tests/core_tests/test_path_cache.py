@@ -18,9 +18,13 @@ import StringIO
 import shutil
 import contextlib
 import logging
+import sqlite3
+import threading
 
 from mock import Mock, patch, call
 
+import unittest2 as unittest
+
 from tank_test.tank_test_base import TankTestBase, temp_env_var
 from tank_test.tank_test_base import setUpModule # noqa
 
@@ -370,6 +374,305 @@ class TestGetPaths(TestPathCache):
         self.assertIn(self.project_root, result)
         self.assertIn(self.alt_root_1, result)
 
+class TestLookupCache(TestPathCache):
+    """
+    Tests for the process wide cache of path cache lookups.
+    """
+    def setUp(self):
+        super(TestLookupCache, self).setUp()
+        self.shot_path = os.path.join(self.project_root, "seq", "shot_name")
+        self.shot = {"type": "Shot", "id": 999, "name": "shot_name"}
+        self.step = {"type": "Step", "id": 3, "name": "step_name"}
+
+    def _disconnect(self, pc):
+        """
+        Makes sure any query to the database of a path cache fails.
+        """
+        pc._connection = Mock()
+        pc._connection.cursor.side_effect = AssertionError("Database was queried.")
+
+    def test_repeated_lookups(self):
+        """
+        Lookups made by any path cache instance are served from the cache.
+        """
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        add_item_to_cache(self.path_cache, self.step, self.shot_path, primary=False)
+        expected = (self.path_cache.get_entity(self.shot_path),
+                    self.path_cache.get_secondary_entities(self.shot_path),
+                    self.path_cache.get_paths("Shot", 999, primary_only=True))
+        self.assertEqual(
+            (self.shot, [self.step], [self.shot_path]),
+            expected
+        )
+
+        pc = path_cache.PathCache(self.tk)
+        self._disconnect(pc)
+        self.assertEqual(
+            expected,
+            (pc.get_entity(self.shot_path),
+             pc.get_secondary_entities(self.shot_path),
+             pc.get_paths("Shot", 999, primary_only=True))
+        )
+
+    def test_lookups_in_transaction(self):
+        """
+        Lookups using a cursor of an ongoing transaction are never cached.
+        """
+        self.assertIsNone(self.path_cache.get_entity(self.shot_path))
+        cursor = self.path_cache._connection.cursor()
+        try:
+            self.path_cache._add_db_mapping(cursor, self.shot_path, self.shot, True)
+            self.assertEqual(self.shot, self.path_cache.get_entity(self.shot_path, cursor))
+        finally:
+            self.path_cache._connection.rollback()
+            cursor.close()
+        self.assertIsNone(self.path_cache.get_entity(self.shot_path))
+
+    def test_invalidated_by_writes(self):
+        """
+        Writing to the path cache invalidates the cached lookups.
+        """
+        self.assertIsNone(self.path_cache.get_entity(self.shot_path))
+        self.assertEqual([], self.path_cache.get_paths("Shot", 999, primary_only=False))
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        self.assertEqual(self.shot, self.path_cache.get_entity(self.shot_path))
+        self.assertEqual([self.shot_path], self.path_cache.get_paths("Shot", 999, primary_only=False))
+
+    def test_invalidated_by_other_processes(self):
+        """
+        Changes made to the database by other processes are detected on lookup.
+        """
+        self.assertIsNone(self.path_cache.get_entity(self.shot_path))
+
+        # write to the database without going through the path cache, the
+        # way another process would.
+        connection = sqlite3.connect(self.path_cache_location)
+        try:
+            connection.execute(
+                "INSERT INTO path_cache(entity_type, entity_id, entity_name, root, path, primary_entity) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                ("Shot", 999, "shot_name", "primary", "/seq/shot_name", 1)
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+        self.assertEqual(self.shot, self.path_cache.get_entity(self.shot_path))
+
+    def test_bounded_size(self):
+        """
+        Least recently used lookups are discarded first.
+        """
+        cache = path_cache._LookupCache()
+        cache.MAX_ENTRIES = 2
+        cache.set("db", ("a",), 1)
+        cache.set("db", ("b",), 2)
+        self.assertEqual((True, 1), cache.get("db", ("a",)))
+        cache.set("db", ("c",), 3)
+        self.assertEqual((False, None), cache.get("db", ("b",)))
+        self.assertEqual((True, 1), cache.get("db", ("a",)))
+        self.assertEqual((True, 3), cache.get("db", ("c",)))
+
+
+class TestConnectionPool(TestPathCache):
+    """
+    Tests for the pooling of database connections.
+    """
+
+    def test_reuse_connection(self):
+        """
+        Path caches created in the same thread share their connection.
+        """
+        with patch.object(path_cache.PathCache, "_init_connection") as init_connection:
+            pc = path_cache.PathCache(self.tk)
+            self.assertEqual(self.path_cache._connection, pc._connection)
+            pc.close()
+            self.assertIsNone(pc._connection)
+            # the connection is still usable by other path caches
+            self.assertIsNone(self.path_cache.get_entity(os.path.join(self.project_root, "foo")))
+            self.assertEqual(0, init_connection.call_count)
+
+    def test_close_during_transaction(self):
+        """
+        Closing a path cache doesn't roll back a transaction of another path
+        cache sharing its connection.
+        """
+        entity = {"type": "Shot", "id": 1, "name": "shot"}
+        path = os.path.join(self.project_root, "shot")
+        cursor = self.path_cache._connection.cursor()
+        try:
+            self.path_cache._add_db_mapping(cursor, path, entity, True)
+        finally:
+            cursor.close()
+
+        pc = path_cache.PathCache(self.tk)
+        pc.close()
+
+        self.path_cache._commit()
+        self.assertEqual(entity, self.path_cache.get_entity(path))
+
+    def test_threads(self):
+        """
+        Each thread has its own connection, and the schema is only verified once.
+        """
+        results = Queue.Queue()
+
+        def create_path_cache():
+            pc = path_cache.PathCache(self.tk)
+            results.put(pc._connection)
+            pc.close()
+
+        with patch.object(
+            path_cache.PathCache, "_init_connection", autospec=True,
+            side_effect=path_cache.PathCache._init_connection
+        ) as init_connection:
+            thread = threading.Thread(target=create_path_cache)
+            thread.start()
+            thread.join()
+            self.assertNotEqual(self.path_cache._connection, results.get())
+            self.assertEqual(1, init_connection.call_count)
+            # schema was already verified by the main thread
+            self.assertFalse(init_connection.call_args[0][2])
+
+    def test_replaced_database(self):
+        """
+        A new connection is made and the schema is created if the database is removed.
+        """
+        os.remove(self.path_cache_location)
+        pc = path_cache.PathCache(self.tk)
+        try:
+            self.assertNotEqual(self.path_cache._connection, pc._connection)
+            add_item_to_cache(pc, {"type": "Shot", "id": 1, "name": "shot"}, os.path.join(self.project_root, "shot"))
+        finally:
+            pc.close()
+
+    def test_fork(self):
+        """
+        Connections inherited from a parent process are not reused.
+        """
+        with patch("os.getpid", return_value=os.getpid() + 1):
+            pc = path_cache.PathCache(self.tk)
+            try:
+                self.assertNotEqual(self.path_cache._connection, pc._connection)
+            finally:
+                pc.close()
+
+    def test_close_pooled_connections(self):
+        """
+        Closing the pool closes the connections of the thread.
+        """
+        connection = self.path_cache._connection
+        path_cache.close_pooled_connections()
+        self.assertRaises(sqlite3.ProgrammingError, connection.cursor)
+        self.path_cache = path_cache.PathCache(self.tk)
+        self.assertNotEqual(connection, self.path_cache._connection)
+
+
+class TestGetEntitiesForAncestors(TestPathCache):
+    """
+    Tests for get_entities_for_ancestors.
+    """
+    def setUp(self):
+        super(TestGetEntitiesForAncestors, self).setUp()
+        self.proj = {"type": "Project", "id": self.project["id"], "name": self.project["name"]}
+        self.seq = {"type": "Sequence", "id": 2, "name": "seq"}
+        self.shot = {"type": "Shot", "id": 3, "name": "shot_name"}
+        self.step = {"type": "Step", "id": 4, "name": "step_name"}
+        self.seq_path = os.path.join(self.project_root, "seq")
+        self.shot_path = os.path.join(self.seq_path, "shot_name")
+        self.step_path = os.path.join(self.shot_path, "step_name")
+
+        add_item_to_cache(self.path_cache, self.proj, self.project_root)
+        add_item_to_cache(self.path_cache, self.seq, self.seq_path)
+        add_item_to_cache(self.path_cache, self.shot, self.shot_path)
+        add_item_to_cache(self.path_cache, self.step, self.step_path, primary=False)
+        add_item_to_cache(self.path_cache, self.seq, self.step_path, primary=False)
+
+    def _get_expected(self, path):
+        """
+        Walks up the path the way context_from_path used to.
+        """
+        expected = []
+        curr_path = path
+        while True:
+            expected.append((curr_path,
+                             self.path_cache.get_entity(curr_path),
+                             self.path_cache.get_secondary_entities(curr_path)))
+            if curr_path.lower() in [x.lower() for x in self.path_cache._roots.values()]:
+                break
+            parent_path = os.path.abspath(os.path.join(curr_path, ".."))
+            if curr_path == parent_path:
+                break
+            curr_path = parent_path
+        return expected
+
+    def test_project_path(self):
+        work_path = os.path.join(self.step_path, "work", "file.ma")
+        result = self.path_cache.get_entities_for_ancestors(work_path)
+        self.assertEqual(
+            [(work_path, None, []),
+             (os.path.dirname(work_path), None, []),
+             (self.step_path, None, [self.step, self.seq]),
+             (self.shot_path, self.shot, []),
+             (self.seq_path, self.seq, []),
+             (self.project_root, self.proj, [])],
+            result
+        )
+        # make sure we get the same results from the lookup cache.
+        self.assertEqual(result, self.path_cache.get_entities_for_ancestors(work_path))
+        self.assertEqual(self._get_expected(work_path), result)
+
+    def test_single_query(self):
+        """
+        All the ancestors are looked up with a single query.
+        """
+        path_cache._lookup_cache.clear()
+        with patch.object(self.path_cache, "_connection", wraps=self.path_cache._connection) as connection:
+            self.path_cache.get_entities_for_ancestors(os.path.join(self.step_path, "a", "b", "c"))
+            self.assertEqual(1, connection.cursor.call_count)
+            # all lookups are now cached.
+            self.path_cache.get_entities_for_ancestors(os.path.join(self.step_path, "a"))
+            self.assertEqual(1, connection.cursor.call_count)
+
+    def test_chunked_query(self):
+        """
+        Deep hierarchies are looked up in chunks.
+        """
+        deep_path = os.path.join(self.step_path, *["level_%d" % i for i in range(10)])
+        with patch.object(path_cache.PathCache, "SQLITE_MAX_ITEMS_FOR_IN_STATEMENT", 3):
+            result = self.path_cache.get_entities_for_ancestors(deep_path)
+        self.assertEqual(self._get_expected(deep_path), result)
+
+    def test_non_ascii_path(self):
+        """
+        Unicode paths with non-ascii characters are matched with the
+        entries of the database, which are utf-8 encoded strings.
+        """
+        shot = {"type": "Shot", "id": 5, "name": "sh\xc3\xa9t"}
+        shot_path = os.path.join(self.seq_path, u"sh\xe9t")
+        add_item_to_cache(self.path_cache, shot, shot_path)
+
+        work_path = os.path.join(shot_path, u"w\xf6rk")
+        path_cache._lookup_cache.clear()
+        result = self.path_cache.get_entities_for_ancestors(work_path)
+        self.assertEqual(result[1], (shot_path, shot, []))
+
+        # the other lookups share the entries cached for the paths.
+        with patch.object(self.path_cache, "_connection", wraps=self.path_cache._connection) as connection:
+            self.assertEqual(shot, self.path_cache.get_entity(shot_path))
+            self.assertEqual([], self.path_cache.get_secondary_entities(shot_path))
+            self.assertEqual(0, connection.cursor.call_count)
+
+        self.assertEqual(self._get_expected(work_path), result)
+
+    def test_non_project_path(self):
+        non_project_path = os.path.abspath(os.path.join("path", "not", "in", "project"))
+        self.assertEqual(
+            self._get_expected(non_project_path),
+            self.path_cache.get_entities_for_ancestors(non_project_path)
+        )
+
+
 class Test_SeperateRoots(TestPathCache):
     def test_different_case(self):
         """
@@ -695,6 +998,123 @@ class TestShotgunSync(TankTestBase):
 
 
 
+class TestLocalMirror(TankTestBase):
+    """
+    Tests the path cache kept on the local disk of each machine.
+    """
+
+    def setUp(self):
+        super(TestLocalMirror, self).setUp()
+        self.setup_fixtures()
+
+        self.seq = {"type": "Sequence",
+                    "id": 2,
+                    "code": "seq_code",
+                    "project": self.project}
+        self.shot = {"type": "Shot",
+                     "id": 1,
+                     "code": "shot_code",
+                     "sg_sequence": self.seq,
+                     "project": self.project}
+        self.add_to_sg_mock_db([self.seq, self.shot, self.project])
+
+        patcher = patch.object(
+            self.tk.pipeline_configuration,
+            "get_path_cache_local_mirror_enabled",
+            return_value=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_marker(self):
+        pc = path_cache.PathCache(self.tk)
+        try:
+            c = pc._connection.cursor()
+            marker = list(c.execute("SELECT max(last_id) FROM event_log_sync"))[0][0]
+            c.close()
+        finally:
+            pc.close()
+        return marker
+
+    def _get_last_event_id(self):
+        return self.tk.shotgun.find_one(
+            "EventLogEntry",
+            [["event_type", "in", ["Toolkit_Folders_Create", "Toolkit_Folders_Delete"]]],
+            ["id"],
+            [{"field_name": "id", "direction": "desc"}]
+        )["id"]
+
+    def test_location(self):
+        """
+        Makes sure the path cache is stored in the local cache of the
+        pipeline configuration, regardless of the cache hook.
+        """
+        with patch.object(self.tk, "execute_core_hook_method") as hook_mock:
+            pc = path_cache.PathCache(self.tk)
+            pc.close()
+        self.assertFalse(hook_mock.called)
+
+        expected_root = tank.util.LocalFileStorageManager.get_configuration_root(
+            self.tk.shotgun_url,
+            self.tk.pipeline_configuration.get_project_id(),
+            self.tk.pipeline_configuration.get_plugin_id(),
+            self.tk.pipeline_configuration.get_shotgun_id(),
+            tank.util.LocalFileStorageManager.CACHE
+        )
+        self.assertEqual(pc._path_cache_file, os.path.join(expected_root, "path_cache.db"))
+        self.assertTrue(os.path.exists(pc._path_cache_file))
+
+    def test_add_mappings_keeps_marker(self):
+        """
+        Makes sure folders created locally don't move the sync marker and
+        that the events are replayed by the next sync.
+        """
+        sync_path_cache(self.tk)
+        marker = self._get_marker()
+
+        with patch.object(path_cache._background_synchronizer, "request") as request_mock:
+            folder.process_filesystem_structure(
+                self.tk, self.shot["type"], self.shot["id"], preview=False, engine=None
+            )
+        self.assertEqual(request_mock.call_count, 1)
+
+        # the new folders are available locally straight away.
+        pc = path_cache.PathCache(self.tk)
+        self.assertEqual(request_mock.call_args, call(pc._path_cache_file, self.tk))
+        self.assertEqual(len(pc.get_paths("Shot", self.shot["id"], True)), 1)
+        pc.close()
+
+        self.assertEqual(self._get_marker(), marker)
+        log = sync_path_cache(self.tk)
+        self.assertTrue("Running incremental sync" in log)
+        self.assertEqual(self._get_marker(), self._get_last_event_id())
+
+    def test_background_sync(self):
+        """
+        Makes sure folder creation synchronizes the path cache in the background.
+        """
+        folder.process_filesystem_structure(
+            self.tk, self.shot["type"], self.shot["id"], preview=False, engine=None
+        )
+        path_cache._background_synchronizer.wait()
+        self.assertEqual(self._get_marker(), self._get_last_event_id())
+        self.assertEqual(path_cache._background_synchronizer._threads, {})
+
+    def test_no_full_sync_in_background(self):
+        """
+        Makes sure a full sync is left to the next foreground synchronization.
+        """
+        pc = path_cache.PathCache(self.tk)
+        try:
+            # without a sync marker, a full sync is required.
+            pc._connection.execute("DELETE FROM event_log_sync")
+            pc._commit()
+            self.assertEqual(pc._synchronize(full_sync=False, allow_full_sync=False), [])
+        finally:
+            pc.close()
+        self.assertEqual(self._get_marker(), None)
+
+
 class TestConcurrentShotgunSync(TankTestBase):
     """
     Tests that the path cache can gracefully handle multiple
@@ -1345,3 +1765,163 @@ class TestPathCacheBatchOperation(TankTestBase):
 
         # we expect eight return values from find()
         self.assertEquals(entities, ["dummy_data"] * 8)
+
+
+class TestFullSyncBulkImport(TankTestBase):
+    """
+    Tests importing all the FilesystemLocation entities at once during a full sync.
+    """
+
+    def setUp(self):
+        super(TestFullSyncBulkImport, self).setUp()
+        self._pc = path_cache.PathCache(self.tk)
+
+        shot_1 = {"type": "Shot", "id": 1, "name": "shot_1"}
+        shot_2 = {"type": "Shot", "id": 2, "name": "shot_2"}
+        step = {"type": "Step", "id": 3, "name": "step"}
+        self._fsl_entities = [
+            self._make_fsl_entity(10, shot_1, "shot_1", True),
+            # duplicate primary entry
+            self._make_fsl_entity(11, shot_1, "shot_1", True),
+            self._make_fsl_entity(12, shot_2, "shot_2", True),
+            self._make_fsl_entity(13, step, "shot_2", False),
+            # duplicate secondary entry
+            self._make_fsl_entity(14, step, "shot_2", False),
+            # secondary entry for a path the entity is already associated with
+            self._make_fsl_entity(15, shot_2, "shot_2", False),
+            self._make_fsl_entity(16, step, "shot_1/step", True),
+        ]
+
+    def tearDown(self):
+        self._pc.close()
+        super(TestFullSyncBulkImport, self).tearDown()
+
+    def _make_fsl_entity(self, fsl_id, entity, relative_path, is_primary):
+        path = os.path.join(self.project_root, relative_path)
+        return {
+            "type": path_cache.SHOTGUN_ENTITY,
+            "id": fsl_id,
+            path_cache.SG_ENTITY_ID_FIELD: entity["id"],
+            path_cache.SG_ENTITY_TYPE_FIELD: entity["type"],
+            path_cache.SG_ENTITY_NAME_FIELD: entity["name"],
+            path_cache.SG_IS_PRIMARY_FIELD: is_primary,
+            path_cache.SG_METADATA_FIELD: None,
+            path_cache.SG_PATH_FIELD: {
+                "local_storage": {"type": "LocalStorage", "id": 1, "name": "primary"},
+                "local_path_linux": path,
+                "local_path_mac": path,
+                "local_path_windows": path,
+            }
+        }
+
+    def _get_rows(self):
+        return sorted(self._pc._connection.execute(
+            "SELECT entity_type, entity_id, entity_name, root, path, primary_entity, shotgun_id "
+            "FROM path_cache JOIN shotgun_status ON path_cache.rowid = shotgun_status.path_cache_id"
+        ))
+
+    def test_matches_serial_import(self):
+        """
+        Makes sure bulk importing entities gives the same result as importing them one by one.
+        """
+        cursor = self._pc._connection.cursor()
+        cursor.execute("DELETE FROM shotgun_status")
+        cursor.execute("DELETE FROM path_cache")
+        serial_data = []
+        for fsl_entity in self._fsl_entities:
+            imported_data = self._pc._import_filesystem_location_entry(cursor, fsl_entity)
+            if imported_data:
+                serial_data.append(imported_data)
+        cursor.close()
+        self._pc._commit()
+        serial_rows = self._get_rows()
+        self.assertEqual(len(serial_rows), 4)
+
+        # duplicates are detected across pages.
+        pages = [self._fsl_entities[:3], self._fsl_entities[3:5], self._fsl_entities[5:]]
+        bulk_data = self._pc._bulk_import_filesystem_location_entries(self._pc._connection, pages, 42)
+        self.assertEqual(bulk_data, serial_data)
+        self.assertEqual(self._get_rows(), serial_rows)
+        self.assertEqual(list(self._pc._connection.execute("SELECT last_id FROM event_log_sync")), [(42,)])
+
+        # indices were rebuilt
+        index_names = set(
+            row[0] for row in self._pc._connection.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        )
+        for index_name, _ in path_cache.PathCache.BULK_IMPORT_INDICES:
+            self.assertIn(index_name, index_names)
+
+    def test_conflicting_primary_entities(self):
+        """
+        Makes sure the database is left untouched when a path has several primary entities.
+        """
+        self._pc._bulk_import_filesystem_location_entries(self._pc._connection, [self._fsl_entities], 42)
+        rows = self._get_rows()
+
+        conflict = self._make_fsl_entity(20, {"type": "Shot", "id": 5, "name": "shot_5"}, "shot_1", True)
+        self.assertRaises(
+            tank.TankError,
+            self._pc._bulk_import_filesystem_location_entries,
+            self._pc._connection,
+            [self._fsl_entities, [conflict]],
+            43
+        )
+        self.assertEqual(self._get_rows(), rows)
+        self.assertEqual(list(self._pc._connection.execute("SELECT last_id FROM event_log_sync")), [(42,)])
+
+    def test_progress(self):
+        """
+        Makes sure progress is reported while processing entities.
+        """
+        with patch.object(path_cache.PathCache, "BULK_IMPORT_PROGRESS_INTERVAL", 2):
+            with patch("tank.path_cache.show_global_busy") as busy_mock:
+                self._pc._bulk_import_filesystem_location_entries(self._pc._connection, [self._fsl_entities], 42)
+        self.assertEqual(busy_mock.call_count, 3)
+
+    def test_paging(self):
+        """
+        Makes sure entities are retrieved from Shotgun one page at a time.
+        """
+        def find_page(entity_type, filters, fields, order, limit):
+            last_id = filters[1][2]
+            return [e for e in self._fsl_entities if e["id"] > last_id][:limit]
+
+        with patch.object(path_cache.PathCache, "FULL_SYNC_PAGE_SIZE", 3):
+            with patch.object(self.tk.shotgun, "find", side_effect=find_page) as find_mock:
+                pages = self._pc._iter_filesystem_location_pages()
+                # nothing is retrieved until the pages are consumed.
+                self.assertEqual(find_mock.call_count, 0)
+                self.assertEqual(
+                    [[e["id"] for e in page] for page in pages],
+                    [[10, 11, 12], [13, 14, 15], [16]]
+                )
+
+        self.assertEqual(
+            [c[0][1][1] for c in find_mock.call_args_list],
+            [["id", "greater_than", 0], ["id", "greater_than", 12], ["id", "greater_than", 15]]
+        )
+
+    @unittest.skipIf(sys.platform == "win32", "Opened files can't be replaced on Windows")
+    def test_swap_database(self):
+        """
+        Makes sure a full sync can replace the database file with a new one.
+        """
+        self.setup_fixtures()
+        seq = {"type": "Sequence", "id": 2, "code": "seq_code", "project": self.project}
+        self.add_to_sg_mock_db([seq, self.project])
+        folder.process_filesystem_structure(self.tk, seq["type"], seq["id"], preview=False, engine=None)
+        seq_path = os.path.join(self.project_root, "sequences", "seq_code")
+
+        path_cache_file = self._pc._path_cache_file
+        inode = os.stat(path_cache_file).st_ino
+        with patch.object(path_cache.PathCache, "FULL_SYNC_SWAP_DATABASE", True):
+            self._pc.synchronize(full_sync=True)
+
+        self.assertNotEqual(os.stat(path_cache_file).st_ino, inode)
+        self.assertFalse(os.path.exists("%s.%d.tmp" % (path_cache_file, os.getpid())))
+        self.assertEqual(self._pc.get_paths("Sequence", 2, primary_only=True), [seq_path])
+
+        # other path caches use the new database.
+        pc = path_cache.PathCache(self.tk)
+        self.assertEqual(pc.get_entity(seq_path)["id"], 2)
+        pc.close()
@@ -336,6 +336,10 @@ class TestConfigLocations(TankTestBase):
             pc._get_yaml_cache_location(),
             os.path.join(autogen_files_root, "yaml_cache.pickle")
         )
+        self.assertEqual(
+            pc._get_yaml_cache_file_location(),
+            os.path.join(autogen_files_root, "yaml_cache.bin")
+        )
         self.assertEqual(
             pc._get_pipeline_config_file_location(),
             os.path.join(autogen_files_root, "config", "core", "pipeline_configuration.yml")
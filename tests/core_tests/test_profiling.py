@@ -0,0 +1,132 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import os
+import json
+
+import sgtk
+
+from tank_test.tank_test_base import setUpModule # noqa
+from tank_test.tank_test_base import ShotgunTestBase
+
+
+class TestProfiler(ShotgunTestBase):
+    """Tests the Profiler interface."""
+
+    def setUp(self):
+        super(TestProfiler, self).setUp()
+        self.profiler = sgtk.Profiler()
+        original_enabled = self.profiler.enabled
+        self.addCleanup(setattr, self.profiler, "enabled", original_enabled)
+        self.addCleanup(self.profiler.clear)
+        self.profiler.clear()
+
+    def test_singleton(self):
+        """
+        Ensures that all profiler instances share the same state.
+        """
+        self.assertIs(sgtk.Profiler(), self.profiler)
+
+    def test_disabled(self):
+        """
+        Ensures that nothing is recorded when profiling is disabled.
+        """
+        self.profiler.enabled = False
+        with self.profiler.timer("test", "foo"):
+            pass
+        self.assertEqual(self.profiler.get_stats(), {})
+
+    def test_stats(self):
+        """
+        Ensures that calls and time spent are recorded for each operation.
+        """
+        self.profiler.enabled = True
+        for _ in range(3):
+            with self.profiler.timer("test", "foo"):
+                pass
+        with self.assertRaises(ValueError):
+            with self.profiler.timer("test", "bar"):
+                raise ValueError()
+
+        stats = self.profiler.get_stats()
+        self.assertEqual(sorted(stats.keys()), [("test", "bar"), ("test", "foo")])
+        self.assertEqual(stats[("test", "foo")][0], 3)
+        self.assertEqual(stats[("test", "bar")][0], 1)
+        self.assertGreaterEqual(stats[("test", "foo")][1], 0)
+
+        self.profiler.clear()
+        self.assertEqual(self.profiler.get_stats(), {})
+
+    def test_timed(self):
+        """
+        Ensures that decorated functions and functions timed by the log
+        manager are recorded.
+        """
+        @sgtk.Profiler.timed("test")
+        def timed_function():
+            return 1
+
+        @sgtk.LogManager.log_timing
+        def log_timed_function():
+            return 2
+
+        self.profiler.enabled = True
+        self.assertEqual(timed_function(), 1)
+        self.assertEqual(log_timed_function(), 2)
+
+        stats = self.profiler.get_stats()
+        self.assertEqual(stats[("test", "%s.timed_function" % __name__)][0], 1)
+        self.assertEqual(stats[("stopwatch", "%s.log_timed_function" % __name__)][0], 1)
+
+    def test_hooks(self):
+        """
+        Ensures that loading and executing hooks is recorded.
+        """
+        hook_path = os.path.join(self.tank_temp, "profiled_hook.py")
+        with open(hook_path, "w") as fh:
+            fh.write(
+                "import sgtk\n"
+                "class ProfiledHook(sgtk.Hook):\n"
+                "    def execute(self):\n"
+                "        return True\n"
+            )
+
+        self.profiler.enabled = True
+        sgtk.hook.clear_hooks_cache()
+        self.assertTrue(sgtk.hook.execute_hook(hook_path, None))
+        self.assertTrue(sgtk.hook.execute_hook(hook_path, None))
+
+        stats = self.profiler.get_stats()
+        self.assertEqual(stats[("hook.load", hook_path)][0], 1)
+        self.assertEqual(stats[("hook.execute", "ProfiledHook.execute")][0], 2)
+
+    def test_chrome_trace(self):
+        """
+        Ensures that the recorded events can be written as a Chrome trace.
+        """
+        self.profiler.enabled = True
+        with self.profiler.timer("test", "foo"):
+            pass
+        with self.profiler.timer("test", "bar"):
+            pass
+
+        trace_path = os.path.join(self.tank_temp, "trace.json")
+        self.profiler.write_chrome_trace(trace_path)
+        with open(trace_path) as fh:
+            trace = json.load(fh)
+
+        events = trace["traceEvents"]
+        self.assertEqual([event["name"] for event in events], ["foo", "bar"])
+        for event in events:
+            self.assertEqual(event["cat"], "test")
+            self.assertEqual(event["ph"], "X")
+            self.assertEqual(event["pid"], os.getpid())
+            self.assertGreaterEqual(event["ts"], 0)
+            self.assertGreaterEqual(event["dur"], 0)
@@ -17,6 +17,7 @@ import tank
 from tank import TankError
 
 from tank.template import TemplatePath
+from tank.template_path_parser import TemplatePathParser
 from tank_test.tank_test_base import ShotgunTestBase, setUpModule # noqa
 from tank.templatekey import (StringKey, IntegerKey, SequenceKey)
 
@@ -1096,6 +1097,157 @@ class TestGetKeysSepInValue(TestTemplatePath):
         self.assert_path_matches(definition, input_path, expected)        
 
 
+class TestCompiledParser(TestTemplatePath):
+    """
+    Tests for the regular expression based parser used by get_fields.
+    """
+
+    def _assert_same_fields(self, template, input_path, skip_keys=None):
+        """
+        Checks that the compiled parsers return the same fields as the recursive parser.
+        """
+        for parser, ordered_keys, static_tokens in zip(
+            template._get_path_parsers(), template._ordered_keys, template._static_tokens
+        ):
+            expected = TemplatePathParser(ordered_keys, static_tokens).parse_path(input_path, skip_keys)
+            fields, _ = parser.parse_path(input_path, skip_keys)
+            self.assertEqual(expected, fields)
+
+    def test_unambiguous_layout(self):
+        """
+        Keys which can't contain the token that follows them are compiled.
+        """
+        definition = "shots/{Sequence}/{Step}/work/{branch}.v{version}.{seq_num}.ma"
+        template = TemplatePath(definition, self.keys, self.project_root)
+        self.assertTrue(all(p._regex is not None for p in template._get_path_parsers()))
+
+        relative_path = os.path.join("shots", "seq_1", "Anm", "work", "main.v003.%d.ma")
+        input_path = os.path.join(self.project_root, relative_path)
+        expected = {"Sequence": "seq_1",
+                    "Step": "Anm",
+                    "branch": "main",
+                    "version": 3,
+                    "seq_num": "%d"}
+        self.assertEqual(expected, template.get_fields(input_path))
+        self._assert_same_fields(template, input_path)
+
+        for relative_path in [
+            os.path.join("shots", "seq_1", "Anm", "work", "ma_in.v003.%d.ma"),
+            os.path.join("shots", "seq_1", "Anm", "work", "main.v3.1.ma"),
+            os.path.join("shots", "seq_1", "Anm", "work", "main.v003.1.ma.ma"),
+            os.path.join("shots", "seq_1", "Anm", "other", "main.v003.1.ma"),
+        ]:
+            input_path = os.path.join(self.project_root, relative_path)
+            self.assertRaises(TankError, template.get_fields, input_path)
+            self._assert_same_fields(template, input_path)
+
+    def test_ambiguous_layout(self):
+        """
+        Keys which can contain the token that follows them fall back to the recursive parser.
+        """
+        definition = "build/maya/{name}_{Step}.ext"
+        template = TemplatePath(definition, self.keys, self.project_root)
+        self.assertTrue(all(p._regex is None for p in template._get_path_parsers()))
+
+        input_path = os.path.join(self.project_root, "build", "maya", "cat_man_doogle.ext")
+        self._assert_same_fields(template, input_path)
+
+    def test_skip_keys(self):
+        """
+        Skipped keys are not validated and fall back to the recursive parser.
+        """
+        definition = "shots/{Sequence}/{branch}.v{version}.ma"
+        template = TemplatePath(definition, self.keys, self.project_root)
+        input_path = os.path.join(self.project_root, "shots", "seq_1", "not_alpha.v001.ma")
+        self.assertEqual(
+            {"Sequence": "seq_1", "version": 1},
+            template.get_fields(input_path, skip_keys=["branch"])
+        )
+        self._assert_same_fields(template, input_path, skip_keys=["branch"])
+
+    def test_optional_keys(self):
+        """
+        Each definition variation gets its own parser.
+        """
+        definition = "shots/{Sequence}/{branch}[.v{version}].ma"
+        template = TemplatePath(definition, self.keys, self.project_root)
+        self.assertEqual(2, len(template._get_path_parsers()))
+        for file_name, expected in [
+            ("main.v002.ma", {"Sequence": "seq_1", "branch": "main", "version": 2}),
+            ("main.ma", {"Sequence": "seq_1", "branch": "main"}),
+        ]:
+            input_path = os.path.join(self.project_root, "shots", "seq_1", file_name)
+            self.assertEqual(expected, template.get_fields(input_path))
+            self._assert_same_fields(template, input_path)
+
+
+class TestGetFieldsMany(TestTemplatePath):
+    """
+    Tests for extracting fields from many paths in one pass.
+    """
+
+    def test_matches_get_fields(self):
+        """
+        Results should be identical to calling get_fields on each path.
+        """
+        definition = "shots/{Sequence}/{Shot}/{Step}/work/{Shot}.{branch}[.v{version}].{snapshot}.ma"
+        template = TemplatePath(definition, self.keys, self.project_root)
+        input_paths = []
+        for step in ["Anm", "Lgt"]:
+            for file_name in ["shot_1.mmm.v003.002.ma",
+                              "shot_1.mmm.002.ma",
+                              "shot_1.m_m.v003.002.ma",
+                              "shot_2.mmm.v003.002.ma",
+                              "..",
+                              "other.txt"]:
+                input_paths.append(os.path.join(self.project_root, "shots", "seq_1", "shot_1", step, "work", file_name))
+        input_paths.append(os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work"))
+        input_paths.append(self.project_root + "//shots/seq_1/./shot_1/Anm/work/shot_1.mmm.v003.002.ma")
+
+        results = list(template.get_fields_many(input_paths))
+        self.assertEqual(input_paths, [path for path, _ in results])
+        for input_path, fields in results:
+            try:
+                expected = template.get_fields(input_path)
+            except TankError:
+                expected = None
+            self.assertEqual(expected, fields)
+
+        self.assertEqual(
+            {"Sequence": "seq_1", "Shot": "shot_1", "Step": "Lgt", "branch": "mmm", "version": 3, "snapshot": 2},
+            results[6][1]
+        )
+        self.assertEqual(results[0][1], results[-1][1])
+
+    def test_skip_keys(self):
+        input_paths = [
+            os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work", "shot_1.mmm.v003.002.ma"),
+            os.path.join(self.project_root, "shots", "seq_1", "shot_1", "Anm", "work", "shot_1.mmm.v003.xxx.ma"),
+        ]
+        results = [fields for _, fields in self.template_path.get_fields_many(input_paths, skip_keys=["snapshot"])]
+        expected = {"Sequence": "seq_1", "Shot": "shot_1", "Step": "Anm", "branch": "mmm", "version": 3}
+        self.assertEqual([expected, expected], results)
+
+    def test_generator(self):
+        """
+        Paths are consumed as results are requested.
+        """
+        template = TemplatePath("images/seq.{frame}.ext", self.keys, self.project_root)
+        first_path = os.path.join(self.project_root, "images", "seq.0001.ext")
+
+        def input_paths():
+            # never ending sequence of frames
+            frame = 1
+            while True:
+                yield os.path.join(self.project_root, "images", "seq.%04d.ext" % frame)
+                frame += 1
+
+        results = template.get_fields_many(input_paths())
+        self.assertEqual((first_path, {"frame": 1}), next(results))
+        self.assertEqual({"frame": 2}, next(results)[1])
+        self.assertEqual({"frame": 3}, next(results)[1])
+
+
 class TestParent(TestTemplatePath):
     def test_parent_exists(self):
         expected_definition = os.path.join("shots",
@@ -194,6 +194,16 @@ class TestGetFields(TestTemplateString):
         result = template_string.get_fields(input_string)
         self.assertEquals(expected, result)
     
+    def test_get_fields_many(self):
+        input_strings = ["something-shot_1.Seq_12", "shot_1.", "something-shot_2.Seq_12"]
+        expected = [
+            ("something-shot_1.Seq_12", {"Shot": "shot_1", "Sequence": "Seq_12"}),
+            ("shot_1.", None),
+            ("something-shot_2.Seq_12", {"Shot": "shot_2", "Sequence": "Seq_12"}),
+        ]
+        result = list(self.template_string.get_fields_many(input_strings))
+        self.assertEquals(expected, result)
+
     #TODO this won't pass with current algorithm
 #    def test_definition_short_end_key(self):
 #        """Tests case when input string longer than definition which ends with key."""
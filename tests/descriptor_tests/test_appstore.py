@@ -16,6 +16,8 @@ from __future__ import with_statement
 
 import os
 import json
+import time
+import datetime
 
 from mock import patch
 
@@ -349,3 +351,134 @@ class TestAppStoreConnectivity(ShotgunTestBase):
         # Test present inactive (again)
         os.environ[env_var_name] = "0"
         self._helper_test_disabling_access_to_app_store(shotgun_mock, True)
+
+
+class TestAppStoreMetadataCache(ShotgunTestBase):
+    """
+    Tests the resolution of the latest versions of app store descriptors in
+    batches, and the caching of the app store records.
+    """
+
+    def setUp(self):
+        """
+        Enables the app store metadata cache and clears it.
+        """
+        super(TestAppStoreMetadataCache, self).setUp()
+
+        # work around the app store connection lookup loops to just use std mockgun instance to mock the app store
+        patcher = patch(
+            "tank.descriptor.io_descriptor.appstore.IODescriptorAppStore._IODescriptorAppStore__create_sg_app_store_connection",
+            return_value=(self.mockgun, None)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch.dict(os.environ, {"SHOTGUN_APPSTORE_METADATA_TTL": "300"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        cache_file = os.path.join(
+            sgtk.util.LocalFileStorageManager.get_site_root(
+                self.mockgun.base_url, sgtk.util.LocalFileStorageManager.CACHE
+            ),
+            "app_store_metadata.pickle"
+        )
+        if os.path.exists(cache_file):
+            os.remove(cache_file)
+        sgtk.descriptor.io_descriptor.AppStoreMetadataCache.clear()
+        self.addCleanup(sgtk.descriptor.io_descriptor.AppStoreMetadataCache.clear)
+
+        self._updated_at = datetime.datetime(2018, 1, 1)
+        self._bundles = [
+            {"type": "CustomNonProjectEntity13", "id": 1, "sg_system_name": "tk-framework-a",
+             "sg_status_list": "prod", "sg_deprecation_message": None, "updated_at": self._updated_at},
+            {"type": "CustomNonProjectEntity13", "id": 2, "sg_system_name": "tk-framework-b",
+             "sg_status_list": "prod", "sg_deprecation_message": None, "updated_at": self._updated_at},
+        ]
+        self._versions = []
+        for (version_id, bundle, code) in [
+            (13, self._bundles[1], "v2.0.0"),
+            (12, self._bundles[0], "v1.1.0"),
+            (11, self._bundles[1], "v1.2.0"),
+            (10, self._bundles[0], "v1.0.0"),
+        ]:
+            self._versions.append({
+                "type": "CustomNonProjectEntity09", "id": version_id, "code": code, "tags": [],
+                "sg_status_list": "prod", "description": None, "sg_detailed_release_notes": None,
+                "sg_documentation": None, "sg_payload": {}, "sg_tank_framework": bundle,
+                "updated_at": self._updated_at
+            })
+
+    def _find(self, entity_type, filters, fields=None, **kwargs):
+        """
+        Mock of Shotgun.find, serving the bundles and versions of the test.
+        """
+        updated_since = ([f[2] for f in filters if f[0] == "updated_at"] or [None])[0]
+        records = self._bundles if entity_type == "CustomNonProjectEntity13" else self._versions
+        return [
+            record for record in records
+            if updated_since is None or record["updated_at"] > updated_since
+        ]
+
+    def _create_descriptor(self, name):
+        return create_descriptor(
+            self.mockgun,
+            Descriptor.FRAMEWORK,
+            {"name": name, "version": "v1.0.0", "type": "app_store"}
+        )
+
+    @patch("tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find")
+    def test_batch_and_cache(self, find_mock):
+        """
+        Tests that latest versions are resolved with one query per entity
+        type and that the records are reused until they expire and change.
+        """
+        find_mock.side_effect = self._find
+        descriptors = [self._create_descriptor("tk-framework-a"), self._create_descriptor("tk-framework-b")]
+
+        def find_latest_versions():
+            return [
+                d.version for d in Descriptor.find_latest_versions(descriptors, [None, "v1.x.x"])
+            ]
+
+        self.assertEqual(find_latest_versions(), ["v1.1.0", "v1.2.0"])
+        self.assertEqual(find_mock.call_count, 2)
+
+        # the records are cached, in memory and on disk.
+        self.assertEqual(find_latest_versions(), ["v1.1.0", "v1.2.0"])
+        self.assertEqual(descriptors[1].find_latest_version().version, "v2.0.0")
+        sgtk.descriptor.io_descriptor.AppStoreMetadataCache.clear()
+        self.assertEqual(find_latest_versions(), ["v1.1.0", "v1.2.0"])
+        self.assertEqual(find_mock.call_count, 2)
+
+        # once expired, the records are only checked for updates if they haven't changed.
+        now = time.time() + 1000
+        with patch("time.time", return_value=now):
+            self.assertEqual(find_latest_versions(), ["v1.1.0", "v1.2.0"])
+            self.assertEqual(find_mock.call_count, 4)
+            self.assertEqual(find_latest_versions(), ["v1.1.0", "v1.2.0"])
+            self.assertEqual(find_mock.call_count, 4)
+
+        # and fetched again if they have.
+        self._versions.insert(0, dict(
+            self._versions[1], id=14, code="v1.2.0", updated_at=datetime.datetime(2018, 2, 1)
+        ))
+        with patch("time.time", return_value=now + 1000):
+            self.assertEqual(find_latest_versions(), ["v1.2.0", "v1.2.0"])
+            self.assertEqual(find_mock.call_count, 8)
+
+        # deleted versions don't update anything, but are detected as well.
+        del self._versions[0]
+        with patch("time.time", return_value=now + 2000):
+            self.assertEqual(find_latest_versions(), ["v1.1.0", "v1.2.0"])
+            self.assertEqual(find_mock.call_count, 12)
+
+    @patch("tank_vendor.shotgun_api3.lib.mockgun.Shotgun.find")
+    def test_missing_bundle(self, find_mock):
+        """
+        Tests that resolving a bundle missing from the app store fails.
+        """
+        find_mock.side_effect = self._find
+        descriptors = [self._create_descriptor("tk-framework-a"), self._create_descriptor("tk-framework-c")]
+        with self.assertRaisesRegex(sgtk.descriptor.TankDescriptorError, "tk-framework-c"):
+            Descriptor.find_latest_versions(descriptors)
@@ -10,6 +10,9 @@
 
 from __future__ import with_statement
 import os
+import threading
+
+import mock
 
 from tank_test.tank_test_base import ShotgunTestBase, temp_env_var
 from tank_test.tank_test_base import setUpModule # noqa
@@ -227,3 +230,77 @@ class TestIODescriptors(ShotgunTestBase):
 
         self.assertEqual(d.get_path(), bundle_path)
         self.assertEqual(d.find_latest_cached_version(), d)
+
+    def test_bundle_cache_index(self):
+        """
+        Tests that bundles are checked against listings of the bundle cache
+        folders while a bundle cache snapshot is active.
+        """
+        sg = self.mockgun
+        root = os.path.join(self.project_root, "index_cache_root")
+        fallback_root = os.path.join(self.project_root, "index_fallback_root")
+        BundleCacheIndex = sgtk.descriptor.io_descriptor.BundleCacheIndex
+
+        def create_descriptor(version):
+            return sgtk.descriptor.create_descriptor(
+                sg,
+                sgtk.descriptor.Descriptor.APP,
+                {"type": "app_store", "version": version, "name": "tk-bundle"},
+                bundle_cache_root_override=root,
+                fallback_roots=[fallback_root]
+            )
+
+        def create_bundle(version):
+            bundle_path = os.path.join(root, "app_store", "tk-bundle", version)
+            os.makedirs(bundle_path)
+            with open(os.path.join(bundle_path, "info.yml"), "wt") as fh:
+                fh.write("test data\n")
+            return bundle_path
+
+        d = create_descriptor("v1.1.1")
+        d2 = create_descriptor("v1.2.0")
+        bundle_path = create_bundle("v1.1.1")
+
+        io_descriptor_class = type(d._io_descriptor)
+        exists_local = io_descriptor_class._exists_local
+        isdir = os.path.isdir
+        with mock.patch.object(
+            io_descriptor_class,
+            "_exists_local",
+            autospec=True,
+            side_effect=lambda io_descriptor, path: exists_local(io_descriptor, path)
+        ) as exists_local_mock, mock.patch(
+            "os.path.isdir", side_effect=isdir
+        ) as isdir_mock:
+            with BundleCacheIndex.snapshot():
+                for _ in range(2):
+                    self.assertTrue(d.exists_local())
+                    self.assertEqual(d.get_path(), bundle_path)
+                    self.assertFalse(d2.exists_local())
+
+                # only the bundle found in the listings is checked on disk, once,
+                # and its folder is known to exist from the listing.
+                self.assertEqual(exists_local_mock.call_count, 1)
+                self.assertNotIn(mock.call(bundle_path), isdir_mock.call_args_list)
+
+                # the snapshot is only used by the thread which opened it.
+                thread = threading.Thread(target=d2.exists_local)
+                thread.start()
+                thread.join()
+                self.assertGreater(exists_local_mock.call_count, 1)
+                exists_local_mock.reset_mock()
+                self.assertFalse(d2.exists_local())
+                self.assertEqual(exists_local_mock.call_count, 0)
+
+                # the snapshot doesn't see bundles created by other processes...
+                bundle_path2 = create_bundle("v1.2.0")
+                self.assertFalse(d2.exists_local())
+
+                # ...but is updated with the bundles downloaded by this one.
+                BundleCacheIndex.add(bundle_path2)
+                self.assertTrue(d2.exists_local())
+
+            # outside of snapshots, bundles are always checked on disk.
+            call_count = exists_local_mock.call_count
+            self.assertTrue(d2.exists_local())
+            self.assertGreater(exists_local_mock.call_count, call_count)
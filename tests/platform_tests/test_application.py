@@ -11,6 +11,7 @@
 from __future__ import with_statement
 
 import sys
+import copy
 import os
 import StringIO
 import shutil
@@ -255,6 +256,42 @@ class TestGetSetting(TestApplication):
             self.app.get_setting("test_default_syntax_with_new_style_engine_specific_hook_sparse")
         )
 
+    def test_resolved_settings(self):
+        """
+        Tests that settings are only resolved once, unless they are computed by a hook.
+        """
+        resolve_setting_value = tank.platform.bundle.resolve_setting_value
+        with mock.patch("tank.platform.bundle.resolve_setting_value", wraps=resolve_setting_value) as resolve_mock:
+            test_list = self.app.get_setting("test_simple_list")
+            self.assertEqual(self.app.get_setting("test_simple_list"), test_list)
+            self.assertEqual(resolve_mock.call_count, 1)
+            self.assertEqual(self.app._resolved_settings_hits, 1)
+
+            # returned values are read-only and shared, copies can be modified.
+            self.assertIs(self.app.get_setting("test_simple_list"), test_list)
+            self.assertRaises(TypeError, test_list.append, "z")
+            test_list = copy.deepcopy(test_list)
+            test_list.append("z")
+            self.assertNotEqual(self.app.get_setting("test_simple_list"), test_list)
+            self.assertEqual(resolve_mock.call_count, 1)
+
+            # procedural settings are always resolved
+            self.app.get_setting("test_str_evaluator")
+            self.app.get_setting("test_str_evaluator")
+            self.assertEqual(resolve_mock.call_count, 3)
+
+            # so are settings that depend on the default passed by the caller.
+            self.assertEqual(self.app.get_setting("test_unknown", 1), 1)
+            self.assertEqual(self.app.get_setting("test_unknown", 2), 2)
+            self.assertEqual(resolve_mock.call_count, 5)
+
+            # settings are resolved again once they change.
+            self.app._set_settings(self.app.settings)
+            self.assertEqual(self.app._resolved_settings_hits, 0)
+            self.app.get_setting("test_simple_list")
+            self.assertEqual(resolve_mock.call_count, 6)
+
+
 class TestExecuteHookByName(TestApplication):
     """
     Tests execute_hook_by_name
@@ -568,6 +605,58 @@ class TestHookCache(TestApplication):
             self.engine.destroy()
             self.assertEqual(clear_mock.call_count, 1)
 
+    def test_hook_chains(self):
+        """
+        Check that hook chains are only resolved and loaded once and that
+        stateless hook instances are reused.
+        """
+        tank.hook.clear_hooks_cache()
+        app = self.engine.apps["test_app"]
+
+        resolve_hook_expression = tank.platform.bundle.TankBundle._TankBundle__resolve_hook_expression
+        execute_hook_instance_method = tank.hook.execute_hook_instance_method
+        with mock.patch(
+            "tank.hook.load_plugin", wraps=tank.hook.load_plugin
+        ) as load_mock, mock.patch.object(
+            tank.platform.bundle.TankBundle,
+            "_TankBundle__resolve_hook_expression",
+            autospec=True,
+            side_effect=resolve_hook_expression
+        ) as resolve_mock, mock.patch(
+            "tank.hook.execute_hook_instance_method", wraps=execute_hook_instance_method
+        ) as execute_mock:
+            self.assertTrue(app.execute_hook("test_hook_std", dummy_param=True))
+            self.assertTrue(app.execute_hook_method("test_hook_std", "second_method", another_dummy_param=True))
+            self.assertEqual(load_mock.call_count, 1)
+            self.assertEqual(resolve_mock.call_count, 1)
+            first_instance = execute_mock.call_args_list[0][0][0]
+            self.assertIs(execute_mock.call_args_list[1][0][0], first_instance)
+
+            # an instance holding state is not reused.
+            first_instance.some_state = True
+            app.execute_hook("test_hook_std", dummy_param=True)
+            self.assertIs(execute_mock.call_args[0][0], first_instance)
+            app.execute_hook("test_hook_std", dummy_param=True)
+            self.assertIsNot(execute_mock.call_args[0][0], first_instance)
+
+            # instances are always created for callers who want to hold one.
+            hook_expression = app.get_setting("test_hook_std")
+            self.assertIsNot(app.create_hook_instance(hook_expression), app.create_hook_instance(hook_expression))
+            self.assertEqual(load_mock.call_count, 1)
+
+            # hooks are loaded and instantiated again once the cache is cleared.
+            second_instance = execute_mock.call_args[0][0]
+            tank.hook.clear_hooks_cache()
+            app.execute_hook("test_hook_std", dummy_param=True)
+            self.assertEqual(load_mock.call_count, 2)
+            self.assertIsNot(execute_mock.call_args[0][0], second_instance)
+            self.assertIsNot(type(execute_mock.call_args[0][0]), type(second_instance))
+
+            # hook paths are resolved again once the settings change.
+            app._set_settings(app.settings)
+            app.execute_hook("test_hook_std", dummy_param=True)
+            self.assertEqual(resolve_mock.call_count, 3)
+
 
 class TestProperties(TestApplication):
 
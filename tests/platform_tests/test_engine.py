@@ -120,6 +120,86 @@ class TestStartEngine(TestEngineBase):
         self.assertEqual(engine.instance_name, "test_engine")
         self.assertEqual(engine.context, self.context)
 
+    def test_parallel_app_loading(self):
+        """
+        Makes sure apps preloaded on a pool of threads are loaded like
+        apps loaded serially.
+        """
+        cur_engine = tank.platform.start_engine("test_engine", self.tk, self.context)
+        expected_apps = cur_engine.apps.keys()
+        self.assertTrue(expected_apps)
+        expected_commands = sorted(cur_engine.commands.keys())
+        cur_engine.destroy()
+
+        with mock.patch.dict(os.environ, {"TK_PARALLEL_APP_LOADING": "4"}):
+            with mock.patch(
+                "tank.platform.engine.parallel_map", wraps=engine.parallel_map
+            ) as parallel_map_mock:
+                cur_engine = tank.platform.start_engine("test_engine", self.tk, self.context)
+
+        self.assertEqual(parallel_map_mock.call_count, 1)
+        self.assertEqual(parallel_map_mock.call_args[0][2], 4)
+        self.assertEqual(cur_engine.apps.keys(), expected_apps)
+        self.assertEqual(sorted(cur_engine.commands.keys()), expected_commands)
+
+    def test_lazy_app_loading(self):
+        """
+        Makes sure apps declaring their commands are only initialized when
+        one of these commands is run or when they are accessed.
+        """
+        declared_commands = mock.PropertyMock(return_value=[{"name": "Test Command"}])
+        with mock.patch.dict(os.environ, {"TK_LAZY_APP_LOADING": "1"}):
+            with mock.patch.object(
+                tank.descriptor.descriptor_bundle.BundleDescriptor,
+                "declared_commands",
+                declared_commands
+            ):
+                cur_engine = tank.platform.start_engine("test_engine", self.tk, self.context)
+
+        # The declared commands are registered for each app.
+        stub_commands = dict(
+            (command["properties"]["app"].instance_name, command)
+            for command in cur_engine.commands.values()
+            if command["properties"].get("app")
+        )
+        self.assertTrue(stub_commands)
+        deferred_apps = dict(
+            (command["properties"]["app"].instance_name, command["properties"]["app"])
+            for command in stub_commands.values()
+        )
+
+        def init_app(app):
+            cur_engine.register_command("Test Command", lambda: app.instance_name)
+
+        for app in deferred_apps.values():
+            app.init_app = mock.Mock(side_effect=lambda app=app: init_app(app))
+
+        # The commands registered in place of the apps are not kept for context
+        # changes when other apps are initialized.
+        cur_engine._Engine__update_pools("other_app")
+        for command in cur_engine._Engine__command_pool.values():
+            self.assertNotIn(command["properties"].get("app"), deferred_apps.values())
+
+        # Running a command initializes its app and runs the command it registered.
+        app_instance_name, stub_command = stub_commands.popitem()
+        self.assertEqual(stub_command["callback"](), app_instance_name)
+        self.assertEqual(deferred_apps[app_instance_name].init_app.call_count, 1)
+        self.assertEqual(stub_command["callback"](), app_instance_name)
+        self.assertEqual(deferred_apps[app_instance_name].init_app.call_count, 1)
+        for other_app_instance_name in stub_commands:
+            self.assertFalse(deferred_apps[other_app_instance_name].init_app.called)
+
+        # Accessing apps initializes them.
+        self.assertEqual(sorted(cur_engine.apps.keys()), sorted(deferred_apps.keys()))
+        for other_app_instance_name in stub_commands:
+            self.assertIs(cur_engine.apps[other_app_instance_name], deferred_apps[other_app_instance_name])
+            self.assertEqual(deferred_apps[other_app_instance_name].init_app.call_count, 1)
+        self.assertEqual(
+            sorted(command["callback"]() for command in cur_engine.commands.values()
+                   if command["properties"].get("app")),
+            sorted(deferred_apps.keys())
+        )
+
 
 class TestLegacyStartShotgunEngine(TestEngineBase):
     """
@@ -428,6 +508,93 @@ class TestContextChange(TestEngineBase):
         # Make sure the engine was destroyed and recreated.
         self.assertNotEqual(id(cur_engine), id(sgtk.platform.current_engine()))
 
+    @mock.patch(
+        "sgtk.platform.application.Application.context_change_allowed",
+        new_callable=mock.PropertyMock,
+        return_value=True
+    )
+    def test_unchanged_apps_kept(self, _):
+        """
+        Checks that apps which are configured the same way in the new context
+        are kept, after being validated against it.
+        """
+        cur_engine = sgtk.platform.start_engine("test_engine", self.tk, self.context)
+        cur_engine.enable_context_change()
+        apps = dict(cur_engine.apps)
+        self.assertTrue(apps)
+
+        # a context using the same environment.
+        new_context = self.tk.context_from_path(self.shot_step_path)
+        self.assertIsNot(new_context, self.context)
+
+        with mock.patch(
+            "sgtk.platform.engine.validation.validate_settings"
+        ) as validate_mock, mock.patch(
+            "sgtk.platform.application.Application.post_context_change"
+        ) as post_mock:
+            sgtk.platform.change_context(new_context)
+
+        self.assertEqual(validate_mock.call_count, len(apps))
+        self.assertEqual(post_mock.call_count, len(apps))
+        self.assertEqual(cur_engine.apps, apps)
+        for app in cur_engine.apps.values():
+            self.assertEqual(app.context, new_context)
+
+        # apps are validated and set up again when their configuration changes,
+        # but can still change context rather than being restarted.
+        with mock.patch(
+            "sgtk.platform.engine.validation.validate_settings"
+        ) as validate_mock, mock.patch(
+            "sgtk.platform.engine.Engine._Engine__get_environment_fingerprint",
+            return_value="changed"
+        ), mock.patch(
+            "sgtk.platform.application.Application.post_context_change"
+        ) as post_mock:
+            sgtk.platform.change_context(self.context)
+
+        self.assertEqual(validate_mock.call_count, len(apps))
+        self.assertEqual(post_mock.call_count, len(apps))
+        self.assertEqual(cur_engine.apps, apps)
+        for app in cur_engine.apps.values():
+            self.assertEqual(app.context, self.context)
+
+    @mock.patch(
+        "sgtk.platform.application.Application.context_change_allowed",
+        new_callable=mock.PropertyMock,
+        return_value=True
+    )
+    @mock.patch(
+        "sgtk.descriptor.descriptor_bundle.FrameworkDescriptor.is_shared_framework",
+        return_value=False
+    )
+    def test_unchanged_apps_frameworks(self, *_):
+        """
+        Checks that the non-shared frameworks of the apps which are kept are
+        set up for the new context.
+        """
+        cur_engine = sgtk.platform.start_engine("test_engine", self.tk, self.context)
+        cur_engine.enable_context_change()
+        apps = dict(cur_engine.apps)
+        frameworks = [fw for app in apps.values() for fw in app.frameworks.values()]
+        self.assertTrue(frameworks)
+        self.assertFalse(any(fw.is_shared for fw in frameworks))
+
+        # another shot with a step, using the same environment.
+        shot = {"type": "Shot", "name": "other_shot", "id": 5, "project": self.project}
+        shot_path = os.path.join(self.project_root, "sequences", "Seq", "other_shot")
+        self.add_production_path(shot_path, shot)
+        step_path = os.path.join(shot_path, "step_name")
+        self.add_production_path(step_path, self.context.step)
+        new_context = self.tk.context_from_path(step_path)
+        self.assertNotEqual(new_context, self.context)
+        sgtk.platform.change_context(new_context)
+
+        self.assertEqual(cur_engine.apps, apps)
+        for app in cur_engine.apps.values():
+            self.assertTrue(app.frameworks)
+            for fw in app.frameworks.values():
+                self.assertEqual(fw.context, new_context)
+
 
 class TestRegisteredCommands(TestEngineBase):
     """
@@ -565,3 +732,67 @@ class TestCompatibility(TankTestBase):
             sgtk.platform.TankEngineInitError,
             sgtk.TankEngineInitError
         )
+
+
+class TestDeferredAppsDict(TankTestBase):
+    """
+    Tests the dictionary returned by Engine.apps when the initialization of
+    some apps is deferred.
+    """
+
+    def setUp(self):
+        super(TestDeferredAppsDict, self).setUp()
+        self._initialized = []
+
+        def initialize_app(app_instance_name):
+            self._initialized.append(app_instance_name)
+            # app_c fails to initialize.
+            return None if app_instance_name == "app_c" else "%s object" % app_instance_name
+
+        self.apps = engine._DeferredAppsDict(
+            {"app_a": "app_a object"}, ["app_b", "app_c", "app_d"], initialize_app
+        )
+
+    def test_lookup(self):
+        """
+        Makes sure looking up an app only initializes that app.
+        """
+        self.assertEqual(self.apps["app_a"], "app_a object")
+        self.assertEqual(self.apps.get("app_b"), "app_b object")
+        self.assertEqual(self._initialized, ["app_b"])
+
+        # checking if an app is there doesn't initialize it.
+        self.assertTrue("app_c" in self.apps)
+        self.assertFalse("app_e" in self.apps)
+        self.assertEqual(self._initialized, ["app_b"])
+
+        self.assertIsNone(self.apps.get("app_c"))
+        with self.assertRaises(KeyError):
+            self.apps["app_c"]
+        self.assertFalse("app_c" in self.apps)
+        self.assertEqual(self._initialized, ["app_b", "app_c"])
+
+    def test_enumeration(self):
+        """
+        Makes sure enumerating apps initializes all of them and never
+        reports the apps which failed to initialize.
+        """
+        expected = {"app_a": "app_a object", "app_b": "app_b object", "app_d": "app_d object"}
+        self.assertEqual(sorted(self.apps), sorted(expected))
+        self.assertEqual(self._initialized, ["app_b", "app_c", "app_d"])
+
+        self.assertEqual(dict(self.apps), expected)
+        self.assertEqual(self.apps.copy(), expected)
+        self.assertEqual(sorted(self.apps.keys()), sorted(expected))
+        self.assertEqual(sorted(self.apps.values()), sorted(expected.values()))
+        self.assertEqual(dict(self.apps.iteritems()), expected)
+        self.assertEqual(len(self.apps), 3)
+        self.assertEqual(self._initialized, ["app_b", "app_c", "app_d"])
+
+    def test_copy(self):
+        """
+        Makes sure copies of the apps dictionary don't hold uninitialized apps.
+        """
+        self.assertEqual(
+            dict(self.apps), {"app_a": "app_a object", "app_b": "app_b object", "app_d": "app_d object"}
+        )
@@ -0,0 +1,91 @@
+# Copyright (c) 2018 Shotgun Software Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Shotgun Software Inc.
+
+import threading
+
+from tank_test.tank_test_base import ShotgunTestBase
+from tank_test.tank_test_base import setUpModule # noqa
+
+from tank.util.concurrency import parallel_map, parallel_iter
+
+
+class TestParallelMap(ShotgunTestBase):
+    """
+    Tests for parallel_map.
+    """
+
+    def test_results_order(self):
+        """
+        Results are returned in the order of the items.
+        """
+        items = range(50)
+        results = parallel_map(lambda x: x * 2, items, 8)
+        self.assertEqual(results, [(x * 2, None) for x in items])
+
+    def test_errors(self):
+        """
+        Errors are returned for the items which failed without stopping the others.
+        """
+        def func(x):
+            if x % 2:
+                raise ValueError(x)
+            return x
+
+        results = parallel_map(func, range(6), 3)
+        for x, (result, exc_info) in enumerate(results):
+            if x % 2:
+                self.assertIsNone(result)
+                self.assertIs(exc_info[0], ValueError)
+                self.assertEqual(exc_info[1].args, (x,))
+            else:
+                self.assertEqual(result, x)
+                self.assertIsNone(exc_info)
+
+    def test_threads(self):
+        """
+        Calls are made on worker threads, unless a single thread is requested.
+        """
+        main_thread = threading.current_thread()
+
+        results = parallel_map(lambda x: threading.current_thread(), range(4), 1)
+        self.assertEqual(set(thread for thread, _ in results), set([main_thread]))
+
+        results = parallel_map(lambda x: threading.current_thread(), range(4), 2)
+        self.assertNotIn(main_thread, set(thread for thread, _ in results))
+
+        self.assertEqual(parallel_map(lambda x: x, [], 4), [])
+
+
+class TestParallelIter(ShotgunTestBase):
+    """
+    Tests for parallel_iter.
+    """
+
+    def test_completion_order(self):
+        """
+        Results are yielded as the calls complete, on the calling thread.
+        """
+        first_item_released = threading.Event()
+
+        def func(x):
+            if x == 0:
+                first_item_released.wait(5)
+            return x
+
+        indices = []
+        for index, result, exc_info in parallel_iter(func, range(3), 3):
+            self.assertEqual(result, index)
+            self.assertIsNone(exc_info)
+            indices.append(index)
+            if len(indices) == 2:
+                first_item_released.set()
+
+        self.assertEqual(indices[-1], 0)
+        self.assertEqual(sorted(indices), [0, 1, 2])
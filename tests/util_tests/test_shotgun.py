@@ -11,9 +11,11 @@
 from __future__ import with_statement
 import os
 import sys
+import hashlib
 import datetime
 import threading
 import urlparse
+import BaseHTTPServer
 import unittest2 as unittest
 import logging
 
@@ -341,4 +343,144 @@ class TestShotgunDownloadUrl(ShotgunTestBase):
         # Verify the correct file extension was returned.
         self.assertEqual(self.download_destination, full_path)
 
+    def _start_http_server(self, content, interrupt_at=None, support_ranges=True):
+        """
+        Serves content from a local HTTP server for the duration of the test.
+
+        :param str content: Content to serve.
+        :param int interrupt_at: Optionally drop the connection of the first
+            request after that many bytes were sent.
+        :param bool support_ranges: Whether Range headers are honoured.
+        :returns: Tuple with the url of the content and the list of the Range
+            headers received, None for requests without one.
+        """
+        range_headers = []
+
+        class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+            def do_GET(self):
+                range_header = self.headers.get("Range")
+                range_headers.append(range_header)
+                offset = 0
+                if range_header and support_ranges:
+                    offset = int(range_header.split("=")[1].rstrip("-"))
+                    if offset >= len(content):
+                        self.send_error(416)
+                        return
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range", "bytes %d-%d/%d" % (offset, len(content) - 1, len(content))
+                    )
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Length", str(len(content) - offset))
+                self.end_headers()
+                if interrupt_at is not None and len(range_headers) == 1:
+                    self.wfile.write(content[offset:interrupt_at])
+                else:
+                    self.wfile.write(content[offset:])
+
+            def log_message(self, *args):
+                pass
+
+        server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        url = "http://127.0.0.1:%d/bundle.zip" % server.server_address[1]
+        return (url, range_headers)
+
+    def test_streaming_download(self):
+        """
+        Verify content is downloaded in chunks, reporting progress and
+        verifying its checksum.
+        """
+        content = os.urandom(2500)
+        (url, _) = self._start_http_server(content)
+        progress = []
+
+        with patch("tank.util.shotgun.download.DOWNLOAD_CHUNK_SIZE", 1000):
+            tank.util.download_url(
+                self.mockgun, url, self.download_destination,
+                progress_callback=lambda done, total: progress.append((done, total)),
+                checksum=hashlib.sha256(content).hexdigest(),
+                checksum_algorithm="sha256"
+            )
+
+        with open(self.download_destination, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+        self.assertEqual(progress, [(1000, 2500), (2000, 2500), (2500, 2500)])
+        self.assertFalse(
+            os.path.exists(tank.util.shotgun.download.get_partial_download_path(self.download_destination))
+        )
 
+        # a corrupt download is discarded.
+        os.remove(self.download_destination)
+        with self.assertRaisesRegex(tank.TankError, "checksum"):
+            tank.util.download_url(
+                self.mockgun, url, self.download_destination, checksum=hashlib.md5("foo").hexdigest()
+            )
+        self.assertFalse(os.path.exists(self.download_destination))
+
+    def test_resume_download(self):
+        """
+        Verify an interrupted download is resumed where it stopped when the
+        server supports ranges, and started over otherwise.
+        """
+        content = os.urandom(2500)
+        checksum = hashlib.md5(content).hexdigest()
+        partial_path = tank.util.shotgun.download.get_partial_download_path(self.download_destination)
+
+        for support_ranges in (True, False):
+            (url, range_headers) = self._start_http_server(
+                content, interrupt_at=1200, support_ranges=support_ranges
+            )
+
+            with self.assertRaisesRegex(tank.TankError, "interrupted after 1200 of 2500 bytes"):
+                tank.util.download_url(
+                    self.mockgun, url, self.download_destination, resume=True, checksum=checksum
+                )
+            self.assertEqual(os.path.getsize(partial_path), 1200)
+
+            tank.util.download_url(
+                self.mockgun, url, self.download_destination, resume=True, checksum=checksum
+            )
+            with open(self.download_destination, "rb") as fh:
+                self.assertEqual(fh.read(), content)
+            self.assertFalse(os.path.exists(partial_path))
+            self.assertEqual(range_headers, [None, "bytes=1200-"])
+            os.remove(self.download_destination)
+
+    def test_resume_unsatisfiable_range(self):
+        """
+        Verify a download starts over when the partial file of a previous
+        attempt doesn't match the content anymore.
+        """
+        content = os.urandom(2500)
+        partial_path = tank.util.shotgun.download.get_partial_download_path(self.download_destination)
+        with open(partial_path, "wb") as fh:
+            fh.write(os.urandom(3000))
+
+        (url, range_headers) = self._start_http_server(content)
+        tank.util.download_url(
+            self.mockgun, url, self.download_destination, resume=True,
+            checksum=hashlib.md5(content).hexdigest()
+        )
+        with open(self.download_destination, "rb") as fh:
+            self.assertEqual(fh.read(), content)
+        self.assertFalse(os.path.exists(partial_path))
+        self.assertEqual(range_headers, ["bytes=3000-", None])
+
+    def test_download_without_resume(self):
+        """
+        Verify nothing is left behind by a failed download which isn't resumable.
+        """
+        (url, _) = self._start_http_server(os.urandom(2500), interrupt_at=1200)
+        with self.assertRaises(tank.TankError):
+            tank.util.download_url(self.mockgun, url, self.download_destination)
+        self.assertFalse(
+            os.path.exists(tank.util.shotgun.download.get_partial_download_path(self.download_destination))
+        )
+        self.assertFalse(os.path.exists(self.download_destination))
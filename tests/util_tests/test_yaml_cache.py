@@ -11,9 +11,11 @@
 import os
 import copy
 
-import sgtk
-from sgtk.util.yaml_cache import YamlCache
+from mock import patch
+
+from sgtk.util.yaml_cache import YamlCache, YamlCacheFile
 from sgtk import TankError
+from sgtk.errors import TankUnreadableFileError
 from tank_vendor import yaml
 from tank_test.tank_test_base import ShotgunTestBase
 from tank_test.tank_test_base import setUpModule # noqa
@@ -129,6 +131,132 @@ class TestYamlCache(ShotgunTestBase):
         # ...and check that the data in the cache has been updated:
         self.assertEquals(read_data, modified_test_data)
 
+    def test_get_frozen(self):
+        """
+        Test that frozen data is shared between callers, can't be modified
+        and can be copied into mutable data.
+        """
+        yaml_path = os.path.join(self._data_root, "frozen_data.yml")
+
+        test_data = {"one": [1, {"two": 2}], "three": {"four": [4]}}
+
+        yaml_file = open(yaml_path, "w")
+        try:
+            yaml_file.write(yaml.dump(test_data))
+        finally:
+            yaml_file.close()
+
+        try:
+            yaml_cache = YamlCache()
+            frozen_data = yaml_cache.get(yaml_path, frozen=True)
+
+            self.assertEquals(frozen_data, test_data)
+            self.assertIs(yaml_cache.get(yaml_path, frozen=True), frozen_data)
+
+            # nested data can't be modified either.
+            self.assertRaises(TypeError, frozen_data.__setitem__, "five", 5)
+            self.assertRaises(TypeError, frozen_data.pop, "one")
+            self.assertRaises(TypeError, frozen_data["one"].append, 5)
+            self.assertRaises(TypeError, frozen_data["one"][1].update, {"five": 5})
+            self.assertRaises(TypeError, frozen_data["three"]["four"].__delitem__, 0)
+
+            # copies are regular mutable containers.
+            data_copy = copy.deepcopy(frozen_data)
+            self.assertEquals(data_copy, test_data)
+            self.assertIs(type(data_copy), dict)
+            self.assertIs(type(data_copy["one"]), list)
+            self.assertIs(type(data_copy["one"][1]), dict)
+            data_copy["one"].append(5)
+            self.assertEquals(frozen_data, test_data)
+
+            # regular gets are not affected.
+            data = yaml_cache.get(yaml_path)
+            self.assertIs(type(data), dict)
+            self.assertEquals(data, test_data)
+            self.assertIsNot(yaml_cache.get(yaml_path, deepcopy_data=False), frozen_data)
+        finally:
+            os.remove(yaml_path)
+
+    def test_cache_file(self):
+        """
+        Test that yaml data is read from a cache file when the yaml
+        file hasn't changed since it was cached.
+        """
+        folder = os.path.join(self.tank_temp, "yaml_cache_file")
+        os.makedirs(os.path.join(folder, "sub_folder"))
+        first_path = os.path.join(folder, "first.yml")
+        second_path = os.path.join(folder, "sub_folder", "second.yml")
+        with open(first_path, "w") as fh:
+            fh.write(yaml.dump({"first": [1, 2]}))
+        with open(second_path, "w") as fh:
+            fh.write(yaml.dump(["second"]))
+
+        cache_path = os.path.join(self.tank_temp, "yaml_cache.bin")
+        self.assertEquals(YamlCacheFile.build(cache_path, [folder]), 2)
+
+        cache_file = YamlCacheFile(cache_path)
+        self.assertEquals(len(cache_file), 2)
+        self.assertIn(os.path.normpath(first_path), cache_file)
+
+        yaml_cache = YamlCache()
+        yaml_cache.add_cache_file(cache_file)
+        with patch.object(yaml, "load") as load_mock:
+            self.assertEquals(yaml_cache.get(first_path), {"first": [1, 2]})
+            self.assertEquals(yaml_cache.get(second_path), ["second"])
+        self.assertEquals(load_mock.call_count, 0)
+
+        # changed files are read from disk.
+        with open(first_path, "w") as fh:
+            fh.write(yaml.dump({"first": [1, 2, 3]}))
+        yaml_cache = YamlCache()
+        yaml_cache.add_cache_file(cache_file)
+        self.assertEquals(yaml_cache.get(first_path), {"first": [1, 2, 3]})
+
+    def test_invalid_cache_file(self):
+        """
+        Test that files that are not cache files are rejected.
+        """
+        cache_path = os.path.join(self.tank_temp, "invalid_yaml_cache.bin")
+        with open(cache_path, "wb") as fh:
+            fh.write("not a yaml cache")
+        self.assertRaises(TankUnreadableFileError, YamlCacheFile, cache_path)
+        self.assertRaises(TankUnreadableFileError, YamlCacheFile, cache_path + ".missing")
+
+    def test_validation_ttl(self):
+        """
+        Test that files are only checked on disk once their validation
+        time to live has expired.
+        """
+        folder = os.path.join(self.tank_temp, "yaml_cache_ttl")
+        static_folder = os.path.join(folder, "static")
+        os.makedirs(static_folder)
+        ttl_path = os.path.join(folder, "ttl.yml")
+        static_path = os.path.join(static_folder, "static.yml")
+        for path in [ttl_path, static_path]:
+            with open(path, "w") as fh:
+                fh.write(yaml.dump({"value": 1}))
+
+        yaml_cache = YamlCache()
+        yaml_cache.set_validation_ttl(folder, 10)
+        yaml_cache.set_validation_ttl(static_folder, None)
+
+        with patch("time.time", return_value=100):
+            self.assertEquals(yaml_cache.get(ttl_path), {"value": 1})
+            self.assertEquals(yaml_cache.get(static_path), {"value": 1})
 
+        with patch("os.stat", side_effect=OSError) as stat_mock:
+            with patch("time.time", return_value=109):
+                self.assertEquals(yaml_cache.get(ttl_path), {"value": 1})
+            with patch("time.time", return_value=1000):
+                self.assertEquals(yaml_cache.get(static_path), {"value": 1})
+        self.assertEquals(stat_mock.call_count, 0)
 
+        # the time to live has expired, the file is checked again.
+        with patch("os.stat", side_effect=OSError):
+            with patch("time.time", return_value=110):
+                self.assertRaises(TankUnreadableFileError, yaml_cache.get, ttl_path)
 
+        # invalidated files are always checked.
+        yaml_cache.invalidate(os.path.normpath(static_path))
+        with patch("os.stat", side_effect=OSError):
+            self.assertRaises(TankUnreadableFileError, yaml_cache.get, static_path)
@@ -9,6 +9,8 @@
 # not expressly granted therein are reserved by Shotgun Software Inc.
 
 import os
+import stat
+import zipfile
 from tank_test.tank_test_base import ShotgunTestBase, setUpModule  # noqa
 import tank
 
@@ -122,3 +124,51 @@ class TestUnzipping(ShotgunTestBase):
             set(get_file_list(output_path_2, output_path_2)),
             set(["/info.yml"])
         )
+
+    def test_parallel_unzip(self):
+        """
+        Tests that unzipping on several threads produces the same files and
+        permissions as unzipping on a single thread.
+        """
+        zip = os.path.join(self.tank_temp, "many_files.zip")
+        zip_obj = zipfile.ZipFile(zip, "w", zipfile.ZIP_DEFLATED)
+        zip_obj.writestr("bundle/", "")
+        zip_obj.writestr("bundle/empty_folder/", "")
+        for index in range(1000):
+            zip_obj.writestr("bundle/folder_%d/file_%d.py" % (index % 10, index), "# file %d\n" % index * 100)
+        script = zipfile.ZipInfo("bundle/bin/script.sh")
+        script.external_attr = 0o755 << 16
+        zip_obj.writestr(script, "#!/bin/sh\n")
+        zip_obj.close()
+
+        for auto_detect_bundle in (False, True):
+            output_paths = []
+            for thread_count in (1, 4):
+                output_path = os.path.join(
+                    self.project_root, "parallel_zip_test_%s_%s" % (auto_detect_bundle, thread_count)
+                )
+                tank.util.zip.unzip_file(zip, output_path, auto_detect_bundle, thread_count)
+                output_paths.append(output_path)
+
+            file_lists = [set(get_file_list(path, path)) for path in output_paths]
+            self.assertEqual(file_lists[0], file_lists[1])
+            self.assertEqual(len(file_lists[0]), 1013 if auto_detect_bundle else 1014)
+
+            for path in file_lists[0]:
+                (single_path, parallel_path) = [
+                    os.path.join(root_path, *path.split("/")) for root_path in output_paths
+                ]
+                self.assertEqual(os.path.isdir(single_path), os.path.isdir(parallel_path))
+                self.assertEqual(
+                    stat.S_IMODE(os.stat(single_path).st_mode),
+                    stat.S_IMODE(os.stat(parallel_path).st_mode)
+                )
+                if not os.path.isdir(single_path):
+                    with open(single_path, "rb") as single_fh:
+                        with open(parallel_path, "rb") as parallel_fh:
+                            self.assertEqual(single_fh.read(), parallel_fh.read())
+
+            script_path = os.path.join(output_paths[1], "bin", "script.sh")
+            if not auto_detect_bundle:
+                script_path = os.path.join(output_paths[1], "bundle", "bin", "script.sh")
+            self.assertTrue(os.access(script_path, os.X_OK))